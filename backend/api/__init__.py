@@ -1,7 +0,0 @@
-# API package
-
-
-
-
-
-
@@ -1,5 +1,11 @@
-import json
-from app.core.llm import invoke_with_retry
+import math
+from typing import List
+
+from app.core.config import settings
+from app.core.prompt import PromptBuilder, count_tokens, truncate_evenly
+from app.core.structured import invoke_structured
+from app.schemas.agent import Syllabus
+from app.services.ingestion_service import SOURCE_HEADER
 
 SYSTEM_PROMPT = """You are an expert curriculum designer. Your goal is to break down a user's chosen topic into a logical, high-quality course syllabus.
 The syllabus must be structured into 'Modules', and each module must contain 'Lessons' (Topics).
@@ -17,38 +23,74 @@ SYLLABUS REQUIREMENTS:
       "title": "Module Name",
       "description": "Module summary",
       "lessons": [
-        { "title": "Lesson name", "summary": "One sentence summary" }
+        { "title": "Lesson name", "summary": "One sentence summary", "source_ref": "Optional link to the source offset" }
       ]
     }
   ]
 }
 5. Content should be beginner-friendly.
+6. If source material is provided, base the syllabus on it. When the material contains timestamped video links
+   like [https://youtu.be/VIDEO_ID?t=120], set each lesson's "source_ref" to the link where that lesson's material starts.
 """
 
-def generate_course_syllabus(topic: str, difficulty: str = "Beginner") -> dict:
+SOURCE_MATERIAL_HEADER = "Source Material:\n"
+INSTRUCTION = "Please generate a structured learning course as JSON."
+
+
+def _source_parts(context_text: str) -> List[str]:
+    """
+    The videos of a playlist context, or else the document cut into
+    SYLLABUS_SOURCE_SECTIONS runs of lines of about equal length.
+    """
+    if context_text.startswith(SOURCE_HEADER):
+        return [SOURCE_HEADER + video for video in context_text.split(SOURCE_HEADER) if video]
+
+    lines = context_text.splitlines()
+    size = max(1, math.ceil(len(context_text) / settings.SYLLABUS_SOURCE_SECTIONS))
+    parts, current, length = [], [], 0
+    for line in lines:
+        current.append(line)
+        length += len(line) + 1
+        if length >= size:
+            parts.append("\n".join(current))
+            current, length = [], 0
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
+def fit_source_material(context_text: str, max_tokens: int) -> str:
+    """
+    Source material cut down to `max_tokens` so that every video (or every
+    stretch of a long document) keeps its opening, rather than everything
+    past the budget being lost from the end.
+    """
+    if count_tokens(context_text) <= max_tokens:
+        return context_text
+    return "\n".join(truncate_evenly(_source_parts(context_text), max_tokens))
+
+
+def generate_course_syllabus(topic: str, difficulty: str = "Beginner", context_text: str = "") -> dict:
     """
     Generates a full course structure using AI.
+    `context_text` is optional source material (PDF text, web page, transcripts).
     """
-    prompt = f"Topic: {topic}\nDifficulty: {difficulty}\n\nPlease generate a structured learning course as JSON."
+    request = f"Topic: {topic}\nDifficulty: {difficulty}"
+    budget = settings.SYLLABUS_PROMPT_TOKEN_BUDGET
+    source = fit_source_material(
+        context_text, budget - count_tokens(request) - count_tokens(INSTRUCTION) - count_tokens(SOURCE_MATERIAL_HEADER)
+    )
+    prompt = (
+        PromptBuilder("syllabus", budget=budget)
+        .add("request", request, priority=100, required=True)
+        .add("source", source, priority=10, header=SOURCE_MATERIAL_HEADER)
+        .add("instruction", INSTRUCTION, priority=100, required=True)
+        .build()
+    )
 
-    content = invoke_with_retry(
+    return invoke_structured(
         prompt=prompt,
-        system_instruction=SYSTEM_PROMPT
-    ).strip()
-
-    # Clean up markdown if necessary
-    if content.startswith("```json"):
-        content = content.split("```json")[1].split("```")[0].strip()
-    elif content.startswith("```"):
-        content = content.split("```")[1].split("```")[0].strip()
-
-    try:
-        return json.loads(content)
-    except Exception as e:
-        print(f"Failed to parse syllabus JSON: {e}")
-        # Return a minimal valid structure if parsing fails
-        return {
-            "title": topic,
-            "description": f"AI-Generated course on {topic}",
-            "modules": []
-        }
+        schema=Syllabus,
+        system_instruction=SYSTEM_PROMPT,
+        agent="curriculum"
+    ).model_dump()
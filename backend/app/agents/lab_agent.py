@@ -1,6 +1,7 @@
 import os
 import json
-from app.core.llm import invoke_with_retry
+from app.core.structured import invoke_structured
+from app.schemas.agent import LabEvaluation, LabExercise
 
 SYSTEM_PROMPT = """You are the 'CourseForge Lab Warden'. Your job is to create and evaluate practical 'Hands-on Labs' for students.
 1. When asked to CREATE a lab:
@@ -12,25 +13,17 @@ SYSTEM_PROMPT = """You are the 'CourseForge Lab Warden'. Your job is to create a
 """
 
 def create_lab_exercise(topic_title: str, topic_content: str) -> dict:
-    content = invoke_with_retry(
+    return invoke_structured(
         prompt=f"CREATE a hands-on lab exercise for the following topic:\nTitle: {topic_title}\nContent: {topic_content}",
-        system_instruction=SYSTEM_PROMPT
-    )
-    
-    try:
-        if "```json" in content: content = content.split("```json")[1].split("```")[0].strip()
-        return json.loads(content)
-    except:
-        return {"exercise": "Explain the core concepts of this topic in your own words.", "requirements": ["Clarity", "Accuracy"], "hints": ["Think about real-world use cases."]}
+        schema=LabExercise,
+        system_instruction=SYSTEM_PROMPT,
+        agent="lab"
+    ).model_dump()
 
 def evaluate_lab_submission(exercise: dict, submission: str) -> dict:
-    content = invoke_with_retry(
+    return invoke_structured(
         prompt=f"EVALUATE this lab submission.\nExercise: {json.dumps(exercise)}\nSubmission: {submission}",
-        system_instruction=SYSTEM_PROMPT
-    )
-    
-    try:
-        if "```json" in content: content = content.split("```json")[1].split("```")[0].strip()
-        return json.loads(content)
-    except:
-        return {"passed": True, "feedback": "Well done! The forge recognizes your effort.", "score": 80, "xp_awarded": 150}
+        schema=LabEvaluation,
+        system_instruction=SYSTEM_PROMPT,
+        agent="lab"
+    ).model_dump()
@@ -1,45 +1,50 @@
-import os
-import json
-from app.core.llm import invoke_with_retry
+from typing import List, Tuple
 
-SYSTEM_PROMPT = """You are the 'CourseForge Cartographer'. Your job is to analyze a collection of courses and find semantic connections between them.
+from app.core.prompt import PromptBuilder
+from app.core.structured import invoke_structured
+from app.schemas.agent import LinkLabels
 
-INPUT: A list of course titles and their descriptions.
+SYSTEM_PROMPT = """You are the 'CourseForge Cartographer'. Your job is to find semantic connections between courses.
+
+INPUT: A list of courses (ID, title, description) and candidate pairs of course IDs that look related.
 OUTPUT: A JSON object containing:
-1. "nodes": A list of all course IDs with their titles and categories.
-2. "links": A list of objects { "source": course_id, "target": course_id, "label": "Reason for connection" }.
+1. "links": A list of objects { "source": course_id, "target": course_id, "label": "Reason for connection" }, one per candidate pair that is genuinely connected.
+2. "categories": A list of objects { "id": course_id, "category": "Short subject area" } for every course marked NEW.
 
 Rules:
-- Only create links where a genuine educational or topical overlap exists.
+- Only keep pairs where a genuine educational or topical overlap exists; drop the rest.
+- Never invent pairs that are not in the candidate list.
 - Be concise with link labels (e.g., "Advanced Algebra overlap", "Shared UI/UX principles").
 - Ensure the output is valid JSON.
 """
 
-def generate_knowledge_graph(courses: list) -> dict:
+def label_course_links(courses: list, new_ids: List[int], pairs: List[Tuple[int, int, float]]) -> dict:
     """
-    Analyzes multiple courses to create a graph of semantic connections.
-    courses: List of objects with id, title, description, category.
+    Labels candidate edges found by embedding similarity and categorises new courses.
+    courses: List of dicts with id, title, description for every course involved.
+    pairs: (source_id, target_id, similarity) candidates.
     """
-    if not courses:
-        return {"nodes": [], "links": []}
+    if not pairs:
+        # Nothing to label; an isolated course is not worth a call just for its category
+        return {"links": [], "categories": []}
 
-    course_data = "\n".join([
-        f"ID: {c['id']} | Title: {c['title']} | Category: {c['category']} | Desc: {c['description']}" 
-        for c in courses
-    ])
-    
-    content = invoke_with_retry(
-        prompt=f"Analyze these courses and generate a semantic graph:\n{course_data}",
-        system_instruction=SYSTEM_PROMPT
+    prompt = (
+        PromptBuilder("knowledge_graph")
+        .add("courses", items=[
+            f"ID: {c['id']} | Title: {c['title']}{' | NEW' if c['id'] in new_ids else ''}" for c in courses
+        ], priority=100, required=True, header="Courses:\n")
+        .add("pairs", items=[
+            f"{source} <-> {target} (similarity {similarity:.2f})" for source, target, similarity in pairs
+        ], priority=90, required=True, header="Candidate pairs:\n")
+        .add("descriptions", items=[
+            f"ID: {c['id']} | Desc: {c['description']}" for c in courses if c.get("description")
+        ], priority=10, keep="head", header="Course descriptions:\n")
+        .build()
     )
-    
-    try:
-        if "```json" in content: content = content.split("```json")[1].split("```")[0].strip()
-        return json.loads(content)
-    except Exception as e:
-        print(f"Mapper Agent error: {e}")
-        # Fallback: Just return nodes without links
-        return {
-            "nodes": courses,
-            "links": []
-        }
+
+    return invoke_structured(
+        prompt=prompt,
+        schema=LinkLabels,
+        system_instruction=SYSTEM_PROMPT,
+        agent="mapper"
+    ).model_dump()
@@ -20,5 +20,6 @@ def generate_podcast_script(course_title: str, syllabus: list, description: str)
     
     return invoke_with_retry(
         prompt=f"Write a ForgeCast script for:\nTitle: {course_title}\nDescription: {description}\nModules:\n{syllabus_str}",
-        system_instruction=SYSTEM_PROMPT
+        system_instruction=SYSTEM_PROMPT,
+        agent="podcast"
     )
@@ -1,20 +1,51 @@
 """
 Topic Agent
 Generates deep, multi-level content for a specific topic, including quizzes and flashcards.
+
+Each section is an independent sub-request so sections can run concurrently,
+be cached on their own, and be retried without regenerating the rest.
 """
-import json
-from app.core.llm import invoke_with_retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Tuple
+
+from app.core.config import settings
+from app.core.llm import invoke_with_retry, stream_with_retry
+from app.core.overload import LLMUnavailableError
+from app.core.structured import invoke_structured
+from app.schemas.agent import FlashcardSet, QuizSet, TopicExtras
 
 SYSTEM_PROMPT = """You are an elite educational content creator. Your goal is to explain complex topics with absolute clarity across three levels of expertise.
+Be technical but accessible. You will be asked for one part of a lesson at a time; produce only that part.
+"""
+
+LEVEL_SECTIONS = ("beginner", "intermediate", "expert")
+TOPIC_SECTIONS = LEVEL_SECTIONS + ("extras", "quizzes", "flashcards")
+
+# Topic fields each section fills in
+SECTION_FIELDS = {
+    "beginner": ("beginner_content",),
+    "intermediate": ("intermediate_content",),
+    "expert": ("expert_content",),
+    "extras": ("examples", "analogies", "summary"),
+    "quizzes": ("quizzes",),
+    "flashcards": ("flashcards",),
+}
+
+LEVEL_INSTRUCTIONS = {
+    "beginner": "Write a simple, accessible explanation of the topic (2-3 paragraphs).",
+    "intermediate": "Write a more detailed explanation with technical depth (2-3 paragraphs).",
+    "expert": "Write an advanced-level deep explanation (2-3 paragraphs).",
+}
 
-You MUST return your response as a valid JSON object with this exact schema:
+STRUCTURED_SECTIONS = {
+    "extras": (TopicExtras, """Return a JSON object:
 {
-  "beginner_content": "Simple, accessible explanation of the topic (2-3 paragraphs)",
-  "intermediate_content": "More detailed explanation with technical depth (2-3 paragraphs)",
-  "expert_content": "Advanced-level deep explanation (2-3 paragraphs)",
   "examples": ["Practical example 1", "Practical example 2", "Practical example 3"],
   "analogies": ["Mental model/analogy 1", "Mental model/analogy 2"],
-  "summary": "A concise 2-3 sentence summary of the entire topic.",
+  "summary": "A concise 2-3 sentence summary of the entire topic."
+}"""),
+    "quizzes": (QuizSet, """Return a JSON object with at least 3 quizzes:
+{
   "quizzes": [
     {
       "question": "Quiz question text?",
@@ -23,50 +54,95 @@ You MUST return your response as a valid JSON object with this exact schema:
       "explanation": "Why this is correct.",
       "difficulty": "medium"
     }
-  ],
+  ]
+}"""),
+    "flashcards": (FlashcardSet, """Return a JSON object with at least 3 flashcards:
+{
   "flashcards": [
     { "front": "Key term or concept", "back": "Definition or explanation" }
   ]
+}"""),
 }
 
-RULES:
-- Return ONLY valid JSON, no markdown wrapping.
-- Be technical but accessible.
-- Include at least 3 quizzes and 3 flashcards.
-"""
+def _build_prompt(section: str, course_title: str, module_title: str, topic_title: str, context_text: str = "") -> str:
+    user_prompt = f"Course: {course_title}\nModule: {module_title}\nTopic: {topic_title}\n"
+    if context_text:
+        user_prompt += f"Context/Source Materials: {context_text}\n"
+
+    if section in LEVEL_INSTRUCTIONS:
+        user_prompt += f"\n{LEVEL_INSTRUCTIONS[section]} Return the explanation as markdown text only, no JSON."
+    else:
+        user_prompt += f"\n{STRUCTURED_SECTIONS[section][1]}"
+    return user_prompt
+
+def generate_topic_section(section: str, course_title: str, module_title: str, topic_title: str, context_text: str = "") -> dict:
+    """
+    Generates one section of a topic and returns the fields it fills in,
+    e.g. {"beginner_content": "..."} or {"quizzes": [...]}.
+    """
+    prompt = _build_prompt(section, course_title, module_title, topic_title, context_text)
+
+    if section in LEVEL_INSTRUCTIONS:
+        text = invoke_with_retry(prompt=prompt, system_instruction=SYSTEM_PROMPT, agent="topic").strip()
+        return {f"{section}_content": text}
+
+    schema = STRUCTURED_SECTIONS[section][0]
+    return invoke_structured(
+        prompt=prompt,
+        schema=schema,
+        system_instruction=SYSTEM_PROMPT,
+        agent="topic"
+    ).model_dump()
+
+def stream_topic_level(level: str, course_title: str, module_title: str, topic_title: str, context_text: str = "") -> Iterator[str]:
+    """Streams the text of one content level as it is generated."""
+    return stream_with_retry(
+        prompt=_build_prompt(level, course_title, module_title, topic_title, context_text),
+        system_instruction=SYSTEM_PROMPT,
+        agent="topic"
+    )
+
+def generate_topic_sections(
+    sections: Iterable[str], course_title: str, module_title: str, topic_title: str, context_text: str = ""
+) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """
+    Runs the requested sections concurrently.
+    Returns (results, errors), both keyed by section, so a failed section can
+    be retried on its own. If nothing succeeded because the LLM refused the
+    calls, the LLMUnavailableError is raised instead so callers can answer 503.
+    """
+    sections = list(sections)
+    results, errors = {}, {}
+    unavailable = None
+    if not sections:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=min(len(sections), settings.TOPIC_SECTION_CONCURRENCY)) as pool:
+        futures = {
+            section: pool.submit(generate_topic_section, section, course_title, module_title, topic_title, context_text)
+            for section in sections
+        }
+        for section, future in futures.items():
+            try:
+                results[section] = future.result()
+            except LLMUnavailableError as e:
+                unavailable = e
+                errors[section] = str(e)
+            except Exception as e:
+                errors[section] = str(e)
+    if unavailable is not None and not results:
+        raise unavailable
+    return results, errors
 
 def generate_topic_content(course_title: str, module_title: str, topic_title: str, context_text: str = "") -> dict:
     """
     Generates educational content for a topic within a course/module context.
     """
-    user_prompt = f"Course: {course_title}\nModule: {module_title}\nTopic: {topic_title}\n"
-    if context_text:
-        user_prompt += f"Context/Source Materials: {context_text}\n"
-    
-    user_prompt += "\nPlease generate comprehensive educational content for this topic following the structured JSON guidelines."
-
-    raw = invoke_with_retry(
-        prompt=user_prompt,
-        system_instruction=SYSTEM_PROMPT
-    ).strip()
-
-    # Clean up markdown if necessary
-    if raw.startswith("```json"):
-        raw = raw.split("```json")[1].split("```")[0].strip()
-    elif raw.startswith("```"):
-        raw = raw.split("```")[1].split("```")[0].strip()
-    
-    try:
-        return json.loads(raw)
-    except:
-        # Fallback to structured dictionary if JSON parsing fails
-        return {
-            "beginner_content": raw,
-            "intermediate_content": "",
-            "expert_content": "",
-            "examples": [],
-            "analogies": [],
-            "summary": f"Content for {topic_title}",
-            "quizzes": [],
-            "flashcards": []
-        }
+    results, errors = generate_topic_sections(TOPIC_SECTIONS, course_title, module_title, topic_title, context_text)
+    if errors:
+        raise Exception("; ".join(f"{section}: {error}" for section, error in errors.items()))
+
+    content = {}
+    for section in TOPIC_SECTIONS:
+        content.update(results[section])
+    return content
@@ -1,5 +1,6 @@
 import os
 from app.core.llm import invoke_with_retry
+from app.core.prompt import PromptBuilder
 
 SYSTEM_PROMPT = """You are the 'CourseForge Mentor', a high-tier AI tutor dedicated to helping users master complex topics.
 Your knowledge is grounded in the provided course context. 
@@ -7,26 +8,57 @@ Rules:
 1. Be encouraging, concise, and technical where appropriate.
 2. If the user asks something outside the course context, politely guide them back to the topic.
 3. Use analogies to explain difficult concepts if the user seems stuck.
-4. You have access to the full course structure and the current topic content.
+4. You are given the passages of the course most relevant to the question; ground your answer in them.
 """
 
-def get_mentor_response(course_title: str, topic_title: str, topic_content: str, user_query: str, chat_history: list = []) -> str:
+SUMMARY_PROMPT = """You maintain the running memory of a tutoring session.
+Merge the previous summary with the new conversation turns into one concise summary (at most 150 words).
+Keep what the student has asked, what they struggled with, and what was already explained. Return plain text only.
+"""
+
+def get_mentor_response(course_title: str, topic_title: str, context_chunks: list, user_query: str, chat_history: list = [], conversation_summary: str = "") -> str:
     """
     Generates a contextual response from the AI Mentor.
+    `context_chunks` are the course passages retrieved for this question, most
+    relevant first. `conversation_summary` covers turns older than `chat_history`. The prompt is kept within the token budget: older chat
+    turns go first, then the least relevant passages.
     """
-    
-    context = f"Course: {course_title}\nCurrent Topic: {topic_title}\nContent Context: {topic_content}\n"
-    
-    # Build prompt with history
-    full_prompt = f"Here is the context for our session:\n{context}\n\nChat History:\n"
+    turns = []
     for msg in chat_history:
         role = "Student" if msg['role'] == 'user' else "Mentor"
-        full_prompt += f"{role}: {msg['content']}\n"
-    
-    full_prompt += f"\nStudent: {user_query}\n"
+        turns.append(f"{role}: {msg['content']}")
+
+    full_prompt = (
+        PromptBuilder("mentor")
+        .add("context", f"Here is the context for our session:\nCourse: {course_title}\nCurrent Topic: {topic_title}", priority=100, required=True)
+        .add("content", items=context_chunks, priority=30, keep="head", header="Relevant Course Material:\n")
+        .add("summary", conversation_summary, priority=25, header="Earlier in this session: ")
+        .add("history", items=turns, priority=20, header="Chat History:\n")
+        .add("query", f"Student: {user_query}", priority=100, required=True)
+        .build()
+    )
 
     return invoke_with_retry(
         prompt=full_prompt,
         system_instruction=SYSTEM_PROMPT,
-        model_name="gemini-1.5-flash"
+        agent="tutor"
     )
+
+def summarize_conversation(previous_summary: str, turns: list) -> str:
+    """
+    Folds older chat turns into the rolling conversation summary.
+    """
+    lines = [f"{'Student' if t['role'] == 'user' else 'Mentor'}: {t['content']}" for t in turns]
+
+    prompt = (
+        PromptBuilder("mentor_summary")
+        .add("summary", previous_summary or "(none)", priority=50, header="Previous summary: ")
+        .add("turns", items=lines, priority=100, required=True, header="New turns:\n")
+        .build()
+    )
+
+    return invoke_with_retry(
+        prompt=prompt,
+        system_instruction=SUMMARY_PROMPT,
+        agent="tutor"
+    ).strip()
@@ -0,0 +1,140 @@
+"""
+Course exports (summary, notes, flashcards as JSON/CSV/Anki, EPUB), streamed
+from batched queries so memory stays flat however large the course is.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.auth import get_current_user
+from app.core.database import SessionLocal, get_db
+from app.models.models import Course, Flashcard, Module, Topic, User
+from app.services import exporter
+
+router = APIRouter()
+
+# Rows fetched per round trip while streaming
+ROWS_PER_FETCH = 200
+
+FLASHCARD_FORMATS = {
+    "json": (exporter.flashcards_json_chunks, "application/json", "json"),
+    "csv": (exporter.flashcards_csv_chunks, "text/csv", "csv"),
+}
+
+
+def _lesson_rows(db: Session, course_id: int, with_content: bool = False):
+    """Topics in reading order, one row per topic, fetched in batches."""
+    columns = [
+        Module.id.label("module_id"),
+        Module.title.label("module_title"),
+        Module.description.label("module_description"),
+        Topic.title.label("lesson_title"),
+        Topic.summary,
+    ]
+    if with_content:
+        columns += [Topic.beginner_content, Topic.intermediate_content, Topic.expert_content, Topic.examples]
+    return db.query(*columns).outerjoin(Topic, Topic.module_id == Module.id).filter(
+        Module.course_id == course_id
+    ).order_by(Module.order, Module.id, Topic.order, Topic.id).yield_per(ROWS_PER_FETCH)
+
+
+def _flashcard_rows(db: Session, course_id: int):
+    return db.query(Flashcard.front, Flashcard.back).filter(
+        Flashcard.course_id == course_id
+    ).order_by(Flashcard.id).yield_per(ROWS_PER_FETCH)
+
+
+def _stream_export(db: Session, course_id: int, user_id: int, render, media_type: str, filename: str) -> StreamingResponse:
+    """
+    Streams `render(session, course)`. The generator runs after this request's
+    session is gone, so it reads through a session of its own.
+    """
+    if not db.query(Course.id).filter(Course.id == course_id, Course.owner_id == user_id).first():
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    def body():
+        session = SessionLocal()
+        try:
+            course = session.query(Course.id, Course.title, Course.description).filter(Course.id == course_id).first()
+            yield from render(session, course)
+        finally:
+            session.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@router.get("/courses/{course_id}/export/summary")
+def export_summary(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Course outline with topic summaries, as plain text."""
+    return _stream_export(
+        db, course_id, current_user.id,
+        lambda session, course: exporter.summary_chunks(course.title, course.description, _lesson_rows(session, course.id)),
+        "text/plain", f"course_{course_id}_summary.txt"
+    )
+
+
+@router.get("/courses/{course_id}/export/flashcards")
+def export_flashcards(
+    course_id: int,
+    format: str = "json",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Flashcards as JSON, CSV or an Anki deck (apkg)."""
+    if format == "apkg":
+        return _stream_export(
+            db, course_id, current_user.id,
+            lambda session, course: exporter.apkg_chunks(course.title, _flashcard_rows(session, course.id)),
+            "application/apkg", f"course_{course_id}_flashcards.apkg"
+        )
+    if format not in FLASHCARD_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be one of json, csv, apkg")
+
+    render, media_type, extension = FLASHCARD_FORMATS[format]
+    return _stream_export(
+        db, course_id, current_user.id,
+        lambda session, course: render(_flashcard_rows(session, course.id)),
+        media_type, f"course_{course_id}_flashcards.{extension}"
+    )
+
+
+@router.get("/courses/{course_id}/export/notes")
+def export_notes(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """All generated topic content as Markdown notes."""
+    return _stream_export(
+        db, course_id, current_user.id,
+        lambda session, course: exporter.notes_chunks(
+            course.title, course.description, _lesson_rows(session, course.id, with_content=True)
+        ),
+        "text/markdown", f"course_{course_id}_notes.md"
+    )
+
+
+@router.get("/courses/{course_id}/export/epub")
+def export_epub(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """All generated topic content as an EPUB book, one chapter per module."""
+    def render(session, course):
+        modules = session.query(Module.id, Module.title).filter(
+            Module.course_id == course.id
+        ).order_by(Module.order, Module.id).all()
+        return exporter.epub_chunks(
+            course.title, course.description, modules, _lesson_rows(session, course.id, with_content=True)
+        )
+
+    return _stream_export(db, course_id, current_user.id, render, "application/epub+zip", f"course_{course_id}.epub")
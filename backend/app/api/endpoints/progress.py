@@ -0,0 +1,97 @@
+"""
+Per-user course progress: completed topics, quiz scores and the overall
+percentage, stored in one CourseProgress row per (user, course).
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.auth import get_current_user
+from app.core.database import get_db
+from app.models.models import Course, CourseProgress, Module, Topic, User
+from app.schemas.course import ProgressResponse, QuizScoreUpdate, TopicProgressUpdate
+from app.services.schedule_service import get_plan
+
+router = APIRouter()
+
+
+def _owned_course(db: Session, course_id: int, user_id: int):
+    course = db.query(Course.id, Course.topic_count).filter(
+        Course.id == course_id, Course.owner_id == user_id
+    ).first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return course
+
+
+def _get_or_create_progress(db: Session, course_id: int, user_id: int) -> CourseProgress:
+    progress = db.query(CourseProgress).filter(
+        CourseProgress.course_id == course_id,
+        CourseProgress.user_id == user_id
+    ).first()
+    if not progress:
+        progress = CourseProgress(
+            course_id=course_id, user_id=user_id,
+            completed_topic_ids=[], quiz_scores={}, overall_percentage=0.0
+        )
+        db.add(progress)
+    return progress
+
+
+@router.get("/progress/{course_id}", response_model=ProgressResponse)
+def get_progress(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The user's progress in a course; an empty record is created on first access."""
+    _owned_course(db, course_id, current_user.id)
+    progress = _get_or_create_progress(db, course_id, current_user.id)
+    db.commit()
+    return progress
+
+
+@router.post("/progress/{course_id}/topic", response_model=ProgressResponse)
+def update_topic_progress(
+    course_id: int,
+    update: TopicProgressUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Marks a topic of the course as completed (or not) and recomputes the percentage."""
+    course = _owned_course(db, course_id, current_user.id)
+    in_course = db.query(Topic.id).join(Module).filter(
+        Topic.id == update.topic_id, Module.course_id == course_id
+    ).first()
+    if not in_course:
+        raise HTTPException(status_code=404, detail="Topic not found")
+
+    progress = _get_or_create_progress(db, course_id, current_user.id)
+    completed = set(progress.completed_topic_ids or [])
+    if update.completed:
+        completed.add(update.topic_id)
+    else:
+        completed.discard(update.topic_id)
+
+    # Reassign rather than mutate: plain JSON columns do not track in-place changes
+    progress.completed_topic_ids = sorted(completed)
+    if course.topic_count:
+        progress.overall_percentage = round(100 * len(completed) / course.topic_count, 1)
+    db.commit()
+    # Re-pack the study plan from today, if the learner has one
+    get_plan(db, current_user.id, course_id, create=False)
+    return progress
+
+
+@router.post("/progress/{course_id}/quiz", response_model=ProgressResponse)
+def update_quiz_score(
+    course_id: int,
+    update: QuizScoreUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Records the user's latest quiz score for a topic."""
+    _owned_course(db, course_id, current_user.id)
+    progress = _get_or_create_progress(db, course_id, current_user.id)
+    progress.quiz_scores = {**(progress.quiz_scores or {}), str(update.topic_id): update.score}
+    db.commit()
+    return progress
@@ -0,0 +1,44 @@
+"""
+Spaced-repetition reviews: the queue of due flashcards and quiz questions,
+and batch submission of a session's grades in one round-trip.
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.models import Course, User
+from app.schemas.course import ReviewBatch, ReviewBatchResult, ReviewCardSchema
+from app.services.review_service import due_cards, submit_reviews
+
+router = APIRouter()
+
+
+@router.get("/reviews/due", response_model=List[ReviewCardSchema], response_model_exclude_none=True)
+def get_due_cards(
+    limit: int = Query(20, ge=1, le=settings.REVIEW_MAX_DUE),
+    course_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The next cards due for review, most overdue first, across all courses or within one."""
+    if course_id is not None:
+        owned = db.query(Course.id).filter(Course.id == course_id, Course.owner_id == current_user.id).first()
+        if not owned:
+            raise HTTPException(status_code=404, detail="Course not found")
+    return due_cards(db, current_user.id, limit, course_id=course_id)
+
+
+@router.post("/reviews", response_model=ReviewBatchResult)
+def submit_review_batch(
+    batch: ReviewBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Records the grades of a review session; cards that are not the user's are listed as unknown."""
+    if len(batch.reviews) > settings.REVIEW_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {settings.REVIEW_MAX_BATCH} reviews per request")
+    return submit_reviews(db, current_user.id, [r.model_dump() for r in batch.reviews])
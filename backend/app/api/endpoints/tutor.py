@@ -0,0 +1,75 @@
+"""
+Course-wide AI tutor chat. Shares the mentor's stored conversation, so the
+tutor and the in-topic mentor see the same history for a course.
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.auth import get_current_user
+from app.core.database import get_db
+from app.core.overload import LLMUnavailableError
+from app.models.models import Course, MentorConversation, MentorMessage, Module, Topic, User
+from app.schemas.course import TutorMessage
+from app.services.conversation_service import answer_query, compact_conversation
+
+router = APIRouter()
+
+# Messages returned by GET /conversation
+CONVERSATION_LIMIT = 200
+
+
+@router.post("/tutor/{course_id}/chat")
+def chat_with_tutor(
+    course_id: int,
+    payload: TutorMessage,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Answers a question about the course, optionally focused on one topic."""
+    course = db.query(Course).filter(Course.id == course_id, Course.owner_id == current_user.id).first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    if not payload.message.strip():
+        raise HTTPException(status_code=400, detail="Message is required")
+
+    topic_title = "General"
+    if payload.topic_id:
+        topic = db.query(Topic.title).join(Module).filter(
+            Topic.id == payload.topic_id, Module.course_id == course_id
+        ).first()
+        topic_title = topic.title if topic else topic_title
+
+    try:
+        response, conversation = answer_query(db, course, current_user.id, topic_title, payload.message)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Tutor offline: {str(e)}")
+
+    background_tasks.add_task(compact_conversation, conversation.id)
+    return {"response": response, "conversation_id": conversation.id}
+
+
+@router.get("/tutor/{course_id}/conversation")
+def get_conversation(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The rolling summary and the most recent messages, oldest first."""
+    conversation = db.query(MentorConversation).filter(
+        MentorConversation.user_id == current_user.id,
+        MentorConversation.course_id == course_id
+    ).first()
+    if not conversation:
+        return {"conversation_id": None, "summary": "", "messages": []}
+
+    messages = db.query(MentorMessage.role, MentorMessage.content).filter(
+        MentorMessage.conversation_id == conversation.id
+    ).order_by(MentorMessage.id.desc()).limit(CONVERSATION_LIMIT).all()
+    return {
+        "conversation_id": conversation.id,
+        "summary": conversation.summary,
+        "messages": [{"role": m.role, "content": m.content} for m in reversed(messages)]
+    }
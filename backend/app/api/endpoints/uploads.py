@@ -0,0 +1,128 @@
+"""
+One-shot course generation from an uploaded file, pasted text or a link.
+PDFs are read in-process; images, audio and video go through the media
+service, which hands them to the media worker when one is configured.
+"""
+import os
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.agents.curriculum_agent import generate_course_syllabus
+from app.api.endpoints.auth import get_current_user
+from app.api.endpoints.courses import save_course_to_db
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.overload import LLMUnavailableError
+from app.models.models import Course, User
+from app.services.ingestion_service import ingestion_service
+from app.services.media_service import MediaProcessingError, extract_media_text, media_kind
+
+router = APIRouter()
+
+
+def _save_upload(file: UploadFile) -> str:
+    """Writes the upload under UPLOAD_DIR in chunks and returns its path; the caller deletes it."""
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.UPLOAD_DIR, f"{uuid.uuid4()}{os.path.splitext(file.filename or '')[1]}")
+    with open(path, "wb") as out:
+        while chunk := file.file.read(1024 * 1024):
+            out.write(chunk)
+    return path
+
+
+def _file_text(file: UploadFile) -> tuple:
+    """(text, source_type) for an uploaded file."""
+    content_type = (file.content_type or "").lower()
+    if "pdf" in content_type or (file.filename or "").lower().endswith(".pdf"):
+        return ingestion_service.extract_text_from_pdf(file.file.read()), "pdf"
+
+    kind = media_kind(content_type)
+    if kind:
+        path = _save_upload(file)
+        try:
+            return extract_media_text(kind, path), kind
+        finally:
+            # Only the extracted text is kept; the raw upload is not stored
+            os.remove(path)
+
+    try:
+        return file.file.read().decode("utf-8"), "text"
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {file.content_type}")
+
+
+def _link_text(link: str) -> tuple:
+    if "youtube.com" in link or "youtu.be" in link:
+        sources = ingestion_service.ingest_youtube_batch([link])
+        if sources[0]["error"]:
+            raise HTTPException(status_code=502, detail=f"Could not fetch transcript: {sources[0]['error']}")
+        return ingestion_service.build_multi_source_context(sources), "youtube"
+    return ingestion_service.scrape_web_page(link), "link"
+
+
+@router.post("/upload", status_code=status.HTTP_201_CREATED)
+def upload_source(
+    file: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    link: Optional[str] = Form(None),
+    title: Optional[str] = Form(None),
+    difficulty: str = Form("Beginner"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Generates a course from a PDF, image, audio or video file, plain text or
+    a URL (YouTube or web page). Declared sync so extraction and generation
+    run in the threadpool rather than on the event loop.
+    """
+    try:
+        if file:
+            context_text, source_type = _file_text(file)
+            default_title = os.path.splitext(file.filename or "")[0] or "Uploaded File"
+        elif text:
+            context_text, source_type = text, "text"
+            default_title = "Uploaded Notes"
+        elif link:
+            context_text, source_type = _link_text(link)
+            default_title = "Video Analysis" if source_type == "youtube" else "Web Analysis"
+        else:
+            raise HTTPException(status_code=400, detail="Provide a file, text or link")
+    except MediaProcessingError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Could not read the upload: {str(e)}")
+
+    if not context_text.strip():
+        raise HTTPException(status_code=422, detail="No text could be extracted from the upload")
+
+    try:
+        syllabus = generate_course_syllabus(title or default_title, difficulty, context_text)
+        course = save_course_to_db(syllabus, title or default_title, difficulty, current_user.id, db, source_type=source_type)
+    except LLMUnavailableError:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=503, detail=f"AI Generation failed: {str(e)}")
+
+    return {"course_id": course.id, "title": course.title, "status": course.status, "source_type": source_type}
+
+
+@router.get("/upload/status/{course_id}")
+def get_upload_status(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Generation status of a course created from an upload."""
+    course = db.query(Course.id, Course.title, Course.status, Course.module_count).filter(
+        Course.id == course_id, Course.owner_id == current_user.id
+    ).first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return {"course_id": course.id, "title": course.title, "status": course.status, "module_count": course.module_count}
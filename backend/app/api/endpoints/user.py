@@ -1,12 +1,12 @@
 from typing import Any
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.api.deps import get_current_user, get_db
-from app.agents.mapper_agent import generate_knowledge_graph
-from app.core.cache import knowledge_map_cache
+from app.core.structured import StructuredOutputError
 from app.models.models import User, Course, Topic, Module, CourseProgress
+from app.services.knowledge_graph_service import get_knowledge_graph
 from app.schemas.user import User as UserSchema
 
 router = APIRouter()
@@ -27,14 +27,14 @@ def get_learning_summary(
     current_user: User = Depends(get_current_user),
 ):
     """Calculates overall progress across all courses."""
-    courses = db.query(Course).filter(Course.owner_id == current_user.id).all()
+    courses = db.query(Course.id, Course.status).filter(Course.owner_id == current_user.id).all()
     if not courses:
         return {"total_progress": 0, "courses_completed": 0, "total_courses": 0}
     
     total_percentage = 0
     for course in courses:
         # Simple progress calculation: completed topics / total topics
-        all_topics = db.query(Topic).join(Module).filter(Module.course_id == course.id).all()
+        all_topics = db.query(func.count(Topic.id)).join(Module).filter(Module.course_id == course.id).scalar()
         completed_topics = db.query(CourseProgress).filter(
             CourseProgress.user_id == current_user.id,
             CourseProgress.course_id == course.id
@@ -42,7 +42,7 @@ def get_learning_summary(
         
         num_completed = len(completed_topics.completed_topic_ids) if completed_topics and completed_topics.completed_topic_ids else 0
         if all_topics:
-            total_percentage += (num_completed / len(all_topics)) * 100
+            total_percentage += (num_completed / all_topics) * 100
 
     return {
         "total_progress": round(total_percentage / len(courses), 1),
@@ -72,24 +72,11 @@ def get_knowledge_map(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generates a semantic knowledge graph of all user courses."""
-    courses = db.query(Course).filter(Course.owner_id == current_user.id).all()
-    
-    course_list = [
-        {
-            "id": c.id,
-            "title": c.title,
-            "description": c.description,
-            "category": c.category or "General"
-        } for c in courses
-    ]
-    
-    # Try cache first
-    cache_key = f"km_{current_user.id}_{len(course_list)}"
-    cached_graph = knowledge_map_cache.get(cache_key)
-    if cached_graph:
-        return cached_graph
-
-    graph = generate_knowledge_graph(course_list)
-    knowledge_map_cache.set(cache_key, graph)
-    return graph
+    """
+    Semantic knowledge graph of all user courses. The graph is stored, so only
+    courses added or edited since the last view are mapped again.
+    """
+    try:
+        return get_knowledge_graph(db, current_user.id)
+    except StructuredOutputError as e:
+        raise HTTPException(status_code=503, detail=f"Knowledge map generation failed: {str(e)}")
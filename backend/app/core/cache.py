@@ -1,9 +1,10 @@
 import time
 
 class SimpleCache:
-    def __init__(self, expire_seconds=3600):
+    def __init__(self, expire_seconds=3600, max_entries=None):
         self.cache = {}
         self.expire_seconds = expire_seconds
+        self.max_entries = max_entries
 
     def get(self, key):
         if key in self.cache:
@@ -11,12 +12,17 @@ class SimpleCache:
             if time.time() - timestamp < self.expire_seconds:
                 return data
             else:
-                del self.cache[key]
+                self.cache.pop(key, None)
         return None
 
     def set(self, key, value):
+        self.cache.pop(key, None)
         self.cache[key] = (value, time.time())
+        # Dicts keep insertion order, so the first key is the oldest entry
+        if self.max_entries and len(self.cache) > self.max_entries:
+            self.cache.pop(next(iter(self.cache)), None)
 
 # Global cache instances
-knowledge_map_cache = SimpleCache(expire_seconds=1800) # 30 mins
 podcast_cache = SimpleCache(expire_seconds=3600)      # 1 hour
+transcript_cache = SimpleCache(expire_seconds=86400, max_entries=500)  # 24 hours, keyed by video id
+response_cache = SimpleCache(expire_seconds=3600, max_entries=2000)  # Serialized bodies keyed by (resource, version)
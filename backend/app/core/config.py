@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -15,6 +17,135 @@ class Settings(BaseSettings):
 
     # Gemini AI
     GEMINI_API_KEY: str = ""
+    PROMPT_TOKEN_BUDGET: int = 8000  # Default input budget for assembled prompts
+    # Syllabus prompts carry whole source documents, so they get their own
+    # budget, shared evenly between the videos of a playlist (or evenly spaced
+    # sections of one long document) so every part of the source is seen
+    SYLLABUS_PROMPT_TOKEN_BUDGET: int = 32000
+    SYLLABUS_SOURCE_SECTIONS: int = 8
+
+    # Models per agent, primary first; calls fail over down the list while a
+    # model is out of quota. Agents without an entry use "default".
+    LLM_ROUTES: Dict[str, List[str]] = {
+        "default": ["gemini-flash-latest", "gemini-flash-lite-latest"],
+        "tutor": ["gemini-1.5-flash", "gemini-flash-latest"],
+    }
+    # Relative cost per 1K tokens; models above an agent's LLM_MAX_COST are skipped
+    LLM_MODEL_COSTS: Dict[str, float] = {
+        "gemini-flash-lite-latest": 0.25,
+        "gemini-1.5-flash": 1.0,
+        "gemini-flash-latest": 1.0,
+        "gemini-pro-latest": 8.0,
+    }
+    LLM_MAX_COST: Dict[str, float] = {}
+    # A backup request goes to the next model once a call runs past the
+    # primary's observed p95, capped by the agent's latency budget (the
+    # budget alone is used until enough calls have been seen). The deadline
+    # runs from when the request is sent, and at most LLM_HEDGE_BUDGET of
+    # calls are hedged (up to LLM_HEDGE_BURST banked while traffic is quiet).
+    LLM_HEDGING_ENABLED: bool = True
+    LLM_LATENCY_BUDGET_MS: Dict[str, float] = {"default": 30000, "curriculum": 90000, "tutor": 20000}
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_LATENCY_WINDOW: int = 200  # recent calls per model used for the p95
+    LLM_HEDGE_BUDGET: float = 0.05
+    LLM_HEDGE_BURST: int = 5
+    LLM_HEDGE_WORKERS: int = 32  # threads for backups, on top of one per LLM_MAX_IN_FLIGHT call
+
+    # Process-wide cap on LLM requests (token bucket); 0 leaves it off.
+    # Batch generation sets it from --rps.
+    LLM_REQUESTS_PER_SECOND: float = 0
+    LLM_REQUESTS_BURST: int = 4
+
+    # Circuit breaker per model: trips when at least LLM_BREAKER_ERROR_RATE of
+    # the last LLM_BREAKER_WINDOW calls failed (once LLM_BREAKER_MIN_CALLS have
+    # been seen), refuses calls for LLM_BREAKER_OPEN_SECONDS, then sends a probe
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_ERROR_RATE: float = 0.5
+    LLM_BREAKER_OPEN_SECONDS: float = 30
+    # Longest a call waits for a model to come out of its 429 cool-down before
+    # failing with 503 + Retry-After
+    LLM_MAX_WAIT_SECONDS: float = 10
+    # Admission control: calls in flight per process, and the share of that
+    # each priority may fill. Priorities listed in LLM_SHED_WHEN_DEGRADED are
+    # refused while the primary model of their route is behind its breaker.
+    LLM_MAX_IN_FLIGHT: int = 64
+    LLM_AGENT_PRIORITY: Dict[str, str] = {
+        "tutor": "critical", "topic": "high", "curriculum": "normal", "lab": "normal",
+        "scheduler": "low", "podcast": "low", "mapper": "low",
+    }
+    LLM_PRIORITY_CAPACITY: Dict[str, float] = {"critical": 1.0, "high": 0.9, "normal": 0.75, "low": 0.5}
+    LLM_SHED_WHEN_DEGRADED: List[str] = ["low"]
+    LLM_SHED_RETRY_AFTER: float = 5
+
+    # "gemini", or "fake" for the offline stand-in in app.core.fake_llm (load tests, demos)
+    LLM_BACKEND: str = "gemini"
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = "lognormal"  # fixed, uniform or lognormal
+    FAKE_LLM_LATENCY_MS: float = 800  # median
+    FAKE_LLM_LATENCY_SPREAD: float = 0.5  # lognormal sigma, or +/- fraction for uniform
+    FAKE_LLM_LATENCY_MS_BY_AGENT: Dict[str, float] = {}  # e.g. {"curriculum": 4000}
+    FAKE_LLM_RATE_LIMIT_RATE: float = 0.0  # share of calls answered with a 429
+    FAKE_LLM_RATE_LIMIT_RATE_BY_MODEL: Dict[str, float] = {}  # e.g. {"gemini-flash-latest": 1.0} to force failover
+    FAKE_LLM_RESPONSES_FILE: str = ""  # JSON {agent: reply text or object}
+    FAKE_LLM_LIST_ITEMS: int = 3
+    FAKE_LLM_TEXT_REPEAT: int = 12
+    FAKE_LLM_SEED: Optional[int] = None
+
+    # Retrieval over course content
+    EMBEDDING_DIM: int = 1024
+    MENTOR_TOP_K: int = 6
+    VECTOR_INDEX_CACHE_COURSES: int = 64  # course indexes kept in memory per process (LRU)
+
+    # Prometheus-format metrics at /metrics
+    METRICS_ENABLED: bool = True
+
+    # Knowledge map: course pairs at least this similar are sent to the LLM for a label
+    KNOWLEDGE_EDGE_MIN_SIMILARITY: float = 0.1
+    KNOWLEDGE_EDGE_MAX_CANDIDATES: int = 5
+
+    # Topic sections (levels, extras, quizzes, flashcards) generated in parallel
+    TOPIC_SECTION_CONCURRENCY: int = 6
+
+    # Mentor chat history: turns not yet summarised are sent verbatim; once a
+    # batch has built up beyond MENTOR_HISTORY_TURNS, all but those are summarised
+    MENTOR_HISTORY_TURNS: int = 6
+    MENTOR_SUMMARY_BATCH_TURNS: int = 6
+
+    # Study schedule: topics are packed into days from their reading time at the
+    # chosen level (plus quizzes), with short reviews at the given day offsets
+    SCHEDULE_MINUTES_PER_DAY: int = 60
+    SCHEDULE_READING_WPM: int = 200
+    SCHEDULE_MINUTES_PER_QUIZ: float = 1.5
+    SCHEDULE_DEFAULT_TOPIC_MINUTES: int = 20  # topics whose content is not generated yet
+    SCHEDULE_REVIEW_INTERVALS: List[int] = [1, 3, 7]
+    SCHEDULE_REVIEW_MINUTES: int = 5
+    SCHEDULE_MAX_DAYS: int = 365
+
+    # Spaced repetition (SM-2) of flashcards and quiz questions
+    REVIEW_MIN_EASE: float = 1.3
+    REVIEW_MAX_DUE: int = 100     # cards per due request
+    REVIEW_MAX_BATCH: int = 500   # reviews per submission
+
+    # YouTube ingestion
+    YOUTUBE_MAX_CONCURRENCY: int = 4
+    YOUTUBE_REQUESTS_PER_SECOND: float = 2.0
+
+    # Rendered certificate PDFs, stored by content hash
+    CERTIFICATE_STORE_DIR: str = "storage/certificates"
+    CERTIFICATE_RENDER_WORKERS: int = 4
+
+    # Media uploaded through /api/v1/upload, kept only until its text is extracted;
+    # media workers must see the same directory. Not served over HTTP.
+    UPLOAD_DIR: str = "uploads"
+
+    # Media (OCR, Whisper) runs in the Celery worker in app.workers.media when a
+    # broker is set, e.g. redis://localhost:6379/1; otherwise inline
+    MEDIA_BROKER_URL: str = ""
+    MEDIA_TASK_TIMEOUT: int = 900
+    WHISPER_MODEL: str = "base"
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
 
     model_config = SettingsConfigDict(env_file=".env")
 
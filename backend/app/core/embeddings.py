@@ -0,0 +1,69 @@
+"""
+Local text embeddings via the hashing trick.
+No model download and no API call, so vectors can be computed inline
+wherever text is produced.
+"""
+import re
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def embed(texts: List[str], dim: Optional[int] = None) -> np.ndarray:
+    """
+    Embeds texts into L2-normalised vectors using the hashing trick over
+    unigrams and bigrams. Returns a float32 matrix of shape (len(texts), dim).
+    """
+    dim = dim or settings.EMBEDDING_DIM
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = _WORD_PATTERN.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            # The top bit picks the sign so collisions tend to cancel out
+            matrix[row, h % dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(matrix[row])
+        if norm:
+            matrix[row] /= norm
+    return matrix
+
+
+def chunk_text(text: str, max_words: int = 120, overlap: int = 20) -> List[str]:
+    """Splits text into overlapping windows of roughly `max_words` words."""
+    words = text.split()
+    if len(words) <= max_words:
+        return [text] if words else []
+    step = max_words - overlap
+    return [" ".join(words[i:i + max_words]) for i in range(0, len(words) - overlap, step)]
+
+
+class CourseIndex:
+    """In-memory matrix of chunk embeddings for one course."""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.matrix = np.zeros((0, settings.EMBEDDING_DIM), dtype=np.float32)
+
+    def add(self, texts: List[str], vectors: Optional[np.ndarray] = None):
+        if not texts:
+            return
+        if vectors is None:
+            vectors = embed(texts)
+        self.texts.extend(texts)
+        self.matrix = np.vstack([self.matrix, vectors])
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Returns the k most similar chunks as (text, cosine score) pairs."""
+        if not self.texts:
+            return []
+        scores = self.matrix @ embed([query])[0]
+        k = min(k, len(self.texts))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.texts[i], float(scores[i])) for i in top if scores[i] > 0]
@@ -0,0 +1,125 @@
+"""
+Offline stand-in for the Gemini SDK, selected with LLM_BACKEND=fake.
+
+Replies after a sampled latency, can fail with injected 429s, and returns
+canned text or JSON, so the full request path (retries, parsing, persistence)
+can be load-tested without an API key or quota. JSON replies are synthesised
+from the response schema the agent asked for unless a canned reply for that
+agent is configured in FAKE_LLM_RESPONSES_FILE.
+"""
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+_rng = random.Random(settings.FAKE_LLM_SEED)
+_rng_lock = threading.Lock()
+_canned: Optional[Dict[str, Any]] = None
+
+FILLER = (
+    "This section explains the idea step by step, starting from first principles "
+    "and building up to a worked example that ties the concepts together."
+)
+
+
+def _canned_responses() -> Dict[str, Any]:
+    global _canned
+    if _canned is None:
+        _canned = {}
+        if settings.FAKE_LLM_RESPONSES_FILE:
+            with open(settings.FAKE_LLM_RESPONSES_FILE, encoding="utf-8") as f:
+                _canned = json.load(f)
+    return _canned
+
+
+def sample_latency(agent: str) -> float:
+    """Seconds to wait before replying, drawn from the configured distribution."""
+    median = settings.FAKE_LLM_LATENCY_MS_BY_AGENT.get(agent, settings.FAKE_LLM_LATENCY_MS) / 1000
+    spread = settings.FAKE_LLM_LATENCY_SPREAD
+    with _rng_lock:
+        if settings.FAKE_LLM_LATENCY_DISTRIBUTION == "fixed":
+            return median
+        if settings.FAKE_LLM_LATENCY_DISTRIBUTION == "uniform":
+            return max(0.0, _rng.uniform(median * (1 - spread), median * (1 + spread)))
+        # lognormal: long right tail, like real model latency
+        return _rng.lognormvariate(0, spread) * median
+
+
+def _rate_limited(model_name: str) -> bool:
+    rate = settings.FAKE_LLM_RATE_LIMIT_RATE_BY_MODEL.get(model_name, settings.FAKE_LLM_RATE_LIMIT_RATE)
+    with _rng_lock:
+        return _rng.random() < rate
+
+
+def _sample(schema: Dict, name: str = "value") -> Any:
+    """A value matching a Gemini response schema (see app.core.structured.to_gemini_schema)."""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        return {prop: _sample(sub, prop) for prop, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_sample(schema.get("items", {}), name) for _ in range(settings.FAKE_LLM_LIST_ITEMS)]
+    if kind == "integer":
+        return 0
+    if kind == "number":
+        return 0.5
+    if kind == "boolean":
+        return True
+    return f"{name.replace('_', ' ').capitalize()}: {FILLER}"
+
+
+def _text(agent: str, generation_config: Optional[dict]) -> str:
+    canned = _canned_responses().get(agent)
+    if canned is not None:
+        return canned if isinstance(canned, str) else json.dumps(canned)
+    schema = (generation_config or {}).get("response_schema")
+    if schema:
+        return json.dumps(_sample(schema))
+    if (generation_config or {}).get("response_mime_type") == "application/json":
+        return "{}"
+    return " ".join([FILLER] * settings.FAKE_LLM_TEXT_REPEAT)
+
+
+class FakeGenerativeModel:
+    """Implements the slice of genai.GenerativeModel the app uses."""
+
+    def __init__(self, model_name: str, agent: str = "default", system_instruction: Optional[str] = None):
+        self.model_name = model_name
+        self.agent = agent
+        self.system_instruction = system_instruction
+
+    def generate_content(self, prompt: str, generation_config: Optional[dict] = None, stream: bool = False):
+        latency = sample_latency(self.agent)
+        if _rate_limited(self.model_name):
+            # Fail fast, like a real 429, and ask for a short back-off
+            time.sleep(min(latency, 0.05))
+            raise Exception("429 RESOURCE_EXHAUSTED (fake backend): retry in 0.5s")
+
+        text = _text(self.agent, generation_config)
+        if stream:
+            return FakeStreamResponse(text, latency)
+        time.sleep(latency)
+        return SimpleNamespace(text=text, usage_metadata=None)
+
+
+class FakeStreamResponse:
+    """Iterates over chunks like a streamed SDK response; .text is the full reply."""
+
+    def __init__(self, text: str, latency: float):
+        self.text = text
+        self.latency = latency
+        self.usage_metadata = None
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        words = self.text.split(" ")
+        chunks = [" ".join(words[i:i + 8]) + " " for i in range(0, len(words), 8)]
+        # Time to first chunk dominates, the rest trickles in
+        time.sleep(self.latency * 0.5)
+        for chunk in chunks:
+            time.sleep(self.latency * 0.5 / len(chunks))
+            yield SimpleNamespace(text=chunk)
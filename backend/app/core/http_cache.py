@@ -0,0 +1,61 @@
+"""
+Conditional GET support for read-mostly resources.
+A resource's ETag is derived from its version column, so a matching
+If-None-Match can be answered with 304 before anything is loaded or
+serialized, and serialized bodies can be cached per (resource, version).
+"""
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+
+from app.core.cache import response_cache
+
+# Private because every resource is per-user; no-cache makes the browser
+# revalidate on each navigation, which costs a 304 when nothing changed
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the parts that identify one version of a resource."""
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match covers `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(body: bytes, etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def cached_json(
+    key: tuple,
+    etag: str,
+    render: Callable[[], bytes],
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response:
+    """
+    Returns the serialized body for `key`, rendering it only on a cache miss.
+    `key` must include the resource version so stale bodies are never served.
+    """
+    body: Optional[bytes] = response_cache.get(key)
+    if body is None:
+        body = render()
+        response_cache.set(key, body)
+    return json_response(body, etag, cache_control)
@@ -0,0 +1,168 @@
+"""
+Tolerant JSON parsing for LLM output.
+Handles markdown fences, prose around the payload, trailing commas, Python
+literals, raw newlines inside strings and truncated (still streaming) output.
+"""
+import json
+import re
+from typing import Any, List, Tuple
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PARTIAL_LITERALS = {"t": "true", "tr": "true", "tru": "true", "f": "false", "fa": "false",
+                     "fal": "false", "fals": "false", "n": "null", "nu": "null", "nul": "null"}
+
+
+class JSONParseError(ValueError):
+    pass
+
+
+def _find_start(text: str) -> int:
+    """Index of the first '{' or '[' (skipping a ```json fence), or -1."""
+    fence = text.find("```")
+    if fence != -1:
+        newline = text.find("\n", fence)
+        candidate = min((i for i in (text.find("{", newline), text.find("[", newline)) if i != -1), default=-1)
+        if candidate != -1:
+            return candidate
+    return min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+
+
+def _scan(text: str) -> Tuple[str, List[list], bool, bool]:
+    """
+    Re-emits the first JSON value in `text` with local repairs applied.
+    Returns (repaired_text, open_containers, in_string, string_is_key).
+    Each open container is [opener, state] where state tracks what comes next
+    ("key", "colon", "value", "comma").
+    """
+    out: List[str] = []
+    stack: List[list] = []
+    in_str = escaped = is_key = False
+    word = ""
+
+    def flush_word():
+        nonlocal word
+        if word:
+            out.append(_LITERALS.get(word, word))
+            word = ""
+
+    for ch in text:
+        if in_str:
+            if escaped:
+                escaped = False
+                out.append(ch)
+            elif ch == "\\":
+                escaped = True
+                out.append(ch)
+            elif ch == '"':
+                in_str = False
+                out.append(ch)
+                if stack:
+                    stack[-1][1] = "colon" if is_key else "comma"
+            elif ch == "\n":
+                out.append("\\n")
+            elif ch == "\t":
+                out.append("\\t")
+            elif ch != "\r":
+                out.append(ch)
+            continue
+
+        if ch.isalnum() or ch in "+-.":
+            if stack and stack[-1][1] == "value":
+                stack[-1][1] = "comma"
+            word += ch
+            continue
+        flush_word()
+
+        if ch == '"':
+            in_str = True
+            is_key = bool(stack) and stack[-1][0] == "{" and stack[-1][1] == "key"
+            out.append(ch)
+        elif ch in "{[":
+            if stack:
+                stack[-1][1] = "comma"
+            stack.append([ch, "key" if ch == "{" else "value"])
+            out.append(ch)
+        elif ch in "}]":
+            # Drop a trailing comma before the closer
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+        elif ch == ":":
+            if stack:
+                stack[-1][1] = "value"
+            out.append(ch)
+        elif ch == ",":
+            if stack:
+                stack[-1][1] = "key" if stack[-1][0] == "{" else "value"
+            out.append(ch)
+        else:
+            out.append(ch)
+    flush_word()
+
+    return "".join(out), stack, in_str, in_str and is_key
+
+
+def _complete(repaired: str, stack: List[list], in_str: bool, string_is_key: bool) -> str:
+    """Closes whatever was left open by truncated output."""
+    s = repaired
+    if in_str:
+        if s.endswith("\\") and not s.endswith("\\\\"):
+            s = s[:-1]
+        s += '"'
+        if stack:
+            stack[-1][1] = "colon" if string_is_key else "comma"
+
+    # Finish a literal or number cut off mid-token
+    tail = re.search(r"([A-Za-z0-9+\-.eE]+)$", s.rstrip())
+    if tail and stack and stack[-1][1] == "comma" and not s.rstrip().endswith('"'):
+        token = tail.group(1)
+        if token in _PARTIAL_LITERALS:
+            s = s.rstrip()[:-len(token)] + _PARTIAL_LITERALS[token]
+        else:
+            s = s.rstrip().rstrip("+-.eE")
+
+    s = s.rstrip()
+    if stack:
+        state = stack[-1][1]
+        if state == "colon":
+            s += ": null"
+        elif state == "value" and stack[-1][0] == "{":
+            s += " null"
+        elif s.endswith(","):
+            s = s[:-1]
+
+    closers = "".join("}" if opener == "{" else "]" for opener, _ in reversed(stack))
+    return s + closers
+
+
+def loads_tolerant(text: str) -> Any:
+    """
+    Parses the first JSON value found in `text`, repairing common LLM mistakes.
+    Truncated output is closed off, so this also parses a streaming prefix.
+    Raises JSONParseError when nothing usable is found.
+    """
+    if not text:
+        raise JSONParseError("Empty response")
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    start = _find_start(text)
+    if start == -1:
+        raise JSONParseError("No JSON object or array found in response")
+
+    repaired, stack, in_str, string_is_key = _scan(text[start:])
+    candidate = _complete(repaired, stack, in_str, string_is_key) if (stack or in_str) else repaired
+    try:
+        return json.loads(candidate)
+    except ValueError as e:
+        raise JSONParseError(f"Could not repair JSON: {e}")
+
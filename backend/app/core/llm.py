@@ -1,73 +1,341 @@
+import re
 import time
 import logging
-import google.generativeai as genai
-from typing import Any, List, Union, Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, List, Union, Optional, TYPE_CHECKING
+from app.core import model_router
 from app.core.config import settings
+from app.core.overload import LLMUnavailableError, admission
+from app.core.metrics import (
+    llm_failovers, llm_hedges, llm_hedges_skipped, llm_rate_limited, llm_retries, llm_token_estimate_ratio, record_llm_call, record_llm_tokens
+)
+from app.core.prompt import count_tokens
+from app.core.rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure the native Gemini SDK
-if settings.GEMINI_API_KEY:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-else:
+if settings.LLM_BACKEND == "fake":
+    logger.warning("LLM_BACKEND=fake: AI replies are canned and nothing is sent to Gemini.")
+elif not settings.GEMINI_API_KEY:
     logger.warning("GEMINI_API_KEY is not set in environment settings.")
 
-def get_model(model_name: str = "gemini-flash-latest", system_instruction: Optional[str] = None) -> genai.GenerativeModel:
+_genai = None
+_genai_lock = threading.Lock()
+
+_rate_limiter: Optional[RateLimiter] = None
+
+def configure_rate_limit(requests_per_second: float, burst: int = 1):
+    """Caps LLM requests from this process, shared by every agent and thread; 0 turns it off."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(requests_per_second, burst=burst) if requests_per_second > 0 else None
+
+configure_rate_limit(settings.LLM_REQUESTS_PER_SECOND, settings.LLM_REQUESTS_BURST)
+
+def _throttle():
+    limiter = _rate_limiter
+    if limiter is not None:
+        limiter.acquire()
+
+# Runs calls that may be hedged, so the caller can stop waiting on the primary.
+# Admission lets LLM_MAX_IN_FLIGHT calls in, so every primary gets a worker and
+# LLM_HEDGE_WORKERS more are left for backups.
+_HEDGE_POOL_SIZE = settings.LLM_MAX_IN_FLIGHT + settings.LLM_HEDGE_WORKERS
+_hedge_pool = ThreadPoolExecutor(max_workers=_HEDGE_POOL_SIZE, thread_name_prefix="llm")
+_hedge_pool_busy = 0
+_hedge_pool_lock = threading.Lock()
+
+def get_genai():
+    """
+    The Gemini SDK, imported and configured on first use. It pulls in grpc and
+    protobuf, so processes that never call the model never pay for it.
+    """
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                if settings.GEMINI_API_KEY:
+                    genai.configure(api_key=settings.GEMINI_API_KEY)
+                _genai = genai
+    return _genai
+
+def get_model(model_name: str = model_router.DEFAULT_MODEL, system_instruction: Optional[str] = None, agent: str = "default") -> "genai.GenerativeModel":
     """
-    Returns a configured native Gemini model instance.
+    Returns a configured native Gemini model instance, or the offline stand-in
+    when LLM_BACKEND is "fake".
     """
+    if settings.LLM_BACKEND == "fake":
+        from app.core.fake_llm import FakeGenerativeModel
+        return FakeGenerativeModel(model_name, agent=agent, system_instruction=system_instruction)
+
     logger.info(f"Using Gemini model: {model_name}")
-    return genai.GenerativeModel(
+    return get_genai().GenerativeModel(
         model_name=model_name,
         system_instruction=system_instruction
     )
 
+def log_token_usage(model_name: str, prompt: str, system_instruction: Optional[str], response: Any, agent: str = "default"):
+    """
+    Logs and records per-call token usage. Prefers the counts reported by the
+    API and falls back to the local estimate when usage metadata is missing;
+    when both exist, how far the estimate was off is recorded.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    estimated = count_tokens(prompt) + count_tokens(system_instruction or "")
+    if usage is not None and getattr(usage, "prompt_token_count", None):
+        prompt_tokens = usage.prompt_token_count
+        output_tokens = usage.candidates_token_count
+        llm_token_estimate_ratio.observe(estimated / prompt_tokens, agent)
+    else:
+        prompt_tokens = estimated
+        output_tokens = count_tokens(response.text)
+    logger.info(f"AI ({model_name}) token usage: prompt={prompt_tokens} output={output_tokens}")
+    record_llm_tokens(agent, prompt_tokens, output_tokens)
+
+def is_rate_limited(error_str: str) -> bool:
+    return "429" in error_str or "RESOURCE_EXHAUSTED" in error_str
+
+def retry_delay(error_str: str, attempt: int, base_delay: int = 8) -> float:
+    """Exponential backoff, or the delay the API asked for when it tells us."""
+    delay = base_delay * (2 ** (attempt - 1))
+    match = re.search(r"retry in ([\d\.]+)s", error_str)
+    if match:
+        delay = float(match.group(1)) + 2
+    return delay
+
+def _attempt(model_name: str, prompt: str, system_instruction: Optional[str], generation_config: Optional[dict], agent: str,
+             on_send: Optional[Callable[[], None]] = None):
+    """
+    One request to one model. Records the outcome for routing and cools the
+    model down on a 429. `on_send` is called once the rate limiter lets the
+    request go.
+    """
+    if not model_router.begin(model_name):
+        raise LLMUnavailableError(f"AI ({model_name}) is being probed after an outage", 1)
+    _throttle()
+    if on_send is not None:
+        on_send()
+    began = time.perf_counter()
+    try:
+        model = get_model(model_name, system_instruction=system_instruction, agent=agent)
+        response = model.generate_content(prompt, generation_config=generation_config)
+        if not response or not response.text:
+            raise Exception("Empty response from Gemini API")
+    except Exception as e:
+        _record_failure(model_name, str(e), time.perf_counter() - began)
+        raise
+    model_router.record(model_name, "success", time.perf_counter() - began)
+    return response
+
+def _record_failure(model_name: str, error_str: str, seconds: float):
+    if is_rate_limited(error_str):
+        strikes = model_router.record(model_name, "rate_limited", seconds)
+        model_router.cool_down(model_name, retry_delay(error_str, strikes))
+    else:
+        model_router.record(model_name, "error", seconds)
+
+def _pooled_attempt(sent: threading.Event, model_name: str, *args):
+    """_attempt on the hedge pool; sets `sent` once the request is out (or has failed)."""
+    global _hedge_pool_busy
+    with _hedge_pool_lock:
+        _hedge_pool_busy += 1
+    try:
+        return _attempt(model_name, *args, on_send=sent.set)
+    finally:
+        sent.set()
+        with _hedge_pool_lock:
+            _hedge_pool_busy -= 1
+
+def _hedged_attempt(models: List[str], prompt: str, system_instruction: Optional[str], generation_config: Optional[dict], agent: str):
+    """
+    Calls models[0]; if it has not answered by its hedge deadline, sends the
+    same request to the next model (or the same one again) and returns
+    whichever succeeds first as (model_name, response). The slower request
+    is left to finish in the background.
+    The deadline counts from when the primary request is sent, not from time
+    spent waiting for a worker or the rate limiter. No backup is sent when
+    the hedge budget is spent or the pool has no idle worker.
+    """
+    primary = models[0]
+    deadline = model_router.hedge_after(agent, primary)
+    if deadline is None:
+        return primary, _attempt(primary, prompt, system_instruction, generation_config, agent)
+
+    args = (prompt, system_instruction, generation_config, agent)
+    sent = threading.Event()
+    futures = {_hedge_pool.submit(_pooled_attempt, sent, primary, *args): primary}
+    sent.wait()
+    done, _ = wait(futures, timeout=deadline)
+    if done:
+        return primary, next(iter(done)).result()
+
+    with _hedge_pool_lock:
+        saturated = _hedge_pool_busy >= _HEDGE_POOL_SIZE
+    if saturated or not model_router.take_hedge():
+        llm_hedges_skipped.inc(agent, "saturated" if saturated else "budget")
+        return primary, next(iter(futures)).result()
+
+    backup = models[1] if len(models) > 1 else primary
+    logger.info(f"AI ({primary}) slower than {deadline:.1f}s for {agent}, hedging with {backup}")
+    futures[_hedge_pool.submit(_pooled_attempt, threading.Event(), backup, *args)] = backup
+    pending, error = set(futures), None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                llm_hedges.inc(agent, "primary" if future is next(iter(futures)) else "backup")
+                return futures[future], future.result()
+            error = future.exception()
+    raise error
+
+def _route_health(models: List[str]) -> tuple:
+    """(degraded, retry_after) for admission control."""
+    retry_after = model_router.degraded(models)
+    return retry_after is not None, retry_after or 0.0
+
+def _wait_for_route(models: List[str], agent: str, waited: float) -> float:
+    """
+    Sleeps until a model on the route can be called and returns the new total
+    wait. Raises LLMUnavailableError instead when that would take the call
+    past LLM_MAX_WAIT_SECONDS, so requests fail fast rather than pile up.
+    """
+    delay = model_router.seconds_until_available(models)
+    if waited + delay > settings.LLM_MAX_WAIT_SECONDS:
+        logger.warning(f"AI models for {agent} unavailable for {delay:.0f}s, failing fast")
+        raise LLMUnavailableError(f"AI is temporarily unavailable for {agent}", delay)
+    llm_retries.inc(agent)
+    logger.warning(f"AI models for {agent} are all busy, retrying in {delay:.1f} seconds...")
+    time.sleep(delay)
+    return waited + delay
+
 def invoke_with_retry(
     prompt: str, 
     system_instruction: Optional[str] = None,
-    model_name: str = "gemini-flash-latest", 
-    max_attempts: int = 5
+    model_name: Optional[str] = None,
+    max_attempts: int = 5,
+    generation_config: Optional[dict] = None,
+    agent: str = "default"
 ) -> str:
     """
-    Invokes the native Gemini SDK with manual exponential backoff for 429 errors.
-    Returns the text content of the response.
+    Invokes the native Gemini SDK and returns the text content of the response.
+    Models come from the agent's route (settings.LLM_ROUTES), with
+    `model_name`, if given, tried first. A model that answers 429 is skipped
+    for the delay it asked for and the call fails over to the next one; the
+    call only waits when every model in the route is cooling down or behind
+    an open breaker, and raises LLMUnavailableError if that wait would exceed
+    LLM_MAX_WAIT_SECONDS or admission control sheds the call.
+    Slow calls are hedged (see _hedged_attempt).
+    `generation_config` is passed through, e.g. to request JSON output.
+    `agent` labels the call in the metrics.
     """
+    models = model_router.route(agent, model_name)
     attempt = 0
-    base_delay = 8
-
-    while attempt < max_attempts:
-        try:
-            # Re-initialize model with instructions on each attempt if needed
-            model = get_model(model_name, system_instruction=system_instruction)
-            response = model.generate_content(prompt)
-            
-            if not response or not response.text:
-                raise Exception("Empty response from Gemini API")
-            
-            return response.text
-        except Exception as e:
-            error_str = str(e)
-            
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+    waited = 0.0
+    started = time.perf_counter()
+
+    with admission.admit(agent, *_route_health(models)):
+        while True:
+            candidates = model_router.available(models)
+            if not candidates:
+                waited = _wait_for_route(models, agent, waited)
+                continue
+
+            try:
+                used, response = _hedged_attempt(candidates, prompt, system_instruction, generation_config, agent)
+            except LLMUnavailableError:
+                # Lost the race for a half-open probe; the route is re-checked
+                continue
+            except Exception as e:
+                error_str = str(e)
+                if not is_rate_limited(error_str):
+                    logger.error(f"AI call failed ({candidates[0]}) with non-retryable error: {error_str}")
+                    record_llm_call(agent, candidates[0], "error", started)
+                    raise e
+
+                llm_rate_limited.inc(agent)
                 attempt += 1
                 if attempt >= max_attempts:
-                    logger.error(f"Max attempts reached for AI call ({model_name}). Error: {error_str}")
+                    logger.error(f"Max attempts reached for AI call ({candidates[0]}). Error: {error_str}")
+                    record_llm_call(agent, candidates[0], "rate_limited", started)
+                    raise e
+                logger.warning(f"AI ({candidates[0]}) is out of quota for {agent}, failing over (Attempt {attempt}/{max_attempts})")
+                continue
+
+            if used != models[0]:
+                llm_failovers.inc(agent, used)
+            log_token_usage(used, prompt, system_instruction, response, agent)
+            record_llm_call(agent, used, "success", started)
+            return response.text
+
+def stream_with_retry(
+    prompt: str,
+    system_instruction: Optional[str] = None,
+    model_name: Optional[str] = None,
+    max_attempts: int = 5,
+    generation_config: Optional[dict] = None,
+    agent: str = "default"
+) -> Iterator[str]:
+    """
+    Streams the response text chunk by chunk, routed like invoke_with_retry.
+    429s fail over (or wait) only until the first chunk arrives; after that
+    the caller has already consumed output, so errors are raised as-is.
+    Streams are not hedged. The admission slot is held until the stream ends
+    or is closed.
+    """
+    models = model_router.route(agent, model_name)
+    attempt = 0
+    waited = 0.0
+    began = time.perf_counter()
+    with admission.admit(agent, *_route_health(models)):
+        while True:
+            candidates = model_router.available(models)
+            if not candidates:
+                waited = _wait_for_route(models, agent, waited)
+                continue
+
+            current = candidates[0]
+            if not model_router.begin(current):
+                continue
+            _throttle()
+            started = False
+            recorded = False
+            attempt_began = time.perf_counter()
+            try:
+                model = get_model(current, system_instruction=system_instruction, agent=agent)
+                response = model.generate_content(prompt, generation_config=generation_config, stream=True)
+                for chunk in response:
+                    text = chunk.text
+                    if text:
+                        started = True
+                        yield text
+                model_router.record(current, "success", time.perf_counter() - attempt_began)
+                recorded = True
+                if current != models[0]:
+                    llm_failovers.inc(agent, current)
+                log_token_usage(current, prompt, system_instruction, response, agent)
+                record_llm_call(agent, current, "success", began)
+                return
+            except Exception as e:
+                error_str = str(e)
+                _record_failure(current, error_str, time.perf_counter() - attempt_began)
+                recorded = True
+                attempt += 1
+                rate_limited = is_rate_limited(error_str)
+                if rate_limited:
+                    llm_rate_limited.inc(agent)
+                if started or not rate_limited or attempt >= max_attempts:
+                    logger.error(f"AI stream failed ({current}): {error_str}")
+                    record_llm_call(agent, current, "rate_limited" if rate_limited else "error", began)
                     raise e
-                
-                delay = base_delay * (2 ** (attempt - 1))
-                
-                try:
-                    import re
-                    match = re.search(r"retry in ([\d\.]+)s", error_str)
-                    if match:
-                        delay = float(match.group(1)) + 2
-                except:
-                    pass
-
-                logger.warning(f"AI ({model_name}) is busy, retrying in {int(delay)} seconds... (Attempt {attempt}/{max_attempts})")
-                time.sleep(delay)
-            else:
-                logger.error(f"AI call failed ({model_name}) with non-retryable error: {error_str}")
-                raise e
+                logger.warning(f"AI ({current}) is out of quota for {agent}, failing stream over (Attempt {attempt}/{max_attempts})")
+            finally:
+                if not recorded:
+                    # Closed before it finished (the client went away): nothing to
+                    # count, but a half-open probe must not keep the model shut
+                    model_router.release(current)
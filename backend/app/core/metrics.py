@@ -0,0 +1,259 @@
+"""
+In-process metrics exposed in the Prometheus text format at /metrics.
+
+A deliberately small registry (counters and fixed-bucket histograms with
+labels) so recording is a dict lookup and an add under a lock, cheap enough
+to leave on in production. Values are per process; scrape every worker.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast DB-only routes up to multi-minute generations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, series in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), series):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(series[-1])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List = []
+        # Callables returning extra exposition lines, evaluated at scrape time
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "courseforge_http_request_duration_seconds", "Request latency by route template.",
+    ("method", "route", "status")
+)
+http_db_queries = registry.histogram(
+    "courseforge_http_db_queries", "Database queries issued per request.",
+    ("method", "route"), buckets=COUNT_BUCKETS
+)
+http_db_seconds = registry.histogram(
+    "courseforge_http_db_seconds", "Time spent in database queries per request.",
+    ("method", "route")
+)
+db_queries = registry.counter("courseforge_db_queries_total", "Database queries, including those outside requests.")
+db_query_seconds = registry.counter("courseforge_db_query_seconds_total", "Total time spent in database queries.")
+
+topic_stream_first_paragraph = registry.histogram(
+    "courseforge_topic_stream_first_paragraph_seconds", "Time to the first streamed paragraph of a topic level.", ("level",)
+)
+
+llm_calls = registry.counter("courseforge_llm_calls_total", "LLM calls by agent and outcome.", ("agent", "model", "outcome"))
+llm_duration = registry.histogram(
+    "courseforge_llm_call_duration_seconds", "LLM call latency, including retries.", ("agent", "model")
+)
+llm_tokens = registry.counter("courseforge_llm_tokens_total", "LLM tokens by agent and direction.", ("agent", "direction"))
+llm_token_estimate_ratio = registry.histogram(
+    "courseforge_llm_token_estimate_ratio", "Local prompt token estimate divided by the count the API reported.",
+    ("agent",), buckets=(0.5, 0.75, 0.9, 0.95, 1.0, 1.05, 1.1, 1.25, 1.5, 2)
+)
+llm_retries = registry.counter("courseforge_llm_retries_total", "LLM attempts retried after a failure.", ("agent",))
+llm_rate_limited = registry.counter("courseforge_llm_rate_limited_total", "LLM attempts rejected with 429.", ("agent",))
+llm_failovers = registry.counter(
+    "courseforge_llm_failovers_total", "LLM calls served by a model other than the agent's primary.", ("agent", "model")
+)
+llm_breaker_transitions = registry.counter(
+    "courseforge_llm_breaker_transitions_total", "Circuit breaker state changes by model.", ("model", "state")
+)
+llm_shed = registry.counter("courseforge_llm_shed_total", "LLM calls refused by admission control.", ("agent", "reason"))
+llm_hedges = registry.counter(
+    "courseforge_llm_hedges_total", "Backup requests sent for slow LLM calls, by which request won.", ("agent", "winner")
+)
+llm_hedges_skipped = registry.counter(
+    "courseforge_llm_hedges_skipped_total", "Slow LLM calls left unhedged, by reason (budget, saturated).", ("agent", "reason")
+)
+
+
+def record_llm_call(agent: str, model_name: str, outcome: str, started: float):
+    llm_calls.inc(agent, model_name, outcome)
+    llm_duration.observe(time.perf_counter() - started, agent, model_name)
+
+
+def record_llm_tokens(agent: str, prompt_tokens: int, output_tokens: int):
+    llm_tokens.inc(agent, "prompt", amount=prompt_tokens or 0)
+    llm_tokens.inc(agent, "output", amount=output_tokens or 0)
+
+
+class _RequestStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware; sync endpoints run in a copied context, so the same
+# object is updated from the threadpool
+_request_stats: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine: Engine):
+    """Counts and times every query run through `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_queries.inc()
+        db_query_seconds.inc(amount=elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # A failed statement never reaches after_cursor_execute
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+def _route_template(scope) -> str:
+    """
+    The matched route's path template, e.g. /api/courses/topics/{topic_id}.
+    Newer FastAPI keeps the prefixed route of an included router in its own
+    scope entry; scope["route"] then holds the router-relative original.
+    """
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    # Unmatched paths share one label so scanners cannot blow up cardinality
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no per-request task or body buffering) that records
+    latency and DB usage per route template, e.g. /api/courses/{course_id}.
+    Streaming responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            template = _route_template(scope)
+            method = scope["method"]
+            http_request_duration.observe(elapsed, method, template, str(status[0]))
+            http_db_queries.observe(stats.queries, method, template)
+            http_db_seconds.observe(stats.seconds, method, template)
@@ -0,0 +1,204 @@
+"""
+Per-agent model routing.
+
+Each agent has an ordered list of models in settings.LLM_ROUTES, primary
+first. A model that answers 429 is cooled down for as long as the API asks
+(or an exponential back-off), and calls go to the next model in the list
+meanwhile instead of sleeping. Outcomes and latencies are tracked per model;
+the recent p95 sets the deadline after which a slow call is hedged with a
+backup request (for at most LLM_HEDGE_BUDGET of calls), and outcomes drive
+each model's circuit breaker (see app.core.overload). All of it is exported
+at /metrics.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.overload import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+DEFAULT_MODEL = "gemini-flash-latest"
+OUTCOMES = ("success", "rate_limited", "error")
+BREAKER_GAUGE = {CLOSED: 0, HALF_OPEN: 0.5, OPEN: 1}
+
+
+class ModelStats:
+    __slots__ = ("outcomes", "latencies", "strikes", "cooldown_until", "breaker")
+
+    def __init__(self, name: str):
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.latencies = deque(maxlen=settings.LLM_LATENCY_WINDOW)  # seconds, successful calls only
+        self.strikes = 0  # consecutive 429s
+        self.cooldown_until = 0.0
+        self.breaker = CircuitBreaker(name)
+
+    def wait(self, now: float) -> float:
+        """Seconds until this model may be called: its 429 cool-down or open breaker."""
+        return max(self.cooldown_until - now, self.breaker.retry_after(), 0.0)
+
+
+_stats: Dict[str, ModelStats] = {}
+_lock = threading.Lock()
+_hedge_credit = float(settings.LLM_HEDGE_BURST)  # backup requests that may still be sent
+
+
+def _model(name: str) -> ModelStats:
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats.setdefault(name, ModelStats(name))
+    return stats
+
+
+def route(agent: str, pinned: Optional[str] = None) -> List[str]:
+    """
+    Models to try for `agent`, in order. A `pinned` model goes first, ahead
+    of the agent's route. Models over the agent's cost ceiling are dropped,
+    keeping the cheapest if none fit.
+    """
+    models = list(settings.LLM_ROUTES.get(agent) or settings.LLM_ROUTES.get("default") or [DEFAULT_MODEL])
+    ceiling = settings.LLM_MAX_COST.get(agent)
+    if ceiling is not None:
+        cost = lambda m: settings.LLM_MODEL_COSTS.get(m, 0.0)
+        models = [m for m in models if cost(m) <= ceiling] or [min(models, key=cost)]
+    if pinned:
+        models = [pinned] + [m for m in models if m != pinned]
+    return models
+
+
+def available(models: List[str]) -> List[str]:
+    """The models neither cooling down after a 429 nor behind an open breaker, in route order."""
+    now = time.monotonic()
+    with _lock:
+        return [m for m in models if _model(m).wait(now) == 0.0]
+
+
+def seconds_until_available(models: List[str]) -> float:
+    now = time.monotonic()
+    with _lock:
+        return min(_model(m).wait(now) for m in models)
+
+
+def degraded(models: List[str]) -> Optional[float]:
+    """
+    Seconds until the route's primary model takes calls again while its
+    breaker is refusing them, else None. Traffic is then spilling onto the
+    fallbacks, which is when low-priority work should back off.
+    """
+    with _lock:
+        retry_after = _model(models[0]).breaker.retry_after()
+    return retry_after or None
+
+
+def begin(model_name: str) -> bool:
+    """Claims a call slot from the model's breaker; False while it only allows a probe that is already out."""
+    with _lock:
+        return _model(model_name).breaker.begin()
+
+
+def release(model_name: str):
+    """Gives up a slot claimed with begin() without recording an outcome."""
+    with _lock:
+        _model(model_name).breaker.release()
+
+
+def record(model_name: str, outcome: str, seconds: float) -> int:
+    """
+    Records one attempt against a model. Returns the model's count of
+    consecutive 429s, which sizes its cool-down.
+    """
+    with _lock:
+        stats = _model(model_name)
+        stats.outcomes[outcome] += 1
+        if outcome == "success":
+            stats.latencies.append(seconds)
+            stats.strikes = 0
+        elif outcome == "rate_limited":
+            stats.strikes += 1
+        stats.breaker.record(outcome == "success")
+        return stats.strikes
+
+
+def cool_down(model_name: str, seconds: float):
+    with _lock:
+        stats = _model(model_name)
+        stats.cooldown_until = max(stats.cooldown_until, time.monotonic() + seconds)
+
+
+def _p95(latencies) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def hedge_after(agent: str, model_name: str) -> Optional[float]:
+    """
+    Seconds to wait on `model_name` before sending a backup request, or None
+    when hedging is off. Each call asking earns LLM_HEDGE_BUDGET of a hedge
+    for take_hedge to spend.
+    """
+    global _hedge_credit
+    if not settings.LLM_HEDGING_ENABLED:
+        return None
+    budget = settings.LLM_LATENCY_BUDGET_MS.get(agent, settings.LLM_LATENCY_BUDGET_MS.get("default", 30000)) / 1000
+    with _lock:
+        _hedge_credit = min(float(settings.LLM_HEDGE_BURST), _hedge_credit + settings.LLM_HEDGE_BUDGET)
+        latencies = list(_model(model_name).latencies)
+    if len(latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+        return budget
+    return min(_p95(latencies), budget)
+
+
+def take_hedge() -> bool:
+    """Spends one hedge from the budget; False when hedges are already at their share of calls."""
+    global _hedge_credit
+    with _lock:
+        if _hedge_credit < 1:
+            return False
+        _hedge_credit -= 1
+        return True
+
+
+def snapshot() -> Dict[str, dict]:
+    """Per-model attempt counts, success rate and recent p95 since process start."""
+    with _lock:
+        items = [(name, dict(s.outcomes), list(s.latencies), s.breaker.state) for name, s in _stats.items()]
+    result = {}
+    for name, outcomes, latencies, breaker in items:
+        attempts = sum(outcomes.values())
+        result[name] = {
+            **outcomes,
+            "attempts": attempts,
+            "success_rate": outcomes["success"] / attempts if attempts else None,
+            "p95_seconds": _p95(latencies) if latencies else None,
+            "breaker": breaker,
+        }
+    return result
+
+
+def _model_metrics() -> List[str]:
+    stats = snapshot()
+    lines = [
+        "# HELP courseforge_llm_model_attempts_total LLM attempts by model and outcome, including hedges.",
+        "# TYPE courseforge_llm_model_attempts_total counter",
+    ]
+    for name, s in sorted(stats.items()):
+        for outcome in OUTCOMES:
+            lines.append(f'courseforge_llm_model_attempts_total{{model="{name}",outcome="{outcome}"}} {s[outcome]}')
+    lines += [
+        "# HELP courseforge_llm_model_latency_p95_seconds p95 of recent successful calls per model.",
+        "# TYPE courseforge_llm_model_latency_p95_seconds gauge",
+    ]
+    for name, s in sorted(stats.items()):
+        if s["p95_seconds"] is not None:
+            lines.append(f'courseforge_llm_model_latency_p95_seconds{{model="{name}"}} {s["p95_seconds"]}')
+    lines += [
+        "# HELP courseforge_llm_breaker_open Whether the model's circuit breaker is refusing calls (1 open, 0.5 half-open).",
+        "# TYPE courseforge_llm_breaker_open gauge",
+    ]
+    for name, s in sorted(stats.items()):
+        lines.append(f'courseforge_llm_breaker_open{{model="{name}"}} {BREAKER_GAUGE[s["breaker"]]}')
+    return lines
+
+
+registry.collectors.append(_model_metrics)
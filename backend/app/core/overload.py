@@ -0,0 +1,139 @@
+"""
+Protection for the API when the LLM backend is degraded.
+
+A circuit breaker per model trips when the recent error rate is too high,
+so calls fail fast instead of queueing behind retries, and lets a single
+probe through after a pause (half-open) to find out whether the model has
+recovered. Admission control caps LLM calls in flight and sheds
+low-priority agents (podcast, knowledge map, ...) first: they get less of
+the capacity and are turned away entirely while the primary model of their
+route is behind its breaker (traffic is then spilling onto the fallbacks).
+Rejected calls raise LLMUnavailableError, answered as 503 with Retry-After.
+"""
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from app.core.config import settings
+from app.core.metrics import llm_breaker_transitions, llm_shed
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class LLMUnavailableError(Exception):
+    """The LLM cannot take this call right now; retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class CircuitBreaker:
+    """
+    Closed: calls flow and outcomes are counted over a sliding window.
+    Open: calls are refused until LLM_BREAKER_OPEN_SECONDS have passed.
+    Half-open: one probe call is let through; its outcome closes or reopens.
+    Callers hold the router's lock, so the breaker does no locking itself.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=settings.LLM_BREAKER_WINDOW)  # True for success
+        self.opened_at = 0.0
+        self.probe_started = None
+
+    def _transition(self, state: str):
+        self.state = state
+        llm_breaker_transitions.inc(self.name, state)
+
+    def retry_after(self) -> float:
+        """Seconds until a call could be let through again."""
+        if self.state == OPEN:
+            return max(0.0, self.opened_at + settings.LLM_BREAKER_OPEN_SECONDS - time.monotonic())
+        if self.state == HALF_OPEN and self.probe_started is not None:
+            # Same staleness rule as begin(), so a lost probe frees the model here too
+            stale_in = self.probe_started + settings.LLM_BREAKER_OPEN_SECONDS - time.monotonic()
+            return min(1.0, max(0.0, stale_in))
+        return 0.0
+
+    def begin(self) -> bool:
+        """Claims the slot for a call; in half-open state only one probe gets it."""
+        now = time.monotonic()
+        if self.state == OPEN and now >= self.opened_at + settings.LLM_BREAKER_OPEN_SECONDS:
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            # A probe that never reported back must not keep the breaker shut
+            if self.probe_started is not None and now - self.probe_started < settings.LLM_BREAKER_OPEN_SECONDS:
+                return False
+            self.probe_started = now
+        return self.state != OPEN
+
+    def release(self):
+        """Hands back a probe that ended without an outcome (e.g. its stream was closed early)."""
+        if self.state == HALF_OPEN:
+            self.probe_started = None
+
+    def record(self, ok: bool):
+        if self.state == HALF_OPEN:
+            self.probe_started = None
+            if ok:
+                self.outcomes.clear()
+                self._transition(CLOSED)
+            else:
+                self._trip()
+            return
+
+        self.outcomes.append(ok)
+        failures = self.outcomes.count(False)
+        if (self.state == CLOSED and len(self.outcomes) >= settings.LLM_BREAKER_MIN_CALLS
+                and failures / len(self.outcomes) >= settings.LLM_BREAKER_ERROR_RATE):
+            self._trip()
+
+    def _trip(self):
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+        self._transition(OPEN)
+
+
+def priority(agent: str) -> str:
+    return settings.LLM_AGENT_PRIORITY.get(agent, "normal")
+
+
+class Admission:
+    """Counts LLM calls in flight and decides which new ones may start."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def admit(self, agent: str, degraded: bool = False, retry_after: float = 0.0):
+        level = priority(agent)
+        if degraded and level in settings.LLM_SHED_WHEN_DEGRADED:
+            llm_shed.inc(agent, "degraded")
+            raise LLMUnavailableError(
+                f"AI is degraded; {agent} requests are paused", retry_after or settings.LLM_SHED_RETRY_AFTER
+            )
+
+        limit = settings.LLM_MAX_IN_FLIGHT * settings.LLM_PRIORITY_CAPACITY.get(level, 1.0)
+        with self.lock:
+            if self.in_flight >= limit:
+                admitted = False
+            else:
+                admitted = True
+                self.in_flight += 1
+        if not admitted:
+            llm_shed.inc(agent, "capacity")
+            raise LLMUnavailableError(f"AI is at capacity for {level}-priority requests", settings.LLM_SHED_RETRY_AFTER)
+
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+admission = Admission()
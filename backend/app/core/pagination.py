@@ -0,0 +1,89 @@
+"""
+Keyset (cursor) pagination on (created_at, id).
+Each page continues strictly after the last row of the previous one, so deep
+pages cost the same as the first and rows inserted meanwhile never shift the
+window the way OFFSET does.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, literal, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+SQLITE_TIMESTAMP = "%Y-%m-%d %H:%M:%f"
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except Exception:
+        raise PaginationError("Invalid cursor")
+
+
+def paginate(query, created_col, id_col, cursor: Optional[str] = None,
+             limit: int = DEFAULT_PAGE_SIZE, descending: bool = True) -> Tuple[List[Any], Optional[str]]:
+    """
+    Applies the keyset condition, ordering and limit to `query`.
+    Rows must expose `created_at` and `id`. Returns (rows, next_cursor), where
+    next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sqlite = query.session.get_bind().dialect.name == "sqlite"
+    # SQLite keeps timestamps as text in more than one format (CURRENT_TIMESTAMP
+    # has no fraction), so there both sides are compared in a normalised form
+    key = func.strftime(SQLITE_TIMESTAMP, created_col) if sqlite else created_col
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if created_at is None:
+            query = query.filter(id_col < row_id if descending else id_col > row_id)
+        else:
+            value = func.strftime(SQLITE_TIMESTAMP, literal(created_at.strftime("%Y-%m-%d %H:%M:%S.%f"))) if sqlite else created_at
+            if descending:
+                query = query.filter(or_(key < value, and_(key == value, id_col < row_id)))
+            else:
+                query = query.filter(or_(key > value, and_(key == value, id_col > row_id)))
+
+    order = (key.desc(), id_col.desc()) if descending else (key.asc(), id_col.asc())
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], required: Iterable[str] = ("id",)) -> List[str]:
+    """
+    Parses a comma-separated `fields` parameter against the allowed names.
+    Returns every allowed field when none are given; required ones are always kept.
+    """
+    allowed = list(allowed)
+    if not fields:
+        return allowed
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in allowed]
+    if unknown:
+        raise PaginationError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return [f for f in allowed if f in wanted or f in required]
+
+
+def select_columns(columns: Dict[str, Any], fields: List[str]) -> List[Any]:
+    """Labelled column expressions for the selected fields, plus the keyset columns."""
+    names = list(dict.fromkeys(fields + ["id", "created_at"]))
+    return [columns[name].label(name) for name in names]
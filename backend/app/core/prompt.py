@@ -0,0 +1,168 @@
+"""
+Token-budgeted prompt assembly shared by the agents.
+Prompts are built from named sections with a priority; when the total goes
+over budget the least important sections are trimmed (or dropped) first.
+"""
+import logging
+import math
+import re
+from typing import List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Words, numbers and individual punctuation marks, roughly how SentencePiece splits text
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimates tokens locally without calling the API.
+    Long words are split into ~4 character pieces the way BPE vocabularies do.
+    Every punctuation mark counts as a token, so the estimate errs high, which
+    is the safe side for a budget. How far it is off in practice is recorded
+    in courseforge_llm_token_estimate_ratio (see app.core.llm.log_token_usage).
+    """
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " [...]") -> str:
+    """
+    Shortens text to at most `max_tokens`, cutting at a sentence boundary when
+    possible so the model sees complete statements (a cheap extractive summary).
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    kept, used = [], count_tokens(marker)
+    for sentence in _SENTENCE_END.split(text):
+        cost = count_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+
+    if not kept:
+        # A single long sentence: fall back to cutting on word boundaries
+        words, used = [], count_tokens(marker)
+        for word in text.split():
+            used += count_tokens(word)
+            if used > max_tokens:
+                break
+            words.append(word)
+        return " ".join(words) + marker
+    return " ".join(kept) + marker
+
+
+def truncate_evenly(parts: List[str], max_tokens: int, marker: str = " [...]") -> List[str]:
+    """
+    Shortens parts so together they fit `max_tokens`, each getting an equal
+    share; what short parts leave unused is shared among the longer ones.
+    Every part keeps its beginning (see truncate_to_tokens).
+    """
+    sizes = [count_tokens(part) for part in parts]
+    if sum(sizes) <= max_tokens:
+        return list(parts)
+
+    caps, remaining, left = {}, max(0, max_tokens), len(parts)
+    for i in sorted(range(len(parts)), key=sizes.__getitem__):
+        caps[i] = min(sizes[i], remaining // left)
+        remaining -= caps[i]
+        left -= 1
+    return [truncate_to_tokens(part, caps[i], marker) for i, part in enumerate(parts)]
+
+
+class PromptSection:
+    """
+    A named block of the prompt.
+    Text sections are shortened sentence by sentence; item sections (chat turns,
+    course entries) drop whole items, oldest first when keep="tail".
+    """
+
+    def __init__(
+        self,
+        name: str,
+        text: str = "",
+        items: Optional[List[str]] = None,
+        priority: int = 0,
+        required: bool = False,
+        header: str = "",
+        keep: str = "tail",
+        separator: str = "\n",
+    ):
+        self.name = name
+        self.text = text
+        self.items = list(items) if items is not None else None
+        self.priority = priority
+        self.required = required
+        self.header = header
+        self.keep = keep
+        self.separator = separator
+
+    def render(self) -> str:
+        body = self.separator.join(self.items) if self.items is not None else self.text
+        if not body:
+            return ""
+        return f"{self.header}{body}" if self.header else body
+
+    @property
+    def tokens(self) -> int:
+        return count_tokens(self.render())
+
+    def shrink(self, max_tokens: int):
+        """Reduces the section to at most `max_tokens` tokens."""
+        if self.items is not None:
+            while self.items and self.tokens > max_tokens:
+                if self.keep == "tail":
+                    self.items.pop(0)
+                else:
+                    self.items.pop()
+        else:
+            self.text = truncate_to_tokens(self.text, max_tokens - count_tokens(self.header))
+
+
+class PromptBuilder:
+    """
+    Collects sections and renders them within a token budget.
+
+    builder = PromptBuilder("mentor", budget=4000)
+    builder.add("context", context_text, priority=100, required=True)
+    builder.add("history", items=turns, priority=20, header="Chat History:\\n")
+    prompt = builder.build()
+    """
+
+    def __init__(self, name: str, budget: Optional[int] = None):
+        self.name = name
+        self.budget = budget or settings.PROMPT_TOKEN_BUDGET
+        self.sections: List[PromptSection] = []
+
+    def add(self, name: str, text: str = "", items: Optional[List[str]] = None, **kwargs) -> "PromptBuilder":
+        self.sections.append(PromptSection(name, text=text, items=items, **kwargs))
+        return self
+
+    def build(self) -> str:
+        total = sum(s.tokens for s in self.sections)
+        before = total
+
+        if total > self.budget:
+            # Trim the least important sections first; required ones are never touched
+            for section in sorted(self.sections, key=lambda s: s.priority):
+                if total <= self.budget:
+                    break
+                if section.required:
+                    continue
+                current = section.tokens
+                section.shrink(max(0, current - (total - self.budget)))
+                total -= current - section.tokens
+
+        logger.info(
+            f"Prompt '{self.name}': {total}/{self.budget} tokens (before trimming: {before}) "
+            + ", ".join(f"{s.name}={s.tokens}" for s in self.sections)
+        )
+        return "\n\n".join(part for part in (s.render() for s in self.sections) if part)
@@ -0,0 +1,55 @@
+"""
+Fast JSON encoding for large payloads.
+
+Routes with a response_model are already serialized by pydantic-core straight
+to bytes, so they are left alone. Routes that build plain dicts go through
+FastAPI's jsonable_encoder, which costs far more than the encoding itself;
+returning FastJSONResponse (or bytes from `dumps`) skips that step.
+"""
+import json
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library
+    orjson = None
+
+
+def _default(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes dicts/lists (datetimes, enums and pydantic models included) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def orm_to_json(schema, obj: Any, **dump_kwargs) -> bytes:
+    """
+    Validates ORM objects (or dicts holding them) against `schema` and dumps
+    them to JSON bytes in pydantic-core, without an intermediate dict.
+    """
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True), **dump_kwargs)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
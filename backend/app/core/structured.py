@@ -0,0 +1,165 @@
+"""
+Structured (JSON) output for agents.
+Requests JSON through the model's response schema mode, validates it with
+Pydantic, repairs near-miss JSON locally and, only if that fails, retries the
+single failing call with a targeted fix-up prompt.
+"""
+import json
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.core.json_parser import JSONParseError, loads_tolerant
+from app.core.llm import invoke_with_retry
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Keys of the JSON schema that Gemini's response_schema understands
+_SCHEMA_KEYS = {"type", "description", "enum", "items", "properties", "required", "nullable"}
+
+FIXUP_PROMPT = """Your previous reply could not be used: {error}
+
+Previous reply:
+{reply}
+
+Return ONLY the corrected JSON, matching the requested schema exactly."""
+
+
+class StructuredOutputError(Exception):
+    """Raised when an agent's output could not be parsed or validated, even after a fix-up retry."""
+
+
+def to_gemini_schema(schema: Any) -> Dict:
+    """Converts a Pydantic model (or type like List[Model]) into a Gemini response schema."""
+    json_schema = TypeAdapter(schema).json_schema()
+    defs = json_schema.pop("$defs", {})
+
+    def convert(node: Dict) -> Dict:
+        if "$ref" in node:
+            node = defs[node["$ref"].split("/")[-1]]
+        if "anyOf" in node:
+            # Optional[X] -> X with nullable
+            options = [o for o in node["anyOf"] if o.get("type") != "null"]
+            converted = convert(options[0])
+            converted["nullable"] = True
+            return converted
+
+        out = {k: v for k, v in node.items() if k in _SCHEMA_KEYS}
+        if "properties" in out:
+            out["properties"] = {name: convert(prop) for name, prop in out["properties"].items()}
+        if "items" in out:
+            out["items"] = convert(out["items"])
+        return out
+
+    return convert(json_schema)
+
+
+class ParseStats:
+    """Per-agent counters for structured output outcomes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = defaultdict(lambda: defaultdict(int))
+
+    def record(self, agent: str, outcome: str):
+        with self.lock:
+            self.counts[agent]["calls" if outcome == "call" else outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            result = {}
+            for agent, counts in self.counts.items():
+                calls = counts["calls"] or 1
+                result[agent] = dict(counts)
+                result[agent]["parse_failure_rate"] = round(counts["parse_failures"] / calls, 4)
+                result[agent]["failure_rate"] = round(counts["failures"] / calls, 4)
+            return result
+
+
+parse_stats = ParseStats()
+
+
+def _parse_stats_metrics():
+    lines = [
+        "# HELP courseforge_structured_output_total Structured output outcomes by agent.",
+        "# TYPE courseforge_structured_output_total counter",
+    ]
+    with parse_stats.lock:
+        for agent, counts in sorted(parse_stats.counts.items()):
+            for outcome, value in sorted(counts.items()):
+                lines.append(f'courseforge_structured_output_total{{agent="{agent}",outcome="{outcome}"}} {value}')
+    return lines
+
+
+registry.collectors.append(_parse_stats_metrics)
+
+
+def _parse(raw: str, adapter: TypeAdapter, agent: str) -> Any:
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        data = loads_tolerant(raw)
+        parse_stats.record(agent, "repaired_locally")
+    return adapter.validate_python(data)
+
+
+def invoke_structured(
+    prompt: str,
+    schema: Any,
+    system_instruction: Optional[str] = None,
+    agent: str = "default",
+    model_name: Optional[str] = None,
+    use_response_schema: bool = True,
+) -> Any:
+    """
+    Calls the model in JSON mode and returns the reply validated against
+    `schema` (a Pydantic model or a type such as List[Model]).
+    Raises StructuredOutputError if the reply is still unusable after one
+    targeted fix-up retry.
+    """
+    adapter = TypeAdapter(schema)
+    generation_config = {"response_mime_type": "application/json"}
+    if use_response_schema:
+        generation_config["response_schema"] = to_gemini_schema(schema)
+
+    parse_stats.record(agent, "call")
+    raw = invoke_with_retry(
+        prompt=prompt,
+        system_instruction=system_instruction,
+        model_name=model_name,
+        generation_config=generation_config,
+        agent=agent
+    )
+
+    try:
+        return _parse(raw, adapter, agent)
+    except (JSONParseError, ValidationError) as e:
+        error = e
+        parse_stats.record(agent, "parse_failures")
+
+    # Retry just this call, telling the model exactly what was wrong
+    parse_stats.record(agent, "fixup_retries")
+    fixup = FIXUP_PROMPT.format(error=str(error)[:1000], reply=raw[:4000])
+    raw = invoke_with_retry(
+        prompt=f"{prompt}\n\n{fixup}",
+        system_instruction=system_instruction,
+        model_name=model_name,
+        generation_config=generation_config,
+        agent=agent
+    )
+
+    try:
+        return _parse(raw, adapter, agent)
+    except (JSONParseError, ValidationError) as e:
+        parse_stats.record(agent, "failures")
+        stats = parse_stats.snapshot()[agent]
+        logger.error(
+            f"Structured output failed for agent '{agent}' after fix-up retry: {e} "
+            f"(failure rate {stats['failures']}/{stats['calls']}, parse failure rate {stats['parse_failure_rate']:.1%})"
+        )
+        raise StructuredOutputError(f"{agent} agent returned invalid output: {e}")
+
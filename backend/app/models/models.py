@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Text, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Enum, Date, DateTime, ForeignKey, Index, Text, JSON, Float, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -29,12 +29,18 @@ class Course(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
-    description = Column(Text, nullable=True)
+    description = deferred(Column(Text, nullable=True))  # Loaded on access; listings use a projection
     source_type = Column(String, default="text")  # text, pdf, image
     status = Column(String, default="ready")      # planning, generating, ready
     difficulty = Column(Enum(DifficultyLevel), default=DifficultyLevel.STARTER)
     owner_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Kept up to date when the syllabus is saved so listings need no joins
+    module_count = Column(Integer, default=0)
+    topic_count = Column(Integer, default=0)
+
+    # Keyset pagination of a user's courses walks this index
+    __table_args__ = (Index("ix_courses_owner_created", "owner_id", "created_at", "id"),)
 
     owner = relationship("User", back_populates="courses")
     modules = relationship("Module", back_populates="course", cascade="all, delete-orphan")
@@ -61,17 +67,46 @@ class Topic(Base):
     order = Column(Integer, default=0)
     title = Column(String)
     
-    # Three levels of explanation
-    beginner_content = Column(Text)
-    intermediate_content = Column(Text)
-    expert_content = Column(Text)
+    # Three levels of explanation. The large columns form a deferred "content"
+    # group: plain Topic queries skip them, and touching one loads the group.
+    beginner_content = deferred(Column(Text), group="content")
+    intermediate_content = deferred(Column(Text), group="content")
+    expert_content = deferred(Column(Text), group="content")
     
-    examples = Column(JSON)  # List of strings
-    analogies = Column(JSON) # List of strings
+    examples = deferred(Column(JSON), group="content")  # List of strings
+    analogies = deferred(Column(JSON), group="content") # List of strings
     summary = Column(Text)
+    source_ref = Column(String, nullable=True) # Link back to the source, e.g. a video time offset
+    version = Column(Integer, default=1, nullable=False) # Bumped on every content or status change; feeds the ETag
+    indexed_version = Column(Integer, nullable=True) # version last written to the retrieval index; NULL if never indexed
 
     module = relationship("Module", back_populates="topics")
     quizzes = relationship("Quiz", back_populates="topic", cascade="all, delete-orphan")
+    sections = relationship("TopicSection", back_populates="topic", cascade="all, delete-orphan")
+    flashcards = relationship("Flashcard", back_populates="topic")
+
+class TopicSection(Base):
+    """Generation state of one independently generated part of a topic."""
+    __tablename__ = "topic_sections"
+    __table_args__ = (UniqueConstraint("topic_id", "section"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    topic_id = Column(Integer, ForeignKey("topics.id", ondelete="CASCADE"), index=True)
+    section = Column(String)  # beginner, intermediate, expert, extras, quizzes, flashcards
+    status = Column(String)   # missing, generating, ready, failed
+    error = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    topic = relationship("Topic", back_populates="sections")
+
+class ContentChunk(Base):
+    __tablename__ = "content_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), index=True)
+    topic_id = Column(Integer, ForeignKey("topics.id", ondelete="CASCADE"), index=True)
+    text = Column(Text)
+    embedding = Column(LargeBinary)  # float32 vector from the hashing vectorizer
 
 class Quiz(Base):
     __tablename__ = "quizzes"
@@ -91,10 +126,78 @@ class Flashcard(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     course_id = Column(Integer, ForeignKey("courses.id"))
+    topic_id = Column(Integer, ForeignKey("topics.id", ondelete="SET NULL"), nullable=True, index=True)
     front = Column(Text)
     back = Column(Text)
 
     course = relationship("Course", back_populates="flashcards")
+    topic = relationship("Topic", back_populates="flashcards")
+
+class MentorConversation(Base):
+    __tablename__ = "mentor_conversations"
+    __table_args__ = (UniqueConstraint("user_id", "course_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), index=True)
+    summary = Column(Text, default="")                    # Rolling summary of older turns
+    summarized_message_id = Column(Integer, default=0)    # Last message folded into the summary
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    messages = relationship("MentorMessage", back_populates="conversation", cascade="all, delete-orphan", lazy="dynamic")
+
+class MentorMessage(Base):
+    __tablename__ = "mentor_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("mentor_conversations.id", ondelete="CASCADE"), index=True)
+    role = Column(String)  # user, assistant
+    content = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    conversation = relationship("MentorConversation", back_populates="messages")
+
+class Certificate(Base):
+    """One issued certificate per (user, course); the PDF lives in the certificate store."""
+    __tablename__ = "certificates"
+    __table_args__ = (UniqueConstraint("user_id", "course_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"))
+    certificate_id = Column(String, unique=True)
+    # Snapshot of what was printed, so the PDF can be re-rendered identically
+    user_name = Column(String)
+    course_title = Column(String)
+    completion_date = Column(String)
+    content_hash = Column(String)  # sha256 of the PDF bytes, its key in the store
+    issued_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class KnowledgeNode(Base):
+    """A course in its owner's knowledge map, with the fingerprint it was last mapped at."""
+    __tablename__ = "knowledge_nodes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), unique=True)
+    title = Column(String)
+    category = Column(String, default="General")
+    content_hash = Column(String)       # sha256 of the course text the node was built from
+    embedding = Column(LargeBinary)     # float32 vector, see app.core.embeddings
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class KnowledgeEdge(Base):
+    """An LLM-labelled link between two courses; source_course_id < target_course_id."""
+    __tablename__ = "knowledge_edges"
+    __table_args__ = (UniqueConstraint("source_course_id", "target_course_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    source_course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"))
+    target_course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"))
+    label = Column(String)
+    similarity = Column(Float)
 
 class CourseProgress(Base):
     __tablename__ = "course_progress"
@@ -109,3 +212,44 @@ class CourseProgress(Base):
 
     user = relationship("User", back_populates="progress")
     course = relationship("Course", back_populates="progress_entries")
+
+class StudyPlan(Base):
+    """A user's day-by-day schedule for a course. Days before today keep what was planned for them."""
+    __tablename__ = "study_plans"
+    __table_args__ = (UniqueConstraint("user_id", "course_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"))
+    level = Column(String, default="beginner")   # content level reading time is estimated from
+    minutes_per_day = Column(Integer)
+    start_date = Column(Date)                    # day 1
+    inputs_hash = Column(String)                 # estimates, progress and settings the days were packed from
+    studied = Column(JSON, default=dict)         # {topic_id: ISO date it was completed, or null if before the plan}
+    days = Column(JSON, default=list)
+    milestones = Column(JSON, default=dict)      # LLM wording by default milestone text
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ReviewCard(Base):
+    """A user's spaced-repetition state (SM-2) for one flashcard or quiz question."""
+    __tablename__ = "review_cards"
+    __table_args__ = (
+        # The due queue, read in (due_at, id) order: next cards for a user,
+        # and for a user within a course
+        Index("ix_review_cards_user_due", "user_id", "due_at", "id"),
+        Index("ix_review_cards_user_course_due", "user_id", "course_id", "due_at", "id"),
+        UniqueConstraint("user_id", "flashcard_id"),
+        UniqueConstraint("user_id", "quiz_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    flashcard_id = Column(Integer, ForeignKey("flashcards.id", ondelete="CASCADE"), nullable=True)  # one of these two
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=True)
+    ease = Column(Float, default=2.5, nullable=False)
+    interval_days = Column(Integer, default=0, nullable=False)
+    repetitions = Column(Integer, default=0, nullable=False)  # successful reviews in a row
+    lapses = Column(Integer, default=0, nullable=False)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    last_reviewed_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,85 @@
+"""
+Schemas for structured LLM output.
+Agents request JSON matching these models and validate the reply against them.
+"""
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
+
+class SyllabusLesson(BaseModel):
+    title: str
+    summary: str = ""
+    source_ref: Optional[str] = None
+
+class SyllabusModule(BaseModel):
+    title: str
+    description: str = ""
+    lessons: List[SyllabusLesson]
+
+class Syllabus(BaseModel):
+    title: str
+    description: str
+    modules: List[SyllabusModule]
+
+class GeneratedQuiz(BaseModel):
+    question: str
+    options: List[str]
+    correct_answer: int
+    explanation: str = ""
+    difficulty: str = "medium"
+
+    @model_validator(mode="after")
+    def check_answer_index(self):
+        if not 0 <= self.correct_answer < len(self.options):
+            raise ValueError(f"correct_answer {self.correct_answer} is not a valid index into {len(self.options)} options")
+        return self
+
+class GeneratedFlashcard(BaseModel):
+    front: str
+    back: str
+
+class TopicExtras(BaseModel):
+    examples: List[str]
+    analogies: List[str]
+    summary: str
+
+class QuizSet(BaseModel):
+    quizzes: List[GeneratedQuiz]
+
+class FlashcardSet(BaseModel):
+    flashcards: List[GeneratedFlashcard]
+
+class LabExercise(BaseModel):
+    exercise: str
+    requirements: List[str]
+    hints: List[str]
+
+class LabEvaluation(BaseModel):
+    passed: bool
+    feedback: str
+    score: int
+    xp_awarded: int
+
+class GraphNode(BaseModel):
+    id: int
+    title: str
+    category: str = "General"
+
+class GraphLink(BaseModel):
+    source: int
+    target: int
+    label: str
+
+class KnowledgeGraph(BaseModel):
+    nodes: List[GraphNode]
+    links: List[GraphLink]
+
+class CourseCategory(BaseModel):
+    id: int
+    category: str
+
+class LinkLabels(BaseModel):
+    links: List[GraphLink]
+    categories: List[CourseCategory] = []
+
+class MilestonePhrasing(BaseModel):
+    milestones: List[str]
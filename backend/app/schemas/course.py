@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
-from datetime import datetime
+from datetime import date, datetime
 
 class QuizSchema(BaseModel):
     question: str
@@ -12,17 +12,36 @@ class QuizSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class FlashcardSchema(BaseModel):
+    front: str
+    back: str
+
+    class Config:
+        from_attributes = True
+
+class TopicSectionSchema(BaseModel):
+    section: str
+    status: str
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 class TopicSchema(BaseModel):
     id: int
     order: int
     title: str
-    beginner_content: str
-    intermediate_content: str
-    expert_content: str
+    # Optional so a single level can be served on its own
+    beginner_content: Optional[str] = None
+    intermediate_content: Optional[str] = None
+    expert_content: Optional[str] = None
     examples: List[str]
     analogies: List[str]
     summary: str
+    source_ref: Optional[str] = None
     quizzes: List[QuizSchema] = []
+    flashcards: List[FlashcardSchema] = []
+    sections: List[TopicSectionSchema] = []
 
     class Config:
         from_attributes = True
@@ -41,6 +60,11 @@ class CourseGenerateRequest(BaseModel):
     topic: str
     difficulty: Optional[str] = "starter"  # starter, intermediate, advanced
 
+class PlaylistGenerateRequest(BaseModel):
+    urls: List[str]  # YouTube video URLs or ids
+    title: Optional[str] = None
+    difficulty: Optional[str] = "Beginner"
+
 class CourseBase(BaseModel):
     title: str
     description: str
@@ -72,3 +96,61 @@ class ProgressResponse(ProgressUpdate):
 
     class Config:
         from_attributes = True
+
+class TopicProgressUpdate(BaseModel):
+    topic_id: int
+    completed: bool = True
+
+class QuizScoreUpdate(BaseModel):
+    topic_id: int
+    score: int
+
+class TutorMessage(BaseModel):
+    message: str
+    topic_id: Optional[int] = None
+
+class ScheduleItem(BaseModel):
+    topic_id: int
+    title: str
+    kind: str  # study or review
+    minutes: int
+
+class ScheduleDay(BaseModel):
+    day: int
+    date: date
+    task: str
+    milestone: str
+    minutes: int
+    items: List[ScheduleItem]
+
+class ReviewCardSchema(BaseModel):
+    card_id: int
+    course_id: int
+    kind: str  # flashcard or quiz
+    due_at: datetime
+    new: bool
+    front: Optional[str] = None
+    back: Optional[str] = None
+    question: Optional[str] = None
+    options: Optional[List[str]] = None
+    correct_answer: Optional[int] = None
+    explanation: Optional[str] = None
+
+class ReviewGrade(BaseModel):
+    card_id: int
+    grade: int = Field(ge=0, le=5)  # SM-2 quality: 0 blackout .. 5 perfect
+    reviewed_at: Optional[datetime] = None  # when the card was answered, for offline sessions
+
+class ReviewBatch(BaseModel):
+    reviews: List[ReviewGrade]
+
+class ReviewState(BaseModel):
+    card_id: int
+    due_at: datetime
+    interval_days: int
+    ease: float
+    repetitions: int
+
+class ReviewBatchResult(BaseModel):
+    updated: List[ReviewState]
+    unknown: List[int]
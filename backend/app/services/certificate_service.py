@@ -1,16 +1,34 @@
+import hashlib
+import io
 import os
-from reportlab.lib.pagesizes import landscape, A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import HexColor
-from reportlab.lib.units import inch
-import qrcode
-from PIL import Image
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
 
-def generate_certificate_pdf(user_name: str, course_title: str, completion_date: str, certificate_id: str, output_path: str):
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Certificate, Course, User
+
+
+def render_certificate_pdf(user_name: str, course_title: str, completion_date: str, certificate_id: str) -> bytes:
     """
-    Generates a high-quality PDF certificate for CourseForge.
+    Renders a high-quality PDF certificate for CourseForge and returns its bytes.
+    Output is deterministic for the same inputs, so it can be stored by hash.
     """
-    c = canvas.Canvas(output_path, pagesize=landscape(A4))
+    # Imported on first render; most API workers never draw a certificate
+    from reportlab.lib.pagesizes import landscape, A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import ImageReader
+    import qrcode
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=landscape(A4), invariant=1)
     width, height = landscape(A4)
 
     # 1. Background Gradient (Dark Theme)
@@ -26,7 +44,7 @@ def generate_certificate_pdf(user_name: str, course_title: str, completion_date:
     c.setFont("Helvetica-Bold", 40)
     c.setFillColor(HexColor("#FFFFFF"))
     c.drawCentredString(width/2, height - 1.5*inch, "COURSEFORGE MASTER")
-    
+
     c.setFont("Helvetica", 14)
     c.setFillColor(HexColor("#7c3aed"))
     c.drawCentredString(width/2, height - 2*inch, "PROOF OF NEURAL INDEXING")
@@ -35,7 +53,7 @@ def generate_certificate_pdf(user_name: str, course_title: str, completion_date:
     c.setFont("Helvetica", 20)
     c.setFillColor(HexColor("#AAAAAA"))
     c.drawCentredString(width/2, height/2 + 0.5*inch, "This certifies that")
-    
+
     c.setFont("Helvetica-Bold", 36)
     c.setFillColor(HexColor("#FFFFFF"))
     c.drawCentredString(width/2, height/2 - 0.2*inch, user_name.upper())
@@ -44,7 +62,7 @@ def generate_certificate_pdf(user_name: str, course_title: str, completion_date:
     c.setFont("Helvetica", 18)
     c.setFillColor(HexColor("#AAAAAA"))
     c.drawCentredString(width/2, height/2 - 0.8*inch, f"has successfully forged mastery in")
-    
+
     c.setFont("Helvetica-Bold", 24)
     c.setFillColor(HexColor("#7c3aed"))
     c.drawCentredString(width/2, height/2 - 1.3*inch, course_title)
@@ -55,22 +73,134 @@ def generate_certificate_pdf(user_name: str, course_title: str, completion_date:
     c.drawString(0.8*inch, 0.8*inch, f"DATE: {completion_date}")
     c.drawRightString(width - 0.8*inch, 0.8*inch, f"CERTIFICATE ID: {certificate_id}")
 
-    # 7. QR Code for Verification
+    # 7. QR Code for Verification, drawn from memory
     qr_data = f"https://courseforge.ai/verify/{certificate_id}"
     qr = qrcode.QRCode(box_size=4)
     qr.add_data(qr_data)
     qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="white", back_color="black")
-    
-    # Save temporary QR
-    qr_path = "tmp_qr.png"
-    qr_img.save(qr_path)
-    c.drawImage(qr_path, width - 1.5*inch, 1*inch, width=0.8*inch, height=0.8*inch)
-    
+    qr_png = io.BytesIO()
+    qr.make_image(fill_color="white", back_color="black").save(qr_png)
+    qr_png.seek(0)
+    c.drawImage(ImageReader(qr_png), width - 1.5*inch, 1*inch, width=0.8*inch, height=0.8*inch)
+
     c.save()
-    
-    # Clean up
-    if os.path.exists(qr_path):
-        os.remove(qr_path)
+    return buffer.getvalue()
+
 
+def generate_certificate_pdf(user_name: str, course_title: str, completion_date: str, certificate_id: str, output_path: str):
+    """
+    Generates a high-quality PDF certificate for CourseForge.
+    """
+    with open(output_path, "wb") as f:
+        f.write(render_certificate_pdf(user_name, course_title, completion_date, certificate_id))
     return output_path
+
+
+class CertificateStore:
+    """
+    Content-addressed PDF store: files live at <root>/<hash[:2]>/<hash>.pdf.
+    Writes go through a temp file and os.replace, so readers never see a
+    partial PDF and concurrent writers of the same content are harmless.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, content_hash: str) -> str:
+        return os.path.join(self.root, content_hash[:2], f"{content_hash}.pdf")
+
+    def exists(self, content_hash: str) -> bool:
+        return os.path.exists(self.path(content_hash))
+
+    def put(self, data: bytes) -> str:
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self.path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return content_hash
+
+
+certificate_store = CertificateStore(settings.CERTIFICATE_STORE_DIR)
+
+# Striped locks so two downloads of the same certificate in this process
+# render it once. A fixed set keeps memory flat however many (user, course)
+# pairs are seen; different certificates rarely share a stripe.
+LOCK_STRIPES = 64
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+def _lock_for(key: Tuple[int, int]) -> threading.Lock:
+    return _locks[hash(key) % LOCK_STRIPES]
+
+
+def _render_args(cert: Certificate) -> tuple:
+    return (cert.user_name, cert.course_title, cert.completion_date, cert.certificate_id)
+
+
+def _issue_record(db: Session, user: User, course: Course, completion_date: Optional[str] = None) -> Certificate:
+    """Returns the certificate row for (user, course), creating it on first issue."""
+    cert = db.query(Certificate).filter(Certificate.user_id == user.id, Certificate.course_id == course.id).first()
+    if cert:
+        return cert
+
+    cert = Certificate(
+        user_id=user.id,
+        course_id=course.id,
+        certificate_id=f"CF-{course.id}-{user.id}",
+        user_name=user.name,
+        course_title=course.title,
+        completion_date=completion_date or date.today().isoformat(),
+    )
+    db.add(cert)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Issued concurrently by another worker
+        db.rollback()
+        cert = db.query(Certificate).filter(Certificate.user_id == user.id, Certificate.course_id == course.id).one()
+    return cert
+
+
+def get_certificate_path(db: Session, user: User, course: Course) -> str:
+    """
+    Path of the user's certificate PDF for the course, rendering it only the
+    first time (or if the stored file has gone missing).
+    """
+    cert = _issue_record(db, user, course)
+    if cert.content_hash and certificate_store.exists(cert.content_hash):
+        return certificate_store.path(cert.content_hash)
+
+    with _lock_for((user.id, course.id)):
+        db.refresh(cert)
+        if not (cert.content_hash and certificate_store.exists(cert.content_hash)):
+            cert.content_hash = certificate_store.put(render_certificate_pdf(*_render_args(cert)))
+            db.commit()
+    return certificate_store.path(cert.content_hash)
+
+
+def issue_certificates_batch(db: Session, course_id: int, user_ids: Iterable[int], max_workers: Optional[int] = None) -> List[Certificate]:
+    """
+    Issues certificates for a whole cohort. Rendering is CPU-bound, so the
+    PDFs are produced in a process pool; already stored ones are skipped.
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise ValueError(f"Course {course_id} not found")
+
+    users = db.query(User).filter(User.id.in_(list(user_ids))).all()
+    certs = [_issue_record(db, user, course) for user in users]
+    todo = [cert for cert in certs if not (cert.content_hash and certificate_store.exists(cert.content_hash))]
+    if not todo:
+        return certs
+
+    workers = max_workers or settings.CERTIFICATE_RENDER_WORKERS
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rendered = pool.map(render_certificate_pdf, *zip(*[_render_args(cert) for cert in todo]), chunksize=4)
+        for cert, pdf in zip(todo, rendered):
+            cert.content_hash = certificate_store.put(pdf)
+    db.commit()
+    return certs
@@ -0,0 +1,128 @@
+"""
+Server-side storage for mentor conversations.
+Messages are append-only rows; older turns are periodically folded into a
+rolling summary so each prompt carries only the summary plus the turns not
+folded in yet (between MENTOR_HISTORY_TURNS and that plus a summary batch).
+"""
+import logging
+from typing import List, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.agents.tutor_agent import get_mentor_response, summarize_conversation
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import Course, MentorConversation, MentorMessage
+from app.services.vector_index import retrieve
+
+logger = logging.getLogger(__name__)
+
+
+def get_or_create_conversation(db: Session, user_id: int, course_id: int) -> MentorConversation:
+    """The user's conversation for the course, created (and committed) on the first turn."""
+    query = db.query(MentorConversation).filter(
+        MentorConversation.user_id == user_id,
+        MentorConversation.course_id == course_id
+    )
+    conversation = query.first()
+    if not conversation:
+        conversation = MentorConversation(user_id=user_id, course_id=course_id, summary="", summarized_message_id=0)
+        db.add(conversation)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Two first turns raced; use the conversation the other one created
+            db.rollback()
+            conversation = query.one()
+    return conversation
+
+
+def append_message(db: Session, conversation: MentorConversation, role: str, content: str) -> MentorMessage:
+    """Inserts one message row; existing rows are never rewritten."""
+    message = MentorMessage(conversation_id=conversation.id, role=role, content=content)
+    db.add(message)
+    return message
+
+
+def _unsummarized(db: Session, conversation: MentorConversation):
+    return db.query(MentorMessage).filter(
+        MentorMessage.conversation_id == conversation.id,
+        MentorMessage.id > (conversation.summarized_message_id or 0)
+    )
+
+
+def get_prompt_history(db: Session, conversation: MentorConversation) -> Tuple[str, List[dict]]:
+    """
+    Returns the rolling summary and every message not folded into it yet,
+    oldest first, so nothing falls between the two. Compaction keeps these
+    under a batch beyond MENTOR_HISTORY_TURNS; the limit only bites if it
+    keeps failing.
+    """
+    recent = _unsummarized(db, conversation).order_by(MentorMessage.id.desc()).limit(
+        (settings.MENTOR_HISTORY_TURNS + settings.MENTOR_SUMMARY_BATCH_TURNS) * 4
+    ).all()
+    return conversation.summary or "", [{"role": m.role, "content": m.content} for m in reversed(recent)]
+
+
+def answer_query(db: Session, course: Course, user_id: int, topic_title: str, query: str) -> Tuple[str, MentorConversation]:
+    """
+    Answers one mentor turn grounded in the course and stores both messages.
+    The session is rolled back and the error re-raised if the model fails.
+    """
+    conversation = get_or_create_conversation(db, user_id, course.id)
+    summary, recent_turns = get_prompt_history(db, conversation)
+
+    try:
+        # Ground the answer in the passages closest to the question, searched
+        # across the whole course rather than only the open topic
+        context_chunks = retrieve(db, course.id, f"{topic_title} {query}")
+
+        response = get_mentor_response(
+            course_title=course.title,
+            topic_title=topic_title,
+            context_chunks=context_chunks,
+            user_query=query,
+            chat_history=recent_turns,
+            conversation_summary=summary
+        )
+    except Exception:
+        db.rollback()
+        raise
+
+    append_message(db, conversation, "user", query)
+    append_message(db, conversation, "assistant", response)
+    db.commit()
+    return response, conversation
+
+
+def compact_conversation(conversation_id: int):
+    """
+    Folds turns older than the last MENTOR_HISTORY_TURNS into the summary once
+    a full batch of them has built up. Runs as a background task after the
+    response is sent, so it never adds latency to a chat turn.
+    """
+    db = SessionLocal()
+    try:
+        conversation = db.query(MentorConversation).filter(MentorConversation.id == conversation_id).first()
+        if not conversation:
+            return
+
+        keep = settings.MENTOR_HISTORY_TURNS * 2
+        batch = settings.MENTOR_SUMMARY_BATCH_TURNS * 2
+        pending = _unsummarized(db, conversation).order_by(MentorMessage.id).all()
+        if len(pending) < keep + batch:
+            return
+
+        to_fold = pending[:len(pending) - keep]
+        conversation.summary = summarize_conversation(
+            conversation.summary or "",
+            [{"role": m.role, "content": m.content} for m in to_fold]
+        )
+        conversation.summarized_message_id = to_fold[-1].id
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception(f"Compaction of conversation {conversation_id} failed")
+    finally:
+        db.close()
@@ -0,0 +1,365 @@
+"""
+Streaming course exports.
+
+Every format is a generator of byte chunks fed by row iterators (normally
+queries run with yield_per), so memory stays flat however large the course
+is. Zip-based formats (Anki .apkg, EPUB) are written to a non-seekable sink
+that is drained after each entry.
+
+Lesson rows (one per topic) are expected in reading order and to expose:
+module_id, module_title, module_description, lesson_title, beginner_content,
+intermediate_content, expert_content, examples, summary. Modules without
+topics appear once with lesson_title set to None. Flashcard rows expose
+front and back.
+"""
+import csv
+import hashlib
+import html
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import textwrap
+import time
+import uuid
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _buffered(pieces: Iterable[str]) -> Iterator[bytes]:
+    """Groups small strings into CHUNK_SIZE-ish byte chunks."""
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def _modules(lesson_rows: Iterable) -> Iterator[Tuple[object, List]]:
+    """
+    Groups consecutive lesson rows by module without holding more than one
+    module's rows. Yields (first_row, lessons) where lessons skips the
+    placeholder row of an empty module.
+    """
+    current, lessons = None, []
+    for row in lesson_rows:
+        if current is not None and row.module_id != current.module_id:
+            yield current, lessons
+            lessons = []
+        if current is None or row.module_id != current.module_id:
+            current = row
+        if row.lesson_title is not None:
+            lessons.append(row)
+    if current is not None:
+        yield current, lessons
+
+
+def _main_content(lesson) -> str:
+    return lesson.intermediate_content or lesson.beginner_content or lesson.expert_content or ""
+
+
+# --- Plain text formats ---
+
+def summary_chunks(title: str, description: str, lesson_rows: Iterable) -> Iterator[bytes]:
+    def pieces():
+        yield f"# {title}\n\n"
+        if description:
+            yield f"{description}\n\n\n"
+        for module, lessons in _modules(lesson_rows):
+            yield f"## {module.module_title}\n\n"
+            if module.module_description:
+                yield f"{module.module_description}\n\n\n"
+            for lesson in lessons:
+                yield f"### {lesson.lesson_title}\n\n"
+                if lesson.summary:
+                    yield f"{lesson.summary}\n\n\n"
+    return _buffered(pieces())
+
+
+def notes_chunks(title: str, description: str, lesson_rows: Iterable) -> Iterator[bytes]:
+    def pieces():
+        yield f"# {title}\n\n\n"
+        if description:
+            yield f"{description}\n\n\n"
+        for module, lessons in _modules(lesson_rows):
+            yield f"## {module.module_title}\n\n\n"
+            if module.module_description:
+                yield f"{module.module_description}\n\n\n"
+            for lesson in lessons:
+                yield f"### {lesson.lesson_title}\n\n\n"
+                content = _main_content(lesson)
+                if content:
+                    yield f"{content}\n\n\n"
+                if lesson.examples:
+                    yield "#### Examples\n\n\n"
+                    for example in lesson.examples:
+                        yield f"- {example}\n\n"
+                    yield "\n\n"
+                if lesson.summary:
+                    yield f"**Summary:** {lesson.summary}\n\n\n"
+    return _buffered(pieces())
+
+
+def flashcards_csv_chunks(flashcard_rows: Iterable) -> Iterator[bytes]:
+    def pieces():
+        line = io.StringIO()
+        writer = csv.writer(line)
+        writer.writerow(["Front", "Back"])
+        for card in flashcard_rows:
+            writer.writerow([card.front, card.back])
+            yield line.getvalue()
+            line.seek(0)
+            line.truncate()
+        yield line.getvalue()
+    return _buffered(pieces())
+
+
+def flashcards_json_chunks(flashcard_rows: Iterable) -> Iterator[bytes]:
+    """Same layout as json.dumps(cards, indent=2), one card at a time."""
+    def pieces():
+        first = True
+        for card in flashcard_rows:
+            item = textwrap.indent(json.dumps({"front": card.front, "back": card.back}, indent=2), "  ")
+            yield ("[\n" if first else ",\n") + item
+            first = False
+        yield "[]" if first else "\n]"
+    return _buffered(pieces())
+
+
+# --- Zip-based formats ---
+
+class _ZipSink:
+    """Write-only, non-seekable target for ZipFile that hands back what was written."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, *args):
+        raise OSError("Streaming zip output is not seekable")
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _anki_checksum(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _write_anki_collection(path: str, deck_name: str, flashcard_rows: Iterable):
+    """Writes a minimal Anki 2.1 (schema 11) collection with one Basic note type and one deck."""
+    now = int(time.time())
+    deck_id = now * 1000
+    model_id = deck_id + 1
+
+    model = {
+        "id": model_id, "name": "CourseForge Basic", "type": 0, "mod": now, "usn": -1,
+        "sortf": 0, "did": deck_id, "tags": [], "vers": [], "req": [[0, "all", [0]]],
+        "flds": [
+            {"name": name, "ord": i, "sticky": False, "rtl": False, "font": "Arial", "size": 20, "media": []}
+            for i, name in enumerate(("Front", "Back"))
+        ],
+        "tmpls": [{
+            "name": "Card 1", "ord": 0, "did": None, "bqfmt": "", "bafmt": "",
+            "qfmt": "{{Front}}", "afmt": "{{FrontSide}}<hr id=answer>{{Back}}",
+        }],
+        "css": ".card { font-family: arial; font-size: 20px; text-align: center; color: black; background-color: white; }",
+        "latexPre": "\\documentclass[12pt]{article}\n\\special{papersize=3in,5in}\n\\usepackage{amssymb,amsmath}\n"
+                    "\\pagestyle{empty}\n\\setlength{\\parindent}{0in}\n\\begin{document}\n",
+        "latexPost": "\\end{document}",
+    }
+
+    def deck(did: int, name: str) -> dict:
+        return {
+            "id": did, "name": name, "mod": now, "usn": -1, "desc": "", "dyn": 0, "conf": 1,
+            "collapsed": False, "extendNew": 10, "extendRev": 50,
+            "lrnToday": [0, 0], "revToday": [0, 0], "newToday": [0, 0], "timeToday": [0, 0],
+        }
+
+    deck_config = {"1": {
+        "id": 1, "name": "Default", "mod": 0, "usn": 0, "maxTaken": 60, "autoplay": True, "timer": 0,
+        "replayq": True, "dyn": False,
+        "new": {"bury": True, "delays": [1, 10], "initialFactor": 2500, "ints": [1, 4, 7], "order": 1, "perDay": 20, "separate": True},
+        "lapse": {"delays": [10], "leechAction": 0, "leechFails": 8, "minInt": 1, "mult": 0},
+        "rev": {"bury": True, "ease4": 1.3, "fuzz": 0.05, "ivlFct": 1, "maxIvl": 36500, "minSpace": 1, "perDay": 100},
+    }}
+    collection_config = {
+        "activeDecks": [1], "curDeck": 1, "newSpread": 0, "collapseTime": 1200, "timeLim": 0,
+        "estTimes": True, "dueCounts": True, "curModel": None, "nextPos": 1, "sortType": "noteFld",
+        "sortBackwards": False, "addToCur": True,
+    }
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript("""
+            CREATE TABLE col (id integer primary key, crt integer not null, mod integer not null,
+                scm integer not null, ver integer not null, dty integer not null, usn integer not null,
+                ls integer not null, conf text not null, models text not null, decks text not null,
+                dconf text not null, tags text not null);
+            CREATE TABLE notes (id integer primary key, guid text not null, mid integer not null,
+                mod integer not null, usn integer not null, tags text not null, flds text not null,
+                sfld integer not null, csum integer not null, flags integer not null, data text not null);
+            CREATE TABLE cards (id integer primary key, nid integer not null, did integer not null,
+                ord integer not null, mod integer not null, usn integer not null, type integer not null,
+                queue integer not null, due integer not null, ivl integer not null, factor integer not null,
+                reps integer not null, lapses integer not null, left integer not null, odue integer not null,
+                odid integer not null, flags integer not null, data text not null);
+            CREATE TABLE revlog (id integer primary key, cid integer not null, usn integer not null,
+                ease integer not null, ivl integer not null, lastIvl integer not null, factor integer not null,
+                time integer not null, type integer not null);
+            CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+            CREATE INDEX ix_notes_usn on notes (usn);
+            CREATE INDEX ix_cards_usn on cards (usn);
+            CREATE INDEX ix_cards_nid on cards (nid);
+            CREATE INDEX ix_cards_sched on cards (did, queue, due);
+        """)
+        conn.execute(
+            "INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, '{}')",
+            (now, now * 1000, now * 1000, json.dumps(collection_config), json.dumps({str(model_id): model}),
+             json.dumps({"1": deck(1, "Default"), str(deck_id): deck(deck_id, deck_name)}), json.dumps(deck_config))
+        )
+
+        for position, card in enumerate(flashcard_rows, start=1):
+            note_id = deck_id + position * 2
+            conn.execute(
+                "INSERT INTO notes VALUES (?, ?, ?, ?, -1, '', ?, ?, ?, 0, '')",
+                (note_id, uuid.uuid4().hex[:10], model_id, now, f"{card.front}\x1f{card.back}",
+                 card.front, _anki_checksum(card.front))
+            )
+            conn.execute(
+                "INSERT INTO cards VALUES (?, ?, ?, 0, ?, -1, 0, 0, ?, 0, 0, 0, 0, 0, 0, 0, 0, '')",
+                (note_id + 1, note_id, deck_id, now, position)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def apkg_chunks(title: str, flashcard_rows: Iterable) -> Iterator[bytes]:
+    """
+    Anki package. The collection is an SQLite file, so it is built in a
+    temporary file on disk and then streamed into the zip.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "collection.anki2")
+        _write_anki_collection(path, title, flashcard_rows)
+
+        sink = _ZipSink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+            with archive.open("collection.anki2", "w") as entry, open(path, "rb") as source:
+                for block in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    entry.write(block)
+                    yield sink.drain()
+            archive.writestr("media", "{}")
+        yield sink.drain()
+
+
+def _xhtml_paragraphs(text: str) -> str:
+    return "".join(f"<p>{html.escape(p.strip())}</p>\n" for p in text.split("\n\n") if p.strip())
+
+
+def epub_chunks(title: str, description: str, modules: List, lesson_rows: Iterable) -> Iterator[bytes]:
+    """
+    EPUB 3 book with one chapter per module. `modules` (id, title) is needed
+    up front for the manifest; lesson text is streamed chapter by chapter.
+    """
+    book_id = f"urn:uuid:{uuid.uuid4()}"
+    chapters = [(f"chapter_{i + 1}.xhtml", module) for i, module in enumerate(modules)]
+    escaped_title = html.escape(title)
+
+    container = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+        '  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>\n'
+        '</container>\n'
+    )
+    manifest = "".join(
+        f'    <item id="ch{i}" href="{name}" media-type="application/xhtml+xml"/>\n' for i, (name, _) in enumerate(chapters)
+    )
+    spine = "".join(f'    <itemref idref="ch{i}"/>\n' for i in range(len(chapters)))
+    package = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">\n'
+        '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+        f'    <dc:identifier id="book-id">{book_id}</dc:identifier>\n'
+        f'    <dc:title>{escaped_title}</dc:title>\n'
+        '    <dc:language>en</dc:language>\n'
+        f'    <meta property="dcterms:modified">{time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}</meta>\n'
+        '  </metadata>\n'
+        '  <manifest>\n'
+        '    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+        f'{manifest}'
+        '  </manifest>\n'
+        '  <spine>\n'
+        f'{spine}'
+        '  </spine>\n'
+        '</package>\n'
+    )
+    toc = "".join(f'      <li><a href="{name}">{html.escape(module.title)}</a></li>\n' for name, module in chapters)
+    nav = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">\n'
+        f'<head><title>{escaped_title}</title></head>\n'
+        '<body>\n'
+        f'  <h1>{escaped_title}</h1>\n'
+        f'  {_xhtml_paragraphs(description or "")}'
+        '  <nav epub:type="toc"><ol>\n'
+        f'{toc}'
+        '  </ol></nav>\n'
+        '</body>\n'
+        '</html>\n'
+    )
+
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        # The mimetype entry must come first and be stored uncompressed
+        archive.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        archive.writestr("META-INF/container.xml", container)
+        archive.writestr("OEBPS/content.opf", package)
+        archive.writestr("OEBPS/nav.xhtml", nav)
+        yield sink.drain()
+
+        names = {module.id: name for name, module in chapters}
+        for module, lessons in _modules(lesson_rows):
+            with archive.open(f"OEBPS/{names[module.module_id]}", "w") as entry:
+                entry.write((
+                    '<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<html xmlns="http://www.w3.org/1999/xhtml">\n'
+                    f'<head><title>{html.escape(module.module_title)}</title></head>\n<body>\n'
+                    f'<h1>{html.escape(module.module_title)}</h1>\n'
+                    f'{_xhtml_paragraphs(module.module_description or "")}'
+                ).encode("utf-8"))
+                for lesson in lessons:
+                    section = f"<h2>{html.escape(lesson.lesson_title)}</h2>\n{_xhtml_paragraphs(_main_content(lesson))}"
+                    if lesson.examples:
+                        section += "<h3>Examples</h3>\n<ul>\n" + "".join(
+                            f"<li>{html.escape(str(example))}</li>\n" for example in lesson.examples
+                        ) + "</ul>\n"
+                    if lesson.summary:
+                        section += f"<p><strong>Summary:</strong> {html.escape(lesson.summary)}</p>\n"
+                    entry.write(section.encode("utf-8"))
+                    yield sink.drain()
+                entry.write(b"</body>\n</html>\n")
+            yield sink.drain()
+    yield sink.drain()
@@ -1,14 +1,62 @@
-import fitz  # PyMuPDF
-from youtube_transcript_api import YouTubeTranscriptApi
-from bs4 import BeautifulSoup
+# fitz (PyMuPDF), bs4 and youtube_transcript_api are imported where they are
+# used, so API workers that never ingest a source do not load them
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 import requests
 import re
 import io
 
+from app.core.cache import transcript_cache
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+
+VIDEO_ID_PATTERN = re.compile(r"^[0-9A-Za-z_-]{11}$")
+# Starts each video's block in build_multi_source_context
+SOURCE_HEADER = "### Source "
+
+
+def format_timestamp(seconds: float) -> str:
+    """Formats an offset in seconds as mm:ss (or h:mm:ss for long videos)."""
+    seconds = int(seconds)
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def video_link(video_id: str, start: float = 0) -> str:
+    """Returns a YouTube link that opens the video at the given offset."""
+    return f"https://youtu.be/{video_id}?t={int(start)}"
+
+
+def fetch_youtube_transcript(video_id: str) -> List[dict]:
+    """Default transcript provider, compatible with old and new youtube-transcript-api releases."""
+    from youtube_transcript_api import YouTubeTranscriptApi
+    if hasattr(YouTubeTranscriptApi, "get_transcript"):
+        return YouTubeTranscriptApi.get_transcript(video_id)
+    return YouTubeTranscriptApi().fetch(video_id).to_raw_data()
+
+
 class IngestionService:
+    def __init__(
+        self,
+        transcript_provider: Optional[Callable[[str], List[dict]]] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+    ):
+        # The provider is injectable so batch ingestion can run against a stub
+        self.transcript_provider = transcript_provider or fetch_youtube_transcript
+        self.max_concurrency = max_concurrency or settings.YOUTUBE_MAX_CONCURRENCY
+        self.rate_limiter = RateLimiter(
+            requests_per_second or settings.YOUTUBE_REQUESTS_PER_SECOND,
+            burst=self.max_concurrency
+        )
+
     @staticmethod
     def extract_text_from_pdf(file_content: bytes) -> str:
         """Extracts text from a PDF byte stream."""
+        import fitz  # PyMuPDF
         pdf_file = fitz.open(stream=file_content, filetype="pdf")
         text = ""
         for page in pdf_file:
@@ -16,27 +64,104 @@ class IngestionService:
         return text
 
     @staticmethod
-    def extract_youtube_transcript(url: str) -> str:
-        """Extracts transcript from a YouTube video URL."""
-        video_id = None
-        # Extract video ID using regex
-        regex = r"(?:v=|\/)([0-9A-Za-z_-]{11}).*"
-        match = re.search(regex, url)
-        if match:
-            video_id = match.group(1)
-        
-        if not video_id:
+    def parse_youtube_video_id(url: str) -> str:
+        """Extracts the 11 character video id from a YouTube URL (or returns a bare id)."""
+        url = url.strip()
+        if VIDEO_ID_PATTERN.match(url):
+            return url
+
+        match = re.search(r"(?:v=|\/)([0-9A-Za-z_-]{11}).*", url)
+        if not match:
             raise ValueError("Invalid YouTube URL")
+        return match.group(1)
 
+    def fetch_transcript_segments(self, video_id: str) -> List[Dict]:
+        """
+        Returns the timestamped transcript of a video as a list of
+        {"start", "duration", "text"} segments. Cached by video id.
+        """
+        cached = transcript_cache.get(video_id)
+        if cached is not None:
+            return cached
+
+        self.rate_limiter.acquire()
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            return " ".join([t['text'] for t in transcript_list])
+            raw_segments = self.transcript_provider(video_id)
         except Exception as e:
             raise Exception(f"Failed to fetch YouTube transcript: {str(e)}")
 
+        segments = [
+            {
+                "start": float(s.get("start", 0.0)),
+                "duration": float(s.get("duration", 0.0)),
+                "text": s.get("text", "").strip()
+            }
+            for s in raw_segments if s.get("text", "").strip()
+        ]
+        transcript_cache.set(video_id, segments)
+        return segments
+
+    @staticmethod
+    def group_transcript_segments(segments: List[Dict], window_seconds: int = 30) -> List[Dict]:
+        """Merges consecutive segments into blocks of roughly `window_seconds` each."""
+        blocks = []
+        for segment in segments:
+            if blocks and segment["start"] - blocks[-1]["start"] < window_seconds:
+                blocks[-1]["text"] += " " + segment["text"]
+            else:
+                blocks.append({"start": segment["start"], "text": segment["text"]})
+        return blocks
+
+    def extract_youtube_transcript(self, url: str, with_timestamps: bool = False) -> str:
+        """Extracts transcript from a YouTube video URL."""
+        video_id = self.parse_youtube_video_id(url)
+        segments = self.fetch_transcript_segments(video_id)
+
+        if not with_timestamps:
+            return " ".join([s["text"] for s in segments])
+
+        return "\n".join(
+            f"[{format_timestamp(b['start'])}] {b['text']}"
+            for b in self.group_transcript_segments(segments)
+        )
+
+    def ingest_youtube_batch(self, urls: List[str]) -> List[Dict]:
+        """
+        Fetches the transcripts of many videos concurrently, capped by
+        `max_concurrency` workers and the shared rate limiter.
+        Results keep the input order; failures are reported per video.
+        """
+        def ingest(url: str) -> Dict:
+            result = {"url": url, "video_id": None, "segments": [], "error": None}
+            try:
+                result["video_id"] = self.parse_youtube_video_id(url)
+                result["segments"] = self.fetch_transcript_segments(result["video_id"])
+            except Exception as e:
+                result["error"] = str(e)
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(ingest, urls))
+
+    def build_multi_source_context(self, sources: List[Dict]) -> str:
+        """
+        Renders ingested videos as one source document. Every block is tagged
+        with a link to its time offset so lessons can point back at the video.
+        """
+        parts = []
+        for i, source in enumerate(sources):
+            if source.get("error") or not source.get("segments"):
+                continue
+            video_id = source["video_id"]
+            parts.append(f"{SOURCE_HEADER}{i + 1}: {video_link(video_id)}")
+            for block in self.group_transcript_segments(source["segments"]):
+                parts.append(f"[{video_link(video_id, block['start'])}] {block['text']}")
+        return "\n".join(parts)
+
     @staticmethod
     def scrape_web_page(url: str) -> str:
         """Scrapes text content from a web page."""
+        from bs4 import BeautifulSoup
         try:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
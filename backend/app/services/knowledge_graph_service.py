@@ -0,0 +1,172 @@
+"""
+Persistent per-user knowledge map.
+Each course is a node fingerprinted by its text; only courses whose
+fingerprint changed are re-embedded, and only their edges are recomputed.
+Candidate edges come from local embedding similarity (see app.core.embeddings);
+the LLM just labels those candidates and categorises new courses.
+"""
+import hashlib
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.agents.mapper_agent import label_course_links
+from app.core.config import settings
+from app.core.embeddings import embed
+from app.core.overload import LLMUnavailableError
+from app.models.models import Course, KnowledgeEdge, KnowledgeNode, Module, Topic
+
+
+def _course_texts(db: Session, user_id: int) -> Dict[int, dict]:
+    """{course_id: {id, title, description, text}} for every course the user owns."""
+    courses = {
+        c.id: {"id": c.id, "title": c.title, "description": c.description or "", "parts": []}
+        for c in db.query(Course.id, Course.title, Course.description).filter(Course.owner_id == user_id)
+    }
+    outline = db.query(Module.course_id, Module.title, Topic.title).outerjoin(
+        Topic, Topic.module_id == Module.id
+    ).filter(Module.course_id.in_(list(courses))).order_by(Module.order, Module.id, Topic.order, Topic.id)
+    seen_modules = set()
+    for course_id, module_title, topic_title in outline:
+        parts = courses[course_id]["parts"]
+        if (course_id, module_title) not in seen_modules:
+            seen_modules.add((course_id, module_title))
+            parts.append(module_title or "")
+        if topic_title:
+            parts.append(topic_title)
+
+    for course in courses.values():
+        course["text"] = "\n".join([course["title"] or "", course["description"], *course.pop("parts")])
+    return courses
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _candidate_pairs(changed: List[int], vectors: Dict[int, np.ndarray]) -> List[tuple]:
+    """
+    (source, target, similarity) for the most similar courses to each changed
+    one, with source < target so a pair is only considered once.
+    """
+    ids = list(vectors)
+    if len(ids) < 2:
+        return []
+    matrix = np.stack([vectors[i] for i in ids])
+    pairs = {}
+    for course_id in changed:
+        scores = matrix @ vectors[course_id]
+        ranked = [
+            (ids[i], float(scores[i])) for i in np.argsort(-scores)
+            if ids[i] != course_id and scores[i] >= settings.KNOWLEDGE_EDGE_MIN_SIMILARITY
+        ]
+        for other, score in ranked[:settings.KNOWLEDGE_EDGE_MAX_CANDIDATES]:
+            pairs[(min(course_id, other), max(course_id, other))] = score
+    return [(source, target, score) for (source, target), score in pairs.items()]
+
+
+def update_knowledge_graph(db: Session, user_id: int) -> List[int]:
+    """
+    Brings the stored graph up to date with the user's courses and returns the
+    ids of the courses that were (re)mapped. Nothing is committed if labelling
+    fails, so the next request retries the same courses.
+    """
+    courses = _course_texts(db, user_id)
+    nodes = {n.course_id: n for n in db.query(KnowledgeNode).filter(KnowledgeNode.user_id == user_id)}
+
+    # Courses that were deleted take their node and edges with them
+    removed = [course_id for course_id in nodes if course_id not in courses]
+    if removed:
+        _drop_edges(db, user_id, removed)
+        db.query(KnowledgeNode).filter(KnowledgeNode.course_id.in_(removed)).delete(synchronize_session=False)
+
+    hashes = {course_id: _fingerprint(course["text"]) for course_id, course in courses.items()}
+    changed = [
+        course_id for course_id in courses
+        if course_id not in nodes or nodes[course_id].content_hash != hashes[course_id]
+    ]
+    if not changed:
+        if removed:
+            db.commit()
+        return []
+
+    vectors = {
+        course_id: np.frombuffer(node.embedding, dtype=np.float32)
+        for course_id, node in nodes.items() if course_id in courses and node.embedding
+    }
+    for course_id, vector in zip(changed, embed([courses[c]["text"] for c in changed])):
+        vectors[course_id] = vector
+
+    _drop_edges(db, user_id, changed)
+    pairs = _candidate_pairs(changed, vectors)
+
+    involved = set(changed) | {p[0] for p in pairs} | {p[1] for p in pairs}
+    try:
+        labels = label_course_links(
+            [courses[c] for c in sorted(involved)],
+            new_ids=changed,
+            pairs=pairs
+        )
+    except Exception:
+        db.rollback()
+        raise
+
+    categories = {c["id"]: c["category"] for c in labels["categories"]}
+    for course_id in changed:
+        node = nodes.get(course_id)
+        if node is None:
+            node = KnowledgeNode(user_id=user_id, course_id=course_id)
+            db.add(node)
+        node.title = courses[course_id]["title"]
+        node.content_hash = hashes[course_id]
+        node.embedding = vectors[course_id].tobytes()
+        node.category = categories.get(course_id) or node.category or "General"
+
+    # Keep only labels for pairs we asked about; the model may not add edges
+    candidates = {(source, target): score for source, target, score in pairs}
+    labelled = set()
+    for link in labels["links"]:
+        key = (min(link["source"], link["target"]), max(link["source"], link["target"]))
+        if key in candidates and key not in labelled:
+            labelled.add(key)
+            db.add(KnowledgeEdge(
+                user_id=user_id, source_course_id=key[0], target_course_id=key[1],
+                label=link["label"], similarity=candidates[key]
+            ))
+
+    db.commit()
+    return changed
+
+
+def _drop_edges(db: Session, user_id: int, course_ids: List[int]):
+    db.query(KnowledgeEdge).filter(
+        KnowledgeEdge.user_id == user_id,
+        or_(KnowledgeEdge.source_course_id.in_(course_ids), KnowledgeEdge.target_course_id.in_(course_ids))
+    ).delete(synchronize_session=False)
+
+
+def get_knowledge_graph(db: Session, user_id: int) -> dict:
+    """
+    The user's graph as {nodes, links, stale}, updated first for any course
+    that changed. While the LLM is shedding mapper calls the stored graph is
+    served as is, with stale set.
+    """
+    try:
+        update_knowledge_graph(db, user_id)
+        stale = False
+    except LLMUnavailableError:
+        stale = True
+
+    nodes = db.query(KnowledgeNode.course_id, KnowledgeNode.title, KnowledgeNode.category).filter(
+        KnowledgeNode.user_id == user_id
+    ).order_by(KnowledgeNode.course_id).all()
+    links = db.query(KnowledgeEdge.source_course_id, KnowledgeEdge.target_course_id, KnowledgeEdge.label).filter(
+        KnowledgeEdge.user_id == user_id
+    ).order_by(KnowledgeEdge.source_course_id, KnowledgeEdge.target_course_id).all()
+    return {
+        "nodes": [{"id": n.course_id, "title": n.title, "category": n.category or "General"} for n in nodes],
+        "links": [{"source": l.source_course_id, "target": l.target_course_id, "label": l.label} for l in links],
+        "stale": stale,
+    }
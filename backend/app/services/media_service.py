@@ -0,0 +1,88 @@
+"""
+Text extraction from media: OCR for images, Whisper for audio and video.
+
+These pull in Tesseract bindings, PIL and Whisper (and with it torch), so they
+are meant to run in the media worker (app.workers.media), not in API
+processes. `extract_media_text` hands the job to that worker when a broker is
+configured and otherwise runs it inline, importing the libraries on first use.
+"""
+import os
+import threading
+from typing import Dict
+
+from app.core.config import settings
+
+MEDIA_KINDS = ("image", "audio", "video")
+
+# Whisper models are large; load each one once per worker process
+_whisper_models: Dict[str, object] = {}
+_whisper_lock = threading.Lock()
+
+
+class MediaProcessingError(Exception):
+    """Raised when a media file could not be turned into text."""
+
+
+def media_kind(content_type: str) -> str:
+    """'image', 'audio', 'video' or '' for content types that are not media."""
+    content_type = (content_type or "").lower()
+    for kind in MEDIA_KINDS:
+        if content_type.startswith(f"{kind}/"):
+            return kind
+    return ""
+
+
+def ocr_image(file_path: str) -> str:
+    """Extracts text from an image with Tesseract."""
+    import pytesseract
+    from PIL import Image
+
+    if os.name == "nt":
+        tesseract_path = os.getenv("TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
+        if os.path.exists(tesseract_path):
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+    with Image.open(file_path) as image:
+        return pytesseract.image_to_string(image)
+
+
+def _whisper_model(name: str):
+    with _whisper_lock:
+        if name not in _whisper_models:
+            try:
+                import whisper
+            except ImportError:
+                raise MediaProcessingError("Audio and video need the openai-whisper package on the media worker")
+            _whisper_models[name] = whisper.load_model(name)
+        return _whisper_models[name]
+
+
+def transcribe(file_path: str) -> str:
+    """Transcribes an audio or video file with Whisper."""
+    return _whisper_model(settings.WHISPER_MODEL).transcribe(file_path)["text"]
+
+
+def process_media(kind: str, file_path: str) -> str:
+    """Runs the extractor for `kind` in this process."""
+    if kind == "image":
+        return ocr_image(file_path)
+    if kind in ("audio", "video"):
+        return transcribe(file_path)
+    raise MediaProcessingError(f"Unsupported media type: {kind}")
+
+
+def extract_media_text(kind: str, file_path: str) -> str:
+    """
+    Text of a media file. With MEDIA_BROKER_URL set the work is queued for the
+    media worker (which must see the same upload directory); otherwise it is
+    done here.
+    """
+    if not settings.MEDIA_BROKER_URL:
+        return process_media(kind, file_path)
+
+    from app.workers.media import process_media_task
+    result = process_media_task.delay(kind, os.path.abspath(file_path))
+    try:
+        return result.get(timeout=settings.MEDIA_TASK_TIMEOUT)
+    except Exception as e:
+        raise MediaProcessingError(f"Media worker failed: {e}")
@@ -0,0 +1,171 @@
+"""
+Spaced repetition for flashcards and quiz questions (SM-2).
+
+Every flashcard and quiz question of a course gets a ReviewCard for its
+owner when it is saved, due at once; content saved before that is picked
+up by backfill_cards at startup. Each graded review moves the card's due_at
+by an interval that grows with its ease factor. The due queue is read
+straight off the (user_id, due_at) index, so fetching the next N cards costs
+an index seek plus N rows however many cards a learner has.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import DateTime, exists, insert, literal, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Course, Flashcard, Module, Quiz, ReviewCard, Topic
+
+# Tries of a backfill that keeps racing another process for the same cards
+BACKFILL_ATTEMPTS = 3
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything here is UTC
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def sm2(card: ReviewCard, grade: int, reviewed_at: datetime):
+    """
+    Applies one review graded 0-5 (SM-2 quality: 5 perfect, 3 correct with
+    effort, below 3 forgotten). A lapse restarts the interval at one day.
+    """
+    if grade >= 3:
+        if card.repetitions == 0:
+            card.interval_days = 1
+        elif card.repetitions == 1:
+            card.interval_days = 6
+        else:
+            card.interval_days = round(card.interval_days * card.ease)
+        card.repetitions += 1
+    else:
+        card.repetitions = 0
+        card.interval_days = 1
+        card.lapses += 1
+    card.ease = max(settings.REVIEW_MIN_EASE, card.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    card.last_reviewed_at = reviewed_at
+    card.due_at = reviewed_at + timedelta(days=card.interval_days)
+
+
+def add_cards(db: Session, user_id: int, course_id: int, flashcard_ids: Iterable[int] = (), quiz_ids: Iterable[int] = ()):
+    """New cards, due now, for freshly saved flashcards and quiz questions. The caller commits."""
+    now = datetime.now(timezone.utc)
+    db.add_all(
+        [ReviewCard(user_id=user_id, course_id=course_id, flashcard_id=i, due_at=now) for i in flashcard_ids]
+        + [ReviewCard(user_id=user_id, course_id=course_id, quiz_id=i, due_at=now) for i in quiz_ids]
+    )
+
+
+def drop_topic_cards(db: Session, topic_id: int, section: str):
+    """Removes the cards of a topic's flashcards or quizzes before they are replaced. The caller commits."""
+    if section == "flashcards":
+        column, items = ReviewCard.flashcard_id, select(Flashcard.id).where(Flashcard.topic_id == topic_id)
+    else:
+        column, items = ReviewCard.quiz_id, select(Quiz.id).where(Quiz.topic_id == topic_id)
+    db.query(ReviewCard).filter(column.in_(items)).delete(synchronize_session=False)
+
+
+def backfill_cards(db: Session, course_id: Optional[int] = None) -> int:
+    """
+    Creates the cards course owners are missing for existing flashcards and
+    quiz questions, e.g. content generated before review tracking, in every
+    course or just `course_id`. Run once at startup. Each kind is a single
+    INSERT ... SELECT over an anti-join, so only missing cards are written
+    and running it again is a no-op. If another process inserts the same
+    cards first, the unique constraints reject the batch and it is retried,
+    this time skipping theirs. Returns the number of cards created.
+    """
+    now = literal(datetime.now(timezone.utc), DateTime(timezone=True))
+    flashcards = select(Course.owner_id, Flashcard.course_id, Flashcard.id, now).join(
+        Course, Course.id == Flashcard.course_id
+    ).where(
+        Course.owner_id.isnot(None),
+        ~exists().where(ReviewCard.user_id == Course.owner_id, ReviewCard.flashcard_id == Flashcard.id)
+    )
+    quizzes = select(Course.owner_id, Module.course_id, Quiz.id, now).select_from(Quiz).join(
+        Topic, Topic.id == Quiz.topic_id
+    ).join(Module, Module.id == Topic.module_id).join(Course, Course.id == Module.course_id).where(
+        Course.owner_id.isnot(None),
+        ~exists().where(ReviewCard.user_id == Course.owner_id, ReviewCard.quiz_id == Quiz.id)
+    )
+    if course_id is not None:
+        flashcards = flashcards.where(Course.id == course_id)
+        quizzes = quizzes.where(Course.id == course_id)
+
+    attempt = 1
+    while True:
+        try:
+            added = db.execute(insert(ReviewCard).from_select(
+                ["user_id", "course_id", "flashcard_id", "due_at"], flashcards
+            )).rowcount
+            added += db.execute(insert(ReviewCard).from_select(
+                ["user_id", "course_id", "quiz_id", "due_at"], quizzes
+            )).rowcount
+            db.commit()
+            return added
+        except IntegrityError:
+            db.rollback()
+            if attempt == BACKFILL_ATTEMPTS:
+                raise
+            attempt += 1
+
+
+def due_cards(db: Session, user_id: int, limit: int, course_id: Optional[int] = None,
+              now: Optional[datetime] = None) -> List[dict]:
+    """
+    The next `limit` cards due by `now`, most overdue first, with their
+    content. Walks the due index in order and stops after `limit` rows.
+    """
+    now = now or datetime.now(timezone.utc)
+    query = db.query(
+        ReviewCard.id, ReviewCard.course_id, ReviewCard.due_at, ReviewCard.repetitions,
+        Flashcard.id.label("flashcard_id"), Flashcard.front, Flashcard.back,
+        Quiz.id.label("quiz_id"), Quiz.question, Quiz.options, Quiz.correct_answer, Quiz.explanation
+    ).outerjoin(Flashcard, Flashcard.id == ReviewCard.flashcard_id).outerjoin(
+        Quiz, Quiz.id == ReviewCard.quiz_id
+    ).filter(
+        ReviewCard.user_id == user_id,
+        ReviewCard.due_at <= now,
+        # Skips cards whose item is gone where the database does not cascade
+        or_(Flashcard.id.isnot(None), Quiz.id.isnot(None))
+    )
+    if course_id is not None:
+        query = query.filter(ReviewCard.course_id == course_id)
+
+    cards = []
+    for row in query.order_by(ReviewCard.due_at, ReviewCard.id).limit(limit):
+        card = {"card_id": row.id, "course_id": row.course_id, "due_at": _utc(row.due_at), "new": row.repetitions == 0}
+        if row.flashcard_id is not None:
+            card.update(kind="flashcard", front=row.front, back=row.back)
+        else:
+            card.update(kind="quiz", question=row.question, options=row.options,
+                        correct_answer=row.correct_answer, explanation=row.explanation)
+        cards.append(card)
+    return cards
+
+
+def submit_reviews(db: Session, user_id: int, reviews: List[dict]) -> Dict[str, list]:
+    """
+    Applies a whole session of graded reviews in one query and one commit.
+    Reviews of the same card are applied in time order. Returns the new state
+    of every updated card and the ids that are not the user's cards.
+    """
+    now = datetime.now(timezone.utc)
+    ids = {r["card_id"] for r in reviews}
+    cards = {c.id: c for c in db.query(ReviewCard).filter(ReviewCard.id.in_(ids), ReviewCard.user_id == user_id)}
+
+    ordered = sorted(reviews, key=lambda r: _utc(r.get("reviewed_at") or now))
+    for review in ordered:
+        card = cards.get(review["card_id"])
+        if card is not None:
+            sm2(card, review["grade"], min(_utc(review.get("reviewed_at") or now), now))
+    db.commit()
+
+    updated = [
+        {"card_id": c.id, "due_at": _utc(c.due_at), "interval_days": c.interval_days,
+         "ease": round(c.ease, 2), "repetitions": c.repetitions}
+        for c in cards.values()
+    ]
+    return {"updated": updated, "unknown": sorted(ids - set(cards))}
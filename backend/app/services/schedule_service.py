@@ -0,0 +1,217 @@
+"""
+Day-by-day study plans, packed locally in milliseconds.
+
+A topic's time is its content length at the chosen level read at
+SCHEDULE_READING_WPM, plus a little per quiz question. Topics are packed in
+course order into the learner's daily minutes, and every studied topic comes
+back for a short review after each of SCHEDULE_REVIEW_INTERVALS days.
+
+The plan is stored per (user, course). When progress or content changes only
+today onwards is re-packed; earlier days keep what was planned for them. The
+LLM is used only, and optionally, to phrase milestones, and its wording is
+cached on the plan.
+"""
+import hashlib
+import json
+import logging
+import math
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.agents.scheduler_agent import phrase_milestones
+from app.core.config import settings
+from app.models.models import Course, CourseProgress, Module, Quiz, StudyPlan, Topic
+
+logger = logging.getLogger(__name__)
+
+LEVEL_COLUMNS = {
+    "beginner": Topic.beginner_content,
+    "intermediate": Topic.intermediate_content,
+    "expert": Topic.expert_content,
+}
+CHARS_PER_WORD = 6  # English average including the space
+
+
+def topic_minutes(chars: Optional[int], quizzes: int) -> int:
+    """Estimated minutes to read a topic and answer its quiz questions."""
+    if chars:
+        reading = chars / CHARS_PER_WORD / settings.SCHEDULE_READING_WPM
+    else:
+        reading = settings.SCHEDULE_DEFAULT_TOPIC_MINUTES
+    return max(1, math.ceil(reading + quizzes * settings.SCHEDULE_MINUTES_PER_QUIZ))
+
+
+def estimate_topics(db: Session, course_id: int, level: str) -> List[dict]:
+    """
+    The course's topics in order with their estimated minutes. Content is
+    measured in SQL, so no topic text is loaded.
+    """
+    quiz_count = select(func.count(Quiz.id)).where(Quiz.topic_id == Topic.id).correlate(Topic).scalar_subquery()
+    rows = db.query(
+        Topic.id, Topic.title, Module.id.label("module_id"), Module.title.label("module_title"),
+        func.length(LEVEL_COLUMNS[level]).label("chars"), quiz_count.label("quizzes")
+    ).join(Module).filter(Module.course_id == course_id).order_by(Module.order, Module.id, Topic.order, Topic.id)
+    return [
+        {"id": r.id, "title": r.title, "module_id": r.module_id, "module_title": r.module_title,
+         "minutes": topic_minutes(r.chars, r.quizzes or 0)}
+        for r in rows
+    ]
+
+
+def pack(topics: List[dict], studied: Dict[int, Optional[date]], today: date, minutes_per_day: int,
+         spent_today: int = 0) -> List[dict]:
+    """
+    Days from `today` on. Each day takes its due reviews first, then the next
+    unstudied topics while they fit; a topic longer than a whole day gets a
+    day to itself (so not today once `spent_today` is set). Reviews that do
+    not fit move to the next day.
+    """
+    reviews = defaultdict(list)
+
+    def schedule_reviews(topic: dict, studied_on: date):
+        for offset in settings.SCHEDULE_REVIEW_INTERVALS:
+            if studied_on + timedelta(days=offset) >= today:
+                reviews[studied_on + timedelta(days=offset)].append(topic)
+
+    for topic in topics:
+        if studied.get(topic["id"]):
+            schedule_reviews(topic, studied[topic["id"]])
+    pending = deque(t for t in topics if t["id"] not in studied)
+
+    days, carried, day = [], [], today
+    budget = minutes_per_day - spent_today
+    while (pending or carried or any(d >= day for d in reviews)) and len(days) < settings.SCHEDULE_MAX_DAYS:
+        items, used = [], 0
+        due, carried = carried + reviews.pop(day, []), []
+        for topic in due:
+            if used + settings.SCHEDULE_REVIEW_MINUTES <= budget:
+                items.append({"topic_id": topic["id"], "title": topic["title"], "kind": "review",
+                              "minutes": settings.SCHEDULE_REVIEW_MINUTES})
+                used += settings.SCHEDULE_REVIEW_MINUTES
+            else:
+                carried.append(topic)
+        fresh_day = budget == minutes_per_day
+        while pending and (used + pending[0]["minutes"] <= budget
+                           or (fresh_day and not items and pending[0]["minutes"] > minutes_per_day)):
+            topic = pending.popleft()
+            items.append({"topic_id": topic["id"], "title": topic["title"], "kind": "study", "minutes": topic["minutes"]})
+            used += topic["minutes"]
+            schedule_reviews(topic, day)
+        if items:
+            days.append({"date": day.isoformat(), "minutes": used, "items": items})
+        day += timedelta(days=1)
+        budget = minutes_per_day
+    return days
+
+
+def _describe(days: List[dict], topics: List[dict], done_before: int):
+    """Fills in each packed day's task and default milestone."""
+    module_numbers, last_in_module = {}, {}
+    for topic in topics:
+        module_numbers.setdefault(topic["module_id"], len(module_numbers) + 1)
+        last_in_module[topic["module_id"]] = topic["id"]
+    finishes = {topic_id: module_id for module_id, topic_id in last_in_module.items()}
+    titles = {topic["module_id"]: topic["module_title"] for topic in topics}
+
+    done = done_before
+    last_study = max((i for i, d in enumerate(days) if any(it["kind"] == "study" for it in d["items"])), default=-1)
+    for i, day in enumerate(days):
+        study = [it for it in day["items"] if it["kind"] == "study"]
+        review = [it for it in day["items"] if it["kind"] == "review"]
+        parts = []
+        if study:
+            parts.append("Learn " + ", ".join(it["title"] for it in study))
+        if review:
+            parts.append("Review " + ", ".join(it["title"] for it in review))
+        day["task"] = "; ".join(parts)
+
+        done += len(study)
+        finished = [finishes[it["topic_id"]] for it in study if it["topic_id"] in finishes]
+        if i == last_study:
+            day["milestone"] = "All topics covered"
+        elif finished:
+            module_id = finished[-1]
+            day["milestone"] = f"Module {module_numbers[module_id]} complete: {titles[module_id]}"
+        elif study:
+            day["milestone"] = f"{done} of {len(topics)} topics done"
+        else:
+            day["milestone"] = "Review day"
+
+
+def _apply_phrasing(plan: StudyPlan, days: List[dict], course_title: str, phrase: bool):
+    """Uses cached LLM wording for milestones, asking for any missing first if `phrase` is set."""
+    cache = dict(plan.milestones or {})
+    if phrase:
+        missing = sorted({d["milestone"] for d in days} - set(cache))
+        if missing:
+            try:
+                cache.update(zip(missing, phrase_milestones(course_title, missing)))
+                plan.milestones = cache
+            except Exception as e:
+                # Optional polish: the plain milestones are served instead
+                logger.warning(f"Milestone phrasing unavailable, keeping defaults: {e}")
+    return [{**d, "milestone": cache.get(d["milestone"], d["milestone"])} for d in days]
+
+
+def _numbered(plan: StudyPlan, days: List[dict]) -> List[dict]:
+    return [{**d, "day": (date.fromisoformat(d["date"]) - plan.start_date).days + 1} for d in days]
+
+
+def get_plan(db: Session, user_id: int, course_id: int, minutes_per_day: Optional[int] = None,
+             level: Optional[str] = None, phrase: bool = False, create: bool = True,
+             today: Optional[date] = None) -> Optional[List[dict]]:
+    """
+    The learner's schedule, re-packed from today if anything it depends on
+    changed. minutes_per_day and level are remembered for later calls. With
+    create=False nothing happens for a course that has no plan yet.
+    """
+    today = today or date.today()
+    plan = db.query(StudyPlan).filter(StudyPlan.user_id == user_id, StudyPlan.course_id == course_id).first()
+    if plan is None:
+        if not create:
+            return None
+        plan = StudyPlan(user_id=user_id, course_id=course_id, start_date=today, studied={}, days=[], milestones={},
+                         minutes_per_day=settings.SCHEDULE_MINUTES_PER_DAY, level="beginner")
+        db.add(plan)
+    plan.minutes_per_day = minutes_per_day or plan.minutes_per_day
+    plan.level = level or plan.level
+
+    topics = estimate_topics(db, course_id, plan.level)
+    progress = db.query(CourseProgress.completed_topic_ids).filter(
+        CourseProgress.user_id == user_id, CourseProgress.course_id == course_id
+    ).first()
+    completed = set(progress.completed_topic_ids or []) if progress else set()
+    course_ids = {t["id"] for t in topics}
+
+    # When each completed topic was studied: kept from earlier calls, today for
+    # new completions, unknown for anything completed before the plan existed
+    previous = {int(k): v for k, v in (plan.studied or {}).items()}
+    new_plan = not plan.days and not previous
+    studied = {}
+    for topic_id in completed & course_ids:
+        if topic_id in previous:
+            studied[topic_id] = previous[topic_id]
+        else:
+            studied[topic_id] = None if new_plan else today.isoformat()
+
+    inputs = json.dumps([today.isoformat(), plan.level, plan.minutes_per_day,
+                         [(t["id"], t["minutes"]) for t in topics], sorted(studied.items())])
+    inputs_hash = hashlib.sha256(inputs.encode()).hexdigest()
+    if inputs_hash != plan.inputs_hash:
+        history = [d for d in plan.days or [] if d["date"] < today.isoformat()]
+        studied_dates = {k: date.fromisoformat(v) if v else None for k, v in studied.items()}
+        spent_today = sum(t["minutes"] for t in topics if studied_dates.get(t["id"]) == today)
+        upcoming = pack(topics, studied_dates, today, plan.minutes_per_day, spent_today)
+        _describe(upcoming, topics, len(studied))
+        plan.days = history + upcoming
+        plan.studied = {str(k): v for k, v in studied.items()}
+        plan.inputs_hash = inputs_hash
+
+    course_title = db.query(Course.title).filter(Course.id == course_id).scalar() if phrase else ""
+    days = _apply_phrasing(plan, plan.days, course_title, phrase)
+    db.commit()
+    return _numbered(plan, days)
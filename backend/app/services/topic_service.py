@@ -0,0 +1,189 @@
+"""
+Persistence for per-section topic generation.
+Each section is written and marked ready on its own, so a failed or stale
+section can be regenerated without touching the others.
+
+Sections move through missing -> generating -> ready (or failed). A request
+claims a section by flipping it to "generating" in a single UPDATE, so two
+learners opening the same topic do not both pay for the same section.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.agents.topic_agent import LEVEL_SECTIONS, TOPIC_SECTIONS, generate_topic_sections
+from app.core.overload import LLMUnavailableError
+from app.models.models import Course, Flashcard, Quiz, Topic, TopicSection
+from app.services.review_service import add_cards, drop_topic_cards
+from app.services.vector_index import index_topic
+
+# Sections that are not a content level travel with whichever level is viewed first
+SHARED_SECTIONS = tuple(s for s in TOPIC_SECTIONS if s not in LEVEL_SECTIONS)
+
+# A "generating" claim older than this belongs to a worker that died
+STALE_GENERATING = timedelta(minutes=5)
+
+
+def section_statuses(topic: Topic) -> Dict[str, str]:
+    """Returns {section: status} for every section of the topic."""
+    statuses = {row.section: row.status for row in topic.sections}
+    return {section: statuses.get(section, "missing") for section in TOPIC_SECTIONS}
+
+
+def sections_for_level(level: str) -> List[str]:
+    """The sections needed to show one level of a topic."""
+    return [level, *SHARED_SECTIONS]
+
+
+def ensure_section_rows(db: Session, topic: Topic):
+    """
+    Creates the status rows a topic is missing.
+    Topics generated before sections were tracked have content but no rows;
+    those count as fully ready.
+    """
+    existing = {row.section for row in topic.sections}
+    if len(existing) == len(TOPIC_SECTIONS):
+        return
+
+    legacy_ready = not existing and bool(topic.beginner_content)
+    for section in TOPIC_SECTIONS:
+        if section not in existing:
+            db.add(TopicSection(topic_id=topic.id, section=section, status="ready" if legacy_ready else "missing"))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request created them first
+        db.rollback()
+    db.expire(topic, ["sections"])
+
+
+def claim_sections(db: Session, topic: Topic, sections: Iterable[str], force: bool = False) -> List[str]:
+    """
+    Marks the given sections as generating and returns the ones this caller
+    won. Ready sections are only reclaimed with force=True; sections another
+    worker is generating are left alone unless the claim has gone stale.
+    """
+    ensure_section_rows(db, topic)
+    claimable = ["missing", "failed"] + (["ready"] if force else [])
+    cutoff = datetime.now(timezone.utc) - STALE_GENERATING
+
+    claimed = []
+    for section in sections:
+        updated = db.query(TopicSection).filter(
+            TopicSection.topic_id == topic.id,
+            TopicSection.section == section,
+            or_(
+                TopicSection.status.in_(claimable),
+                and_(TopicSection.status == "generating", TopicSection.updated_at < cutoff)
+            )
+        ).update({"status": "generating", "error": None, "updated_at": func.now()}, synchronize_session=False)
+        if updated:
+            claimed.append(section)
+    if claimed:
+        _bump_version(db, topic)
+    db.commit()
+    db.expire(topic, ["sections"])
+    return claimed
+
+
+def _bump_version(db: Session, topic: Topic):
+    # Done in SQL so concurrent writers never hand out the same version twice
+    db.query(Topic).filter(Topic.id == topic.id).update({"version": Topic.version + 1}, synchronize_session=False)
+
+
+def _set_status(db: Session, topic: Topic, section: str, status: str, error: Optional[str] = None):
+    _bump_version(db, topic)
+    row = next((r for r in topic.sections if r.section == section), None)
+    if not row:
+        row = TopicSection(topic_id=topic.id, section=section)
+        topic.sections.append(row)
+    row.status = status
+    row.error = error
+
+
+def mark_failed(db: Session, topic: Topic, section: str, error: str):
+    """Releases a claim after generation failed. The caller commits."""
+    _set_status(db, topic, section, "failed", error)
+
+
+def _owner_id(db: Session, course_id: int) -> int:
+    return db.query(Course.owner_id).filter(Course.id == course_id).scalar()
+
+
+def save_topic_section(db: Session, topic: Topic, section: str, data: dict):
+    """
+    Writes the fields produced for one section and marks it ready. New quiz
+    questions and flashcards get review cards for the course owner. The
+    caller commits.
+    """
+    if section in ("quizzes", "flashcards"):
+        course_id = topic.module.course_id
+        drop_topic_cards(db, topic.id, section)
+    if section == "quizzes":
+        db.query(Quiz).filter(Quiz.topic_id == topic.id).delete(synchronize_session=False)
+        items = [Quiz(
+            topic_id=topic.id,
+            question=q["question"],
+            options=q["options"],
+            correct_answer=q["correct_answer"],
+            explanation=q["explanation"],
+            difficulty=q.get("difficulty", "medium")
+        ) for q in data["quizzes"]]
+        db.add_all(items)
+        db.flush()
+        add_cards(db, _owner_id(db, course_id), course_id, quiz_ids=[q.id for q in items])
+    elif section == "flashcards":
+        # Flashcards belong to the course but remember their topic so they can be replaced
+        db.query(Flashcard).filter(Flashcard.topic_id == topic.id).delete(synchronize_session=False)
+        items = [Flashcard(course_id=course_id, topic_id=topic.id, front=f["front"], back=f["back"]) for f in data["flashcards"]]
+        db.add_all(items)
+        db.flush()
+        add_cards(db, _owner_id(db, course_id), course_id, flashcard_ids=[f.id for f in items])
+    else:
+        for field, value in data.items():
+            setattr(topic, field, value)
+
+    _set_status(db, topic, section, "ready")
+
+
+def generate_sections(db: Session, topic: Topic, sections: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, str]:
+    """
+    Generates the given sections (default: every section) that are not yet
+    ready and not already being generated elsewhere, concurrently, saves the
+    ones that succeed and commits.
+    Returns {section: error} for the sections that failed. If the LLM refused
+    every call (LLMUnavailableError), the sections are released as failed and
+    the error is re-raised.
+    """
+    wanted = list(sections) if sections is not None else list(TOPIC_SECTIONS)
+    todo = claim_sections(db, topic, wanted, force=force)
+    if not todo:
+        return {}
+
+    try:
+        results, errors = generate_topic_sections(
+            todo,
+            topic.module.course.title,
+            topic.module.title,
+            topic.title
+        )
+    except LLMUnavailableError as e:
+        for section in todo:
+            mark_failed(db, topic, section, str(e))
+        db.commit()
+        raise
+    except Exception as e:
+        results, errors = {}, {section: str(e) for section in todo}
+
+    for section, data in results.items():
+        save_topic_section(db, topic, section, data)
+    for section, error in errors.items():
+        mark_failed(db, topic, section, error)
+
+    if results:
+        index_topic(db, topic, topic.module.course_id)
+    db.commit()
+    return errors
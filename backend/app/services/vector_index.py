@@ -0,0 +1,108 @@
+"""
+Per-course retrieval index persisted in the database.
+Chunks are embedded locally (see app.core.embeddings) and written as topics
+are created and generated, so the index grows incrementally.
+"""
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
+
+from app.core.config import settings
+from app.core.embeddings import CourseIndex, chunk_text, embed
+from app.models.models import ContentChunk, Module, Topic
+
+# Which Topic fields get indexed, and how they are labelled in retrieved context
+INDEXED_SECTIONS = {
+    "summary": "Summary",
+    "beginner_content": "Beginner",
+    "intermediate_content": "Intermediate",
+    "expert_content": "Expert",
+    "examples": "Examples",
+    "analogies": "Analogies",
+}
+
+
+def _topic_chunks(topic: Topic) -> List[str]:
+    chunks = []
+    for field, label in INDEXED_SECTIONS.items():
+        value = getattr(topic, field)
+        if isinstance(value, list):
+            value = "\n".join(str(v) for v in value)
+        for piece in chunk_text(value or ""):
+            chunks.append(f"[{topic.title} / {label}] {piece}")
+    return chunks
+
+
+# course_id -> (stamp, CourseIndex), least recently used first; the stamp
+# detects rows added by other workers. Bounded, since each index holds a
+# chunks x EMBEDDING_DIM float32 matrix.
+_course_indexes: "OrderedDict[int, Tuple[tuple, CourseIndex]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def index_topic(db: Session, topic: Topic, course_id: int):
+    """
+    (Re)indexes a single topic. Called whenever a topic is created or its
+    content is generated, so the course index grows incrementally.
+    The caller commits.
+    """
+    db.query(ContentChunk).filter(ContentChunk.topic_id == topic.id).delete(synchronize_session=False)
+    texts = _topic_chunks(topic)
+    vectors = embed(texts)
+    for text, vector in zip(texts, vectors):
+        db.add(ContentChunk(course_id=course_id, topic_id=topic.id, text=text, embedding=vector.tobytes()))
+    topic.indexed_version = topic.version or 1
+
+
+def ensure_course_indexed(db: Session, course_id: int):
+    """
+    Indexes topics that predate the index. Topics are marked when indexed,
+    even if they had no text yet, so this is a single cheap query once a
+    course is fully indexed.
+    """
+    missing = db.query(Topic).options(undefer_group("content")).join(Module).filter(
+        Module.course_id == course_id,
+        Topic.indexed_version.is_(None)
+    ).all()
+    for topic in missing:
+        index_topic(db, topic, course_id)
+    if missing:
+        db.commit()
+
+
+def _load_course_index(db: Session, course_id: int) -> CourseIndex:
+    stamp = tuple(db.query(func.count(ContentChunk.id), func.max(ContentChunk.id)).filter(
+        ContentChunk.course_id == course_id
+    ).one())
+
+    with _lock:
+        cached = _course_indexes.get(course_id)
+        if cached and cached[0] == stamp:
+            _course_indexes.move_to_end(course_id)
+            return cached[1]
+
+    rows = db.query(ContentChunk.text, ContentChunk.embedding).filter(
+        ContentChunk.course_id == course_id
+    ).order_by(ContentChunk.id).all()
+    index = CourseIndex()
+    if rows:
+        vectors = np.frombuffer(b"".join(r.embedding for r in rows), dtype=np.float32)
+        index.add([r.text for r in rows], vectors.reshape(len(rows), -1))
+
+    with _lock:
+        _course_indexes[course_id] = (stamp, index)
+        _course_indexes.move_to_end(course_id)
+        while len(_course_indexes) > settings.VECTOR_INDEX_CACHE_COURSES:
+            _course_indexes.popitem(last=False)
+    return index
+
+
+def retrieve(db: Session, course_id: int, query: str, k: Optional[int] = None) -> List[str]:
+    """Returns the top-k chunks of the course most relevant to the query."""
+    ensure_course_indexed(db, course_id)
+    index = _load_course_index(db, course_id)
+    return [text for text, _ in index.search(query, k or settings.MENTOR_TOP_K)]
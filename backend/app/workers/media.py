@@ -0,0 +1,28 @@
+"""
+Celery worker for media processing (OCR, Whisper transcription).
+
+Deployed separately from the API so only these processes load torch and
+Tesseract:
+
+    celery -A app.workers.media worker -Q media --concurrency 2
+
+API processes enqueue work through app.services.media_service.extract_media_text.
+"""
+from celery import Celery
+
+from app.core.config import settings
+from app.services.media_service import process_media
+
+celery_app = Celery("courseforge_media", broker=settings.MEDIA_BROKER_URL, backend=settings.MEDIA_BROKER_URL)
+celery_app.conf.update(
+    task_default_queue="media",
+    # Jobs are long and memory hungry: take one at a time and requeue on a crash
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    result_expires=3600,
+)
+
+
+@celery_app.task(name="media.process")
+def process_media_task(kind: str, file_path: str) -> str:
+    return process_media(kind, file_path)
@@ -0,0 +1,250 @@
+"""
+Batch course generation for pre-building catalogs.
+
+Reads a manifest of topics (JSON Lines, a JSON list, or CSV with a `topic`
+column and an optional `difficulty` column), generates each syllabus and
+then every topic's sections straight into the database, several courses at
+a time. All LLM calls share one process-wide rate limiter. Progress is
+checkpointed after every course step, so re-running the same command after
+a crash resumes where it stopped.
+
+    python batch_generate.py catalog.jsonl --owner-email content@example.com --concurrency 4 --rps 2
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from app.agents.curriculum_agent import generate_course_syllabus
+from app.agents.topic_agent import TOPIC_SECTIONS
+from app.api.endpoints.courses import save_course_to_db
+from app.core import llm, metrics
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.core.overload import LLMUnavailableError
+from app.models.models import Course, Module, Topic, TopicSection, User
+from app.services.topic_service import generate_sections
+
+
+def load_manifest(path: str) -> List[dict]:
+    """Manifest entries with a stable key per (topic, difficulty); duplicates are dropped."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        elif path.endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    entries, seen = [], set()
+    for number, row in enumerate(rows, 1):
+        topic = (row.get("topic") or "").strip()
+        if not topic:
+            raise SystemExit(f"{path}: entry {number} has no topic")
+        difficulty = (row.get("difficulty") or "starter").strip()
+        key = hashlib.sha1(f"{topic.lower()}\0{difficulty.lower()}".encode()).hexdigest()[:16]
+        if key in seen:
+            print(f"Skipping duplicate entry {number}: {topic} ({difficulty})")
+            continue
+        seen.add(key)
+        entries.append({"key": key, "topic": topic, "difficulty": difficulty})
+    return entries
+
+
+class Checkpoint:
+    """Per-entry progress in a JSON file, rewritten atomically after every change."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, key: str) -> dict:
+        with self.lock:
+            return dict(self.entries.get(key, {}))
+
+    def update(self, key: str, **fields):
+        with self.lock:
+            self.entries.setdefault(key, {}).update(fields)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp, self.path)
+
+
+def patiently(call, max_waits: int):
+    """Runs `call`, sleeping through LLMUnavailableError (shedding, open breakers) up to max_waits times."""
+    waits = 0
+    while True:
+        try:
+            return call()
+        except LLMUnavailableError as e:
+            waits += 1
+            if waits > max_waits:
+                raise
+            time.sleep(e.retry_after)
+
+
+def release_claims(course_id: int):
+    """
+    Frees sections a crashed run left marked as generating. The batch owns
+    its courses, so nothing else can be working on them.
+    """
+    db = SessionLocal()
+    try:
+        topic_ids = db.query(Topic.id).join(Module).filter(Module.course_id == course_id)
+        db.query(TopicSection).filter(
+            TopicSection.topic_id.in_(topic_ids.scalar_subquery()),
+            TopicSection.status == "generating"
+        ).update({"status": "failed", "error": "Interrupted batch run"}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def generate_topics(course_id: int, sections: List[str], workers: int, max_waits: int) -> Dict[int, dict]:
+    """Generates the missing sections of every topic in the course; returns {topic_id: errors} for failures."""
+    release_claims(course_id)
+    db = SessionLocal()
+    try:
+        topic_ids = [row.id for row in db.query(Topic.id).join(Module).filter(
+            Module.course_id == course_id
+        ).order_by(Module.order, Module.id, Topic.order, Topic.id)]
+    finally:
+        db.close()
+
+    def one(topic_id: int) -> dict:
+        session = SessionLocal()
+        try:
+            topic = session.get(Topic, topic_id)
+            return patiently(lambda: generate_sections(session, topic, sections), max_waits)
+        except Exception as e:
+            session.rollback()
+            return {"all": str(e)}
+        finally:
+            session.close()
+
+    failed = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for topic_id, errors in zip(topic_ids, pool.map(one, topic_ids)):
+            if errors:
+                failed[topic_id] = errors
+    return failed
+
+
+def run_entry(entry: dict, owner_id: int, checkpoint: Checkpoint, args) -> dict:
+    """Takes one manifest entry as far as it can go and records where it got to."""
+    key = entry["key"]
+    state = checkpoint.get(key)
+    if state.get("status") == "done":
+        return {**state, "status": "skipped"}
+
+    started = time.perf_counter()
+    course_id: Optional[int] = state.get("course_id")
+    try:
+        db = SessionLocal()
+        try:
+            if course_id is None or db.get(Course, course_id) is None:
+                syllabus = patiently(lambda: generate_course_syllabus(entry["topic"], entry["difficulty"]), args.max_waits)
+                course = save_course_to_db(syllabus, entry["topic"], entry["difficulty"], owner_id, db)
+                course_id = course.id
+                checkpoint.update(key, topic=entry["topic"], status="syllabus", course_id=course_id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        failed = {}
+        if not args.syllabus_only:
+            failed = generate_topics(course_id, args.sections, args.topic_workers, args.max_waits)
+        status = "partial" if failed else "done"
+        checkpoint.update(key, status=status, failed_topics=len(failed), seconds=round(time.perf_counter() - started, 1),
+                          error=next(iter(failed.values()), None) if failed else None)
+    except Exception as e:
+        checkpoint.update(key, topic=entry["topic"], status="failed", error=str(e))
+    return checkpoint.get(key)
+
+
+def llm_totals() -> dict:
+    """Tokens and calls recorded by the LLM client so far in this process."""
+    tokens = {"prompt": 0, "output": 0}
+    for (_, direction), value in list(metrics.llm_tokens.values.items()):
+        tokens[direction] += value
+    calls = sum(value for (_, _, outcome), value in list(metrics.llm_calls.values.items()) if outcome == "success")
+    return {**tokens, "calls": calls}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a catalog of courses from a manifest.")
+    parser.add_argument("manifest")
+    parser.add_argument("--owner-email", required=True, help="existing user who will own the courses")
+    parser.add_argument("--checkpoint", help="progress file (default: <manifest>.checkpoint.json)")
+    parser.add_argument("--concurrency", type=int, default=4, help="courses generated at once")
+    parser.add_argument("--topic-workers", type=int, default=2, help="topics generated at once per course")
+    parser.add_argument("--sections", default=",".join(TOPIC_SECTIONS), help="topic sections to generate")
+    parser.add_argument("--syllabus-only", action="store_true")
+    parser.add_argument("--rps", type=float, default=settings.LLM_REQUESTS_PER_SECOND or 2.0,
+                        help="LLM requests per second across all workers")
+    parser.add_argument("--burst", type=int, default=settings.LLM_REQUESTS_BURST)
+    parser.add_argument("--max-waits", type=int, default=10, help="times to wait out an unavailable LLM per step")
+    args = parser.parse_args()
+
+    args.sections = [s.strip() for s in args.sections.split(",") if s.strip()]
+    unknown = set(args.sections) - set(TOPIC_SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    entries = load_manifest(args.manifest)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.manifest}.checkpoint.json")
+    llm.configure_rate_limit(args.rps, args.burst)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    owner = db.query(User.id).filter(User.email == args.owner_email).first()
+    db.close()
+    if not owner:
+        raise SystemExit(f"No user with email {args.owner_email}")
+
+    print(f"{len(entries)} courses, {args.concurrency} at a time, {args.rps:g} LLM requests/s")
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = {pool.submit(run_entry, entry, owner.id, checkpoint, args): entry for entry in entries}
+        for done, future in enumerate(as_completed(futures), 1):
+            entry, result = futures[future], future.result()
+            results.append((entry, result))
+            detail = result.get("error") if result["status"] in ("failed", "partial") else f"course {result.get('course_id')}"
+            print(f"[{done}/{len(entries)}] {result['status']:<8} {entry['topic']} ({entry['difficulty']}): {detail}")
+    elapsed = time.perf_counter() - started
+
+    counts = {}
+    for _, result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    generated = [r["course_id"] for _, r in results if r["status"] in ("done", "partial")]
+    db = SessionLocal()
+    topics = db.query(Topic.id).join(Module).filter(Module.course_id.in_(generated)).count() if generated else 0
+    db.close()
+    totals = llm_totals()
+
+    print(f"\nFinished in {elapsed:.1f}s")
+    print("  " + ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
+    print(f"  throughput: {len(generated) / elapsed * 60:.2f} courses/min, {topics / elapsed * 60:.1f} topics/min")
+    print(f"  LLM: {totals['calls']} calls, {totals['prompt']:,} prompt + {totals['output']:,} output tokens")
+    failures = [(e, r) for e, r in results if r["status"] in ("failed", "partial")]
+    if failures:
+        print("  failures (re-run the same command to retry them):")
+        for entry, result in failures:
+            print(f"    {entry['topic']} ({entry['difficulty']}): {result.get('error')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Certificate rendering benchmark.
+
+Reports the render time of a single certificate, the cost of serving one that
+is already in the store, and cohort issuance throughput with 1 vs N worker
+processes. Uses a throwaway SQLite database and certificate store.
+
+    python benchmarks/certificate_benchmark.py --cohort 48 --workers 4
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+WORK_DIR = tempfile.mkdtemp(prefix="courseforge_cert_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.environ["CERTIFICATE_STORE_DIR"] = os.path.join(WORK_DIR, "store")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.models import Certificate, Course, User  # noqa: E402
+from app.services.certificate_service import (  # noqa: E402
+    get_certificate_path, issue_certificates_batch, render_certificate_pdf
+)
+
+
+def seed(cohort: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    owner = User(email="owner@example.com", password_hash="x", name="Owner")
+    db.add(owner)
+    db.flush()
+    course = Course(title="Foundations of Machine Learning", owner_id=owner.id)
+    db.add(course)
+    db.add_all(User(email=f"learner{i}@example.com", password_hash="x", name=f"Learner {i}") for i in range(cohort))
+    db.commit()
+    learner_ids = [u.id for u in db.query(User.id).filter(User.id != owner.id)]
+    ids = (owner.id, course.id, learner_ids)
+    db.close()
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cohort", type=int, default=48)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        owner_id, course_id, learner_ids = seed(args.cohort)
+
+        timings = []
+        for i in range(args.rounds):
+            started = time.perf_counter()
+            render_certificate_pdf("Ada Lovelace", "Foundations of Machine Learning", "2026-10-19", f"CF-BENCH-{i}")
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"render one certificate        median={statistics.median(timings):7.2f} ms  max={max(timings):7.2f} ms")
+
+        db = SessionLocal()
+        owner, course = db.get(User, owner_id), db.get(Course, course_id)
+        started = time.perf_counter()
+        get_certificate_path(db, owner, course)
+        first = (time.perf_counter() - started) * 1000
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            get_certificate_path(db, owner, course)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"download, first (render)      {first:7.2f} ms")
+        print(f"download, stored              median={statistics.median(timings):7.2f} ms")
+
+        half = len(learner_ids) // 2
+        for workers, cohort in ((1, learner_ids[:half]), (args.workers, learner_ids[half:])):
+            started = time.perf_counter()
+            issue_certificates_batch(db, course_id, cohort, max_workers=workers)
+            elapsed = time.perf_counter() - started
+            print(f"batch of {len(cohort):3d}, {workers} worker(s)    {elapsed * 1000:8.1f} ms total  "
+                  f"{elapsed * 1000 / len(cohort):6.2f} ms/certificate")
+        stored = db.query(Certificate).filter(Certificate.content_hash.isnot(None)).count()
+        print(f"certificates stored           {stored}")
+        db.close()
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+End-to-end load test: register -> login -> generate -> open topics -> mentor chat.
+
+Each virtual user walks the whole journey against a running server; the
+report gives throughput and p50/p95/p99 latency per endpoint. Needs httpx
+(pip install -r requirements-dev.txt). Run it against a server using the
+offline LLM stand-in so no Gemini quota is spent:
+
+    LLM_BACKEND=fake DATABASE_URL=sqlite:///./loadtest.db uvicorn main:app --port 8000
+    python benchmarks/load_test.py --users 50 --concurrency 10
+
+or let the script start (and stop) that server itself:
+
+    python benchmarks/load_test.py --spawn --users 50 --concurrency 10 --fake-latency-ms 300 --fake-429-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            raise
+        self.latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def user_journey(client: httpx.AsyncClient, rec: Recorder, args):
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    password = "load-test-password"
+    await rec.call(client, "POST /auth/register", "POST", "/api/auth/register",
+                   json={"email": email, "password": password, "name": "Load Tester"})
+    r = await rec.call(client, "POST /auth/login", "POST", "/api/auth/login",
+                       data={"username": email, "password": password})
+    if r.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = await rec.call(client, "POST /courses/generate", "POST", "/api/courses/generate",
+                       json={"topic": f"{args.topic} {uuid.uuid4().hex[:6]}", "difficulty": "starter"}, headers=headers)
+    if r.status_code != 201:
+        return
+    course = r.json()
+    topic_ids = [t["id"] for m in course["modules"] for t in m["topics"]][:args.topics]
+
+    for topic_id in topic_ids:
+        # 202 means another request is generating the level; poll like the frontend does
+        for _ in range(args.max_polls):
+            r = await rec.call(client, "GET /courses/topics/{id}", "GET", f"/api/courses/topics/{topic_id}",
+                               params={"level": "beginner"}, headers=headers)
+            if r.status_code != 202:
+                break
+            await asyncio.sleep(0.5)
+
+    for i in range(args.mentor_turns):
+        await rec.call(client, "POST /courses/{id}/mentor", "POST", f"/api/courses/{course['id']}/mentor",
+                       json={"topic_id": topic_ids[0] if topic_ids else None, "query": f"Question {i}: why does this work?"},
+                       headers=headers)
+
+
+async def run(args) -> Recorder:
+    rec = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        async def guarded():
+            async with semaphore:
+                try:
+                    await user_journey(client, rec, args)
+                except httpx.HTTPError as e:
+                    print(f"  journey aborted: {e!r}")
+
+        await asyncio.gather(*(guarded() for _ in range(args.users)))
+    return rec
+
+
+def report(rec: Recorder, elapsed: float):
+    total = sum(len(v) for v in rec.latencies.values())
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)\n")
+    print(f"{'endpoint':<30} {'count':>6} {'errors':>6} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, values in rec.latencies.items():
+        ordered = sorted(values)
+        print(f"{label:<30} {len(values):>6} {rec.errors[label]:>6} {len(values) / elapsed:>7.2f} "
+              f"{percentile(ordered, 50) * 1000:>9.1f} {percentile(ordered, 95) * 1000:>9.1f} {percentile(ordered, 99) * 1000:>9.1f}")
+
+
+def spawn_server(args) -> subprocess.Popen:
+    """Starts uvicorn on a scratch SQLite database with the fake LLM backend."""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='courseforge_load_'), 'load.db')}")
+    env.update({
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.fake_latency_ms),
+        "FAKE_LLM_RATE_LIMIT_RATE": str(args.fake_429_rate),
+    })
+    port = args.base_url.rsplit(":", 1)[-1].strip("/")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", port, "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"{args.base_url}/health", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--topics", type=int, default=3, help="topics opened per user")
+    parser.add_argument("--mentor-turns", type=int, default=2)
+    parser.add_argument("--max-polls", type=int, default=20)
+    parser.add_argument("--topic", default="Introduction to distributed systems")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--spawn", action="store_true", help="start a fake-LLM server for the run")
+    parser.add_argument("--fake-latency-ms", type=float, default=300)
+    parser.add_argument("--fake-429-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = spawn_server(args) if args.spawn else None
+    try:
+        started = time.perf_counter()
+        rec = asyncio.run(run(args))
+        report(rec, time.perf_counter() - started)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Measures what the deferred Topic/Course columns save per request.
+
+Seeds a throwaway SQLite database with courses whose topics carry realistic
+multi-kilobyte content, then runs each query the way it used to run (every
+column loaded) and the way it runs now (deferred columns / projections),
+reporting bytes pulled from the database, peak Python memory and the JSON
+size of the response.
+
+    python benchmarks/measure_deferred_columns.py --courses 50 --topics 12
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "courseforge_deferred_bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func  # noqa: E402
+from sqlalchemy.orm import undefer, undefer_group  # noqa: E402
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.models import Course, Module, Topic, User  # noqa: E402
+
+PARAGRAPH = "Gradient descent walks downhill on the loss surface one small step at a time. " * 40
+
+fetched_bytes = 0
+
+
+def _counting_row_factory(cursor, row):
+    global fetched_bytes
+    fetched_bytes += sum(len(str(value)) for value in row if value is not None)
+    return row
+
+
+@event.listens_for(engine, "connect")
+def _count_fetched(dbapi_connection, connection_record):
+    # Every row the driver hands back passes through here
+    dbapi_connection.row_factory = _counting_row_factory
+
+
+def seed(courses: int, topics: int) -> int:
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="bench@example.com", password_hash="x", name="Bench")
+    db.add(user)
+    db.flush()
+    for c in range(courses):
+        course = Course(title=f"Course {c}", description=PARAGRAPH * 2, owner_id=user.id)
+        module = Module(title="Module", order=0)
+        course.modules.append(module)
+        for t in range(topics):
+            module.topics.append(Topic(
+                title=f"Topic {t}", order=t, summary="Short summary.",
+                beginner_content=PARAGRAPH, intermediate_content=PARAGRAPH, expert_content=PARAGRAPH,
+                examples=[PARAGRAPH[:400]] * 3, analogies=[PARAGRAPH[:400]] * 2
+            ))
+        db.add(course)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def measure(label: str, run):
+    global fetched_bytes
+    db = SessionLocal()
+    fetched_bytes = 0
+    tracemalloc.start()
+    payload = run(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    body = len(json.dumps(payload, default=str))
+    print(f"  {label:<8} fetched={fetched_bytes / 1024:9.1f} KiB  peak_mem={peak / 1024:9.1f} KiB  response={body / 1024:8.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--topics", type=int, default=12)
+    args = parser.parse_args()
+    user_id = seed(args.courses, args.topics)
+    topic_id = SessionLocal().query(func.max(Topic.id)).scalar()
+
+    print("complete_topic ownership check")
+    measure("before", lambda db: {"owned": db.query(Topic).options(undefer_group("content")).join(Module).join(Course).filter(
+        Topic.id == topic_id, Course.owner_id == user_id).first() is not None})
+    measure("after", lambda db: {"owned": db.query(Topic.id).join(Module).join(Course).filter(
+        Topic.id == topic_id, Course.owner_id == user_id).first() is not None})
+
+    print("my-courses listing")
+    measure("before", lambda db: [
+        {"id": c.id, "title": c.title, "description": c.description, "status": c.status}
+        for c in db.query(Course).options(undefer(Course.description)).filter(Course.owner_id == user_id).all()
+    ])
+    measure("after", lambda db: [
+        {"id": c.id, "title": c.title, "description": c.description, "status": c.status}
+        for c in db.query(Course.id, Course.title, func.substr(Course.description, 1, 300).label("description"),
+                          Course.status).filter(Course.owner_id == user_id).all()
+    ])
+
+    print("learning summary (topics per course)")
+    measure("before", lambda db: sum(
+        len(db.query(Topic).options(undefer_group("content")).join(Module).filter(Module.course_id == c.id).all())
+        for c in db.query(Course).options(undefer(Course.description)).filter(Course.owner_id == user_id).all()
+    ))
+    measure("after", lambda db: sum(
+        db.query(func.count(Topic.id)).join(Module).filter(Module.course_id == c.id).scalar()
+        for c in db.query(Course.id).filter(Course.owner_id == user_id).all()
+    ))
+
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
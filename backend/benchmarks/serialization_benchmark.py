@@ -0,0 +1,122 @@
+"""
+Serialization micro-benchmark on a 300-lesson course.
+
+Compares the encoding paths a large course payload can take:
+  - FastAPI's generic path: model -> dict -> jsonable_encoder -> json.dumps
+  - pydantic-core dumping ORM rows straight to bytes (orm_to_json)
+  - hand-built nested dicts via jsonable_encoder, json and orjson
+and reports what gzip does to the result.
+
+    python benchmarks/serialization_benchmark.py --modules 10 --lessons 30
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# Nothing here touches the database, but importing the models builds an engine
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.core.serialization import dumps, orm_to_json  # noqa: E402
+from app.models.models import Course, DifficultyLevel, Module, Quiz, Topic  # noqa: E402
+from app.schemas.course import CourseResponse  # noqa: E402
+
+PARAGRAPH = "A gradient points uphill, so training steps the other way, scaled by the learning rate. " * 20
+
+
+def build_course(modules: int, lessons: int) -> Course:
+    """A transient ORM tree; nothing touches the database."""
+    course = Course(
+        id=1, title="Benchmark course", description="d" * 500, difficulty=DifficultyLevel.STARTER,
+        source_type="text", status="ready", created_at=datetime.now(timezone.utc)
+    )
+    lesson_id = 0
+    for m in range(modules):
+        module = Module(id=m + 1, order=m, title=f"Module {m}", description="Module description")
+        for t in range(lessons):
+            lesson_id += 1
+            topic = Topic(
+                id=lesson_id, order=t, title=f"Lesson {t}",
+                beginner_content=PARAGRAPH, intermediate_content=PARAGRAPH, expert_content=PARAGRAPH,
+                examples=["Example " * 20] * 3, analogies=["Analogy " * 20] * 2, summary="Summary " * 10
+            )
+            topic.quizzes = [
+                Quiz(id=lesson_id * 10 + q, question="Which way does the step go?",
+                     options=["Up", "Down", "Sideways", "Nowhere"], correct_answer=1,
+                     explanation="Against the gradient.", difficulty="medium")
+                for q in range(3)
+            ]
+            module.topics.append(topic)
+        course.modules.append(module)
+    return course
+
+
+def hand_built_tree(course: Course) -> dict:
+    """The nested-dict shape of a hand-built course tree."""
+    return {
+        "id": course.id,
+        "title": course.title,
+        "description": course.description,
+        "created_at": course.created_at,
+        "modules": [{
+            "id": m.id, "title": m.title, "description": m.description, "order": m.order,
+            "lessons": [{
+                "id": t.id, "title": t.title, "order": t.order,
+                "beginner_content": t.beginner_content,
+                "intermediate_content": t.intermediate_content,
+                "expert_content": t.expert_content,
+                "examples": t.examples, "analogies": t.analogies, "summary": t.summary,
+                "quizzes": [{
+                    "id": q.id, "question": q.question, "options": q.options,
+                    "correct_answer": q.correct_answer, "explanation": q.explanation
+                } for q in t.quizzes]
+            } for t in m.topics]
+        } for m in course.modules]
+    }
+
+
+def bench(label: str, fn, rounds: int):
+    fn()  # warm up
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<48} median={statistics.median(timings):8.2f} ms  p95={sorted(timings)[int(rounds * 0.95) - 1]:8.2f} ms  size={len(body) / 1024:8.1f} KiB")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--lessons", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    course = build_course(args.modules, args.lessons)
+    print(f"{args.modules * args.lessons}-lesson course")
+
+    print("CourseResponse (response_model routes)")
+    bench("validate -> jsonable_encoder -> json.dumps", lambda: json.dumps(
+        jsonable_encoder(CourseResponse.model_validate(course).model_dump(mode="json"))).encode(), args.rounds)
+    body = bench("orm_to_json (pydantic-core, ORM -> bytes)", lambda: orm_to_json(CourseResponse, course), args.rounds)
+
+    print("Hand-built dict")
+    bench("build + jsonable_encoder + json.dumps", lambda: json.dumps(jsonable_encoder(hand_built_tree(course))).encode(), args.rounds)
+    bench("build + json.dumps", lambda: json.dumps(hand_built_tree(course), default=str).encode(), args.rounds)
+    bench("build + dumps (orjson)", lambda: dumps(hand_built_tree(course)), args.rounds)
+
+    print("Compression of the CourseResponse body")
+    for level in (1, 6):
+        bench(f"gzip level {level}", lambda: gzip.compress(body, compresslevel=level), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Cold-start benchmark: import time and resident memory of an API worker.
+
+Imports the given module (the API app by default) in fresh interpreters and
+reports wall time, peak RSS, the slowest top-level imports (from
+python -X importtime) and which heavy optional libraries got loaded.
+Track it across commits to catch an eager import sneaking back in.
+
+    python benchmarks/startup_benchmark.py --runs 5
+    python benchmarks/startup_benchmark.py --module app.workers.media
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that should only load on first use (or only in the media worker)
+HEAVY_MODULES = (
+    "google.generativeai", "grpc", "fitz", "reportlab", "qrcode", "PIL", "bs4",
+    "youtube_transcript_api", "pdfplumber", "pytesseract", "whisper", "torch", "celery",
+)
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def probe(module: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module: str, env: dict, top: int) -> list:
+    """(cumulative microseconds, name) for the slowest direct imports of `module`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Two spaces of indentation = imported directly by the probed module
+        if name.startswith("   ") and not name.startswith("    "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Import only; no database is contacted beyond create_all on a throwaway file
+    env.setdefault("DATABASE_URL", "sqlite://")
+
+    results = [probe(args.module, env) for _ in range(args.runs)]
+    seconds = [r["seconds"] for r in results]
+    rss = [r["max_rss_mb"] for r in results]
+    print(f"import {args.module}: median={statistics.median(seconds) * 1000:.0f} ms  "
+          f"min={min(seconds) * 1000:.0f} ms  over {args.runs} runs")
+    print(f"peak RSS: median={statistics.median(rss):.1f} MB  modules loaded: {results[0]['modules']}")
+    print(f"heavy libraries loaded: {', '.join(results[0]['heavy']) or 'none'}")
+
+    print(f"\nslowest direct imports of {args.module}:")
+    for cumulative, name in slowest_imports(args.module, env, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
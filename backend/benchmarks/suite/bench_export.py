@@ -0,0 +1,42 @@
+"""Export rendering (notes, summary, flashcards, Anki) over a 300-lesson course."""
+from collections import namedtuple
+
+from app.services import exporter
+
+LessonRow = namedtuple("LessonRow", [
+    "module_id", "module_title", "module_description", "lesson_title", "summary",
+    "beginner_content", "intermediate_content", "expert_content", "examples",
+])
+CardRow = namedtuple("CardRow", ["front", "back"])
+
+PARAGRAPH = "A gradient points uphill, so training steps the other way, scaled by the learning rate. " * 20
+LESSONS = [
+    LessonRow(m, f"Module {m}", "Module description", f"Lesson {m}.{t}", "Summary " * 10,
+              PARAGRAPH, PARAGRAPH, PARAGRAPH, ["Example " * 20] * 3)
+    for m in range(10) for t in range(30)
+]
+CARDS = [CardRow(f"What is concept {i}?", f"Concept {i}, explained in a sentence or two. " * 3) for i in range(2000)]
+
+
+def _drain(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+def bench_export_notes(benchmark):
+    benchmark(lambda: _drain(exporter.notes_chunks("Benchmark course", "Description", iter(LESSONS))))
+
+
+def bench_export_summary(benchmark):
+    benchmark(lambda: _drain(exporter.summary_chunks("Benchmark course", "Description", iter(LESSONS))))
+
+
+def bench_export_flashcards_json(benchmark):
+    benchmark(lambda: _drain(exporter.flashcards_json_chunks(iter(CARDS))))
+
+
+def bench_export_flashcards_csv(benchmark):
+    benchmark(lambda: _drain(exporter.flashcards_csv_chunks(iter(CARDS))))
+
+
+def bench_export_flashcards_apkg(benchmark):
+    benchmark.pedantic(lambda: _drain(exporter.apkg_chunks("Benchmark course", iter(CARDS))), rounds=5, iterations=1)
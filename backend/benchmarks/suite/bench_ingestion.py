@@ -0,0 +1,50 @@
+"""Source ingestion: PDF text extraction and web page scraping on saved HTML."""
+import io
+from types import SimpleNamespace
+
+import pytest
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app.services import ingestion_service as ingestion
+from app.services.ingestion_service import IngestionService
+
+SENTENCE = "Backpropagation applies the chain rule layer by layer to compute gradients efficiently."
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes() -> bytes:
+    """A 40-page text PDF, rendered once."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    for page in range(40):
+        for line in range(50):
+            c.drawString(40, 800 - line * 15, f"{page}.{line} {SENTENCE}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def saved_page() -> str:
+    """A large article page with the usual navigation, scripts and styles around it."""
+    body = "\n".join(f"<h2>Section {i}</h2><p>{SENTENCE}  {SENTENCE}</p><ul><li>{SENTENCE}</li></ul>" for i in range(400))
+    return (
+        "<html><head><style>body { font-family: sans-serif; }</style>"
+        "<script>window.analytics = {track: function () {}};</script></head>"
+        f"<body><nav><a href='/'>Home</a> <a href='/blog'>Blog</a></nav><article>{body}</article>"
+        "<footer>Copyright</footer></body></html>"
+    )
+
+
+def bench_extract_text_from_pdf(benchmark, pdf_bytes):
+    text = benchmark(IngestionService.extract_text_from_pdf, pdf_bytes)
+    assert SENTENCE[:20] in text
+
+
+def bench_scrape_web_page(benchmark, saved_page, monkeypatch):
+    # Serve the saved page instead of going to the network
+    response = SimpleNamespace(text=saved_page, raise_for_status=lambda: None)
+    monkeypatch.setattr(ingestion.requests, "get", lambda url, timeout=10: response)
+    text = benchmark(IngestionService.scrape_web_page, "https://example.com/article")
+    assert "Section 399" in text
@@ -0,0 +1,35 @@
+"""Agent output parsing: plain JSON, LLM-mangled JSON and schema validation."""
+import json
+
+from pydantic import TypeAdapter
+
+from app.core.json_parser import loads_tolerant
+from app.core.structured import _parse
+from app.schemas.agent import QuizSet, Syllabus
+
+from conftest import make_syllabus
+
+SYLLABUS = json.dumps(make_syllabus(6, 5))
+# What models actually send back: a code fence, chatter, trailing commas
+MANGLED = "Sure! Here is the course:\n```json\n" + SYLLABUS.replace("}]", "},]") + "\n```\nLet me know!"
+QUIZZES = json.dumps({"quizzes": [{
+    "question": f"Question {i}?", "options": ["A", "B", "C", "D"], "correct_answer": i % 4, "explanation": "Because."
+} for i in range(10)]})
+
+
+def bench_loads_tolerant_clean(benchmark):
+    benchmark(loads_tolerant, SYLLABUS)
+
+
+def bench_loads_tolerant_repair(benchmark):
+    benchmark(loads_tolerant, MANGLED)
+
+
+def bench_parse_and_validate_syllabus(benchmark):
+    adapter = TypeAdapter(Syllabus)
+    benchmark(_parse, SYLLABUS, adapter, "bench")
+
+
+def bench_parse_and_validate_quizzes(benchmark):
+    adapter = TypeAdapter(QuizSet)
+    benchmark(_parse, QUIZZES, adapter, "bench")
@@ -0,0 +1,74 @@
+"""Persistence hot paths: saving syllabi, loading course trees, the learning summary."""
+import pytest
+from sqlalchemy.orm import selectinload
+
+from app.api.endpoints.courses import save_course_to_db
+from app.api.endpoints.user import get_learning_summary
+from app.core.serialization import orm_to_json
+from app.models.models import Course, CourseProgress, Module, Topic, User
+from app.schemas.course import CourseResponse
+
+from conftest import make_syllabus
+
+
+@pytest.mark.parametrize("modules,lessons", [(3, 3), (12, 15)], ids=["small", "large"])
+def bench_save_course_to_db(benchmark, db, user_id, modules, lessons):
+    syllabus = make_syllabus(modules, lessons)
+    benchmark.pedantic(
+        save_course_to_db, args=(syllabus, "Benchmark", "starter", user_id, db),
+        rounds=5 if lessons > 3 else 20, iterations=1
+    )
+
+
+@pytest.fixture(scope="module")
+def large_course_id(user_id):
+    from app.core.database import SessionLocal
+    session = SessionLocal()
+    course = save_course_to_db(make_syllabus(12, 15), "Tree", "starter", user_id, session)
+    session.close()
+    return course.id
+
+
+def bench_load_course_tree(benchmark, db, large_course_id):
+    def load():
+        db.expire_all()
+        course = db.query(Course).options(
+            selectinload(Course.modules).selectinload(Module.topics).selectinload(Topic.quizzes)
+        ).filter(Course.id == large_course_id).one()
+        return orm_to_json(CourseResponse, course)
+
+    benchmark(load)
+
+
+@pytest.fixture(scope="module")
+def busy_learner():
+    """A learner with 200 courses of 5x4 topics and some progress in each."""
+    from app.core.database import SessionLocal
+    session = SessionLocal()
+    learner = User(email="busy@example.com", password_hash="x", name="Busy")
+    session.add(learner)
+    session.commit()
+    for i in range(200):
+        course = Course(title=f"Course {i}", owner_id=learner.id, status="completed" if i % 3 == 0 else "ready")
+        session.add(course)
+        session.flush()
+        topic_ids = []
+        for m in range(5):
+            module = Module(course_id=course.id, title=f"Module {m}", order=m)
+            session.add(module)
+            session.flush()
+            topics = [Topic(module_id=module.id, title=f"Topic {t}", order=t) for t in range(4)]
+            session.add_all(topics)
+            session.flush()
+            topic_ids += [t.id for t in topics]
+        session.add(CourseProgress(user_id=learner.id, course_id=course.id, completed_topic_ids=topic_ids[: i % 20]))
+    session.commit()
+    learner_id = learner.id
+    session.close()
+    return learner_id
+
+
+def bench_learning_summary_many_courses(benchmark, db, busy_learner):
+    learner = db.get(User, busy_learner)
+    result = benchmark(get_learning_summary, db=db, current_user=learner)
+    assert result["total_courses"] == 200
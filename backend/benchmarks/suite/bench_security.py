@@ -0,0 +1,16 @@
+"""Password hashing; bcrypt is deliberately slow, so watch for cost changes."""
+from app.core.security import create_access_token, get_password_hash, verify_password
+
+HASH = get_password_hash("correct horse battery staple")
+
+
+def bench_hash_password(benchmark):
+    benchmark.pedantic(get_password_hash, args=("correct horse battery staple",), rounds=5, iterations=1)
+
+
+def bench_verify_password(benchmark):
+    benchmark.pedantic(verify_password, args=("correct horse battery staple", HASH), rounds=5, iterations=1)
+
+
+def bench_create_access_token(benchmark):
+    benchmark(create_access_token, 42)
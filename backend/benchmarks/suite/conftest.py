@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the micro-benchmark suite (pip install -r requirements-dev.txt).
+Everything runs against a throwaway SQLite database; nothing calls the LLM.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+WORK_DIR = tempfile.mkdtemp(prefix="courseforge_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.models import User  # noqa: E402
+
+
+def make_syllabus(modules: int, lessons: int) -> dict:
+    return {
+        "title": f"Benchmark course {modules}x{lessons}",
+        "description": "A synthetic syllabus for benchmarking. " * 5,
+        "modules": [{
+            "title": f"Module {m}: foundations and practice",
+            "description": "What this module covers and why it matters.",
+            "lessons": [{
+                "title": f"Lesson {m}.{t}: gradients, losses and optimisers",
+                "summary": "One sentence that summarises the lesson for the outline.",
+            } for t in range(lessons)]
+        } for m in range(modules)]
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def user_id():
+    session = SessionLocal()
+    user = User(email="bench@example.com", password_hash="x", name="Bench")
+    session.add(user)
+    session.commit()
+    uid = user.id
+    session.close()
+    return uid
@@ -1,20 +1,30 @@
 from fastapi import FastAPI, Depends, HTTPException
-from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
-import os
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 
 from app.core.config import settings
-from app.core.database import engine, get_db, Base
+from app.core.database import engine, get_db, Base, SessionLocal
+from app.core import metrics
+from app.core.overload import LLMUnavailableError
 from app.models import models
-from app.api.endpoints import auth, courses, user
+from app.api.endpoints import auth, courses, export, progress, reviews, tutor, uploads, user
+from app.services.review_service import backfill_cards
 
 # Create all tables in the database
 try:
     Base.metadata.create_all(bind=engine)
 except Exception as e:
     print(f"Warning: Database connection failed. Ensure PostgreSQL is running. Error: {e}")
+else:
+    # Review cards for flashcards and quiz questions saved before spaced repetition
+    try:
+        with SessionLocal() as db:
+            backfill_cards(db)
+    except Exception as e:
+        print(f"Warning: Review card backfill failed, will retry on next start. Error: {e}")
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -33,26 +43,42 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["*"],
+    expose_headers=["X-Next-Cursor"],
     allow_headers=["*"],
 )
 
-# Include routers - Preferred 'app' structure
+# Compress large payloads (course trees, topic content). Starlette's gzip
+# middleware leaves server-sent event streams alone, so topic streaming still
+# flushes token by token.
+app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Latency, DB and LLM metrics, scraped from /metrics. Added last so it sits
+# outermost and also times compression.
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(courses.router, prefix="/api/courses", tags=["courses"])
 app.include_router(user.router, prefix="/api/user", tags=["user"])
 
-# Include legacy routers if they exist (based on structure analysis)
-try:
-    from app.api.endpoints import uploads, tutor, progress
-    app.include_router(uploads.router, prefix="/api/v1", tags=["uploads"])
-    app.include_router(tutor.router, prefix="/api/v1", tags=["tutor"])
-    app.include_router(progress.router, prefix="/api/v1", tags=["progress"])
-    
-    # Mount uploads directory for static file access
-    os.makedirs("uploads", exist_ok=True)
-    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-except ImportError:
-    print("Warning: Some discovery-based routers could not be imported. Skipping legacy prefixes.")
+# Upload, tutor, progress and export, formerly a separate app with its own
+# engine and models; now served from the same engine, pool and sessions
+app.include_router(uploads.router, prefix="/api/v1", tags=["uploads"])
+app.include_router(tutor.router, prefix="/api/v1", tags=["tutor"])
+app.include_router(progress.router, prefix="/api/v1", tags=["progress"])
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
+app.include_router(reviews.router, prefix="/api/v1", tags=["reviews"])
+
+@app.exception_handler(LLMUnavailableError)
+def llm_unavailable(request, exc: LLMUnavailableError):
+    """The LLM is shedding load or its breaker is open: tell clients when to come back."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 @app.get("/")
 def read_root():
@@ -71,9 +97,12 @@ def health_check(db: Session = Depends(get_db)):
         # Fallback for when DB is not connected but API is alive
         return {"status": "partially_healthy", "database": "disconnected", "error": str(e)}
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """Prometheus text exposition of this process's metrics."""
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 # This block allows you to run the server by simply executing `python main.py`
 if __name__ == "__main__":
     import uvicorn
-    # Create uploads directory if it doesn't exist
-    os.makedirs("uploads", exist_ok=True)
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
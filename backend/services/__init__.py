@@ -1,7 +0,0 @@
-# Services package
-
-
-
-
-
-
@@ -0,0 +1,117 @@
+"""
+Shared fixtures for the unit tests (pip install -r requirements-dev.txt).
+Run from backend/ with
+
+    python -m pytest tests
+
+Everything runs against a throwaway SQLite database and the offline LLM
+stand-in (app.core.fake_llm); nothing calls Gemini.
+"""
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+WORK_DIR = tempfile.mkdtemp(prefix="courseforge_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'tests.db')}"
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["FAKE_LLM_LATENCY_DISTRIBUTION"] = "fixed"
+os.environ["FAKE_LLM_LATENCY_MS"] = "1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.models import Course, Flashcard, Module, Quiz, Topic, User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+
+_user_numbers = itertools.count(1)
+
+
+@pytest.fixture
+def make_user(db):
+    def make() -> User:
+        # Numbered for the whole run: the database outlives each test
+        user = User(email=f"user-{next(_user_numbers)}@example.com", password_hash="x", name="Tester")
+        db.add(user)
+        db.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def make_course(db):
+    """A course of `modules` x `topics`, each topic with `quizzes` questions and `flashcards` cards."""
+    def make(owner: User, modules: int = 2, topics: int = 2, quizzes: int = 0, flashcards: int = 0) -> Course:
+        course = Course(title="Test course", owner_id=owner.id, module_count=modules, topic_count=modules * topics)
+        db.add(course)
+        db.flush()
+        for m in range(modules):
+            module = Module(course_id=course.id, order=m, title=f"Module {m + 1}")
+            db.add(module)
+            db.flush()
+            for t in range(topics):
+                topic = Topic(module_id=module.id, order=t, title=f"Topic {m + 1}.{t + 1}")
+                db.add(topic)
+                db.flush()
+                db.add_all([
+                    Quiz(topic_id=topic.id, question=f"Q{q}", options=["a", "b"], correct_answer=0, explanation="")
+                    for q in range(quizzes)
+                ])
+                db.add_all([
+                    Flashcard(course_id=course.id, topic_id=topic.id, front=f"F{f}", back="B")
+                    for f in range(flashcards)
+                ])
+        db.commit()
+        return course
+    return make
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Fresh model routing state: no stats, breakers closed, full hedge budget."""
+    from app.core import model_router
+    from app.core.config import settings
+
+    monkeypatch.setattr(model_router, "_stats", {})
+    monkeypatch.setattr(model_router, "_hedge_credit", float(settings.LLM_HEDGE_BURST))
+    return model_router
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(router, monkeypatch):
+    """Breakers and cool-downs read this clock instead of time.monotonic; move it with advance()."""
+    from app.core import overload
+
+    fake = FakeClock()
+    monkeypatch.setattr(router, "time", fake)
+    monkeypatch.setattr(overload, "time", fake)
+    return fake
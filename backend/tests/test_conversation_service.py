@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.models.models import MentorConversation
+from app.services import conversation_service
+from app.services.conversation_service import append_message, compact_conversation, get_or_create_conversation, get_prompt_history
+
+
+@pytest.fixture
+def conversation(db, make_user, make_course):
+    user = make_user()
+    return get_or_create_conversation(db, user.id, make_course(user).id)
+
+
+def _chat(db, conversation, turns: int, start: int = 0):
+    for i in range(start, start + turns):
+        append_message(db, conversation, "user", f"q{i}")
+        append_message(db, conversation, "assistant", f"a{i}")
+    db.commit()
+
+
+def test_history_sends_every_unsummarized_message(db, conversation):
+    turns = settings.MENTOR_HISTORY_TURNS + settings.MENTOR_SUMMARY_BATCH_TURNS - 1
+    _chat(db, conversation, turns)
+
+    summary, history = get_prompt_history(db, conversation)
+
+    # Below the compaction threshold nothing is summarised, so nothing may be dropped
+    assert summary == ""
+    assert [m["content"] for m in history[:2]] == ["q0", "a0"]
+    assert len(history) == turns * 2
+
+
+def test_compaction_leaves_no_gap(db, conversation, monkeypatch):
+    folded = []
+    monkeypatch.setattr(conversation_service, "summarize_conversation",
+                        lambda summary, messages: folded.extend(m["content"] for m in messages) or "summary")
+    monkeypatch.setattr(conversation_service, "SessionLocal", lambda: db)
+    monkeypatch.setattr(db, "close", lambda: None)
+    turns = settings.MENTOR_HISTORY_TURNS + settings.MENTOR_SUMMARY_BATCH_TURNS
+    _chat(db, conversation, turns)
+
+    compact_conversation(conversation.id)
+    db.refresh(conversation)
+    summary, history = get_prompt_history(db, conversation)
+
+    assert summary == "summary"
+    assert len(history) == settings.MENTOR_HISTORY_TURNS * 2
+    # Every message is either in the summary or sent verbatim
+    assert folded + [m["content"] for m in history] == [c for i in range(turns) for c in (f"q{i}", f"a{i}")]
+
+
+def test_one_conversation_per_user_and_course(db, conversation):
+    assert get_or_create_conversation(db, conversation.user_id, conversation.course_id).id == conversation.id
+
+    db.add(MentorConversation(user_id=conversation.user_id, course_id=conversation.course_id))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+
+def test_racing_first_turn_reuses_the_winner(db, make_user, make_course, monkeypatch):
+    user = make_user()
+    course = make_course(user)
+    winner = MentorConversation(user_id=user.id, course_id=course.id, summary="", summarized_message_id=0)
+    commit = db.commit
+
+    def lose_race():
+        # The other request commits its conversation just before this one
+        monkeypatch.setattr(db, "commit", commit)
+        pending = [o for o in db.new if isinstance(o, MentorConversation)]
+        db.expunge(pending[0])
+        db.add(winner)
+        commit()
+        db.add(pending[0])
+        commit()
+    monkeypatch.setattr(db, "commit", lose_race)
+
+    assert get_or_create_conversation(db, user.id, course.id).id == winner.id
+    assert db.query(MentorConversation).filter(MentorConversation.course_id == course.id).count() == 1
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import curriculum_agent
+from app.core.config import settings
+from app.core.prompt import count_tokens
+from app.services.ingestion_service import IngestionService
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Prompts sent for a syllabus; the model is never called."""
+    sent = []
+
+    def invoke_structured(prompt, **kwargs):
+        sent.append(prompt)
+        return SimpleNamespace(model_dump=lambda: {"title": "", "description": "", "modules": []})
+    monkeypatch.setattr(curriculum_agent, "invoke_structured", invoke_structured)
+    return sent
+
+
+def _playlist(videos: int, minutes: int) -> str:
+    """Context for a playlist of `videos` transcripts, a line every 5 s."""
+    sources = [{
+        "video_id": f"video{i:06d}",
+        "error": None,
+        "segments": [
+            {"start": s, "text": f"In video {i} at second {s} the speaker explains one more detail of the topic at hand."}
+            for s in range(0, minutes * 60, 5)
+        ],
+    } for i in range(videos)]
+    return IngestionService().build_multi_source_context(sources)
+
+
+def test_playlist_keeps_every_video(prompts, monkeypatch):
+    monkeypatch.setattr(settings, "SYLLABUS_PROMPT_TOKEN_BUDGET", 8000)
+    context = _playlist(8, 10)
+    assert count_tokens(context) > 3 * 8000
+
+    curriculum_agent.generate_course_syllabus("Playlist", context_text=context)
+
+    prompt, = prompts
+    assert count_tokens(prompt) <= 8000
+    for i in range(8):
+        assert f"### Source {i + 1}: https://youtu.be/video{i:06d}?t=0" in prompt
+        assert f"In video {i} at second 0 " in prompt
+        assert f"In video {i} at second 60 " in prompt
+
+
+def test_long_document_is_sampled_throughout(prompts, monkeypatch):
+    monkeypatch.setattr(settings, "SYLLABUS_PROMPT_TOKEN_BUDGET", 4000)
+    pages = [f"This sentence is from page {p}. " * 150 for p in range(40)]
+
+    curriculum_agent.generate_course_syllabus("Book", context_text="\n".join(pages))
+
+    prompt, = prompts
+    assert count_tokens(prompt) <= 4000
+    kept = {p for p in range(40) if f"from page {p}." in prompt}
+    # Something from every eighth of the book, not just its first pages
+    for eighth in range(8):
+        assert kept & set(range(eighth * 5, eighth * 5 + 5))
+
+
+def test_short_source_is_sent_whole(prompts):
+    context = _playlist(2, 1)
+
+    curriculum_agent.generate_course_syllabus("Short", context_text=context)
+
+    assert context in prompts[0]
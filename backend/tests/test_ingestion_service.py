@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from app.core.cache import transcript_cache
+from app.services.ingestion_service import IngestionService, video_link
+
+SEGMENTS = [
+    {"start": 0.0, "duration": 4.0, "text": "Welcome to the course."},
+    {"start": 12.5, "duration": 5.0, "text": "  Today: gradients.  "},
+    {"start": 20.0, "duration": 3.0, "text": "   "},
+    {"start": 45.0, "duration": 6.0, "text": "Now the chain rule."},
+    {"start": 3725.0, "duration": 6.0, "text": "Wrapping up."},
+]
+
+
+class StubProvider:
+    """Returns canned segments and records which videos were fetched, and when."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+
+    def __call__(self, video_id):
+        with self.lock:
+            self.calls.append((video_id, time.monotonic()))
+        if video_id in self.fail:
+            raise RuntimeError("Transcripts are disabled")
+        return SEGMENTS
+
+
+@pytest.fixture(autouse=True)
+def empty_transcript_cache():
+    transcript_cache.cache.clear()
+    yield
+    transcript_cache.cache.clear()
+
+
+def test_transcript_is_fetched_once_then_served_from_cache():
+    provider = StubProvider()
+    service = IngestionService(transcript_provider=provider, requests_per_second=1000)
+
+    first = service.fetch_transcript_segments("abcdefghijk")
+    second = service.fetch_transcript_segments("abcdefghijk")
+
+    assert [video_id for video_id, _ in provider.calls] == ["abcdefghijk"]
+    assert second == first
+    # Blank segments are dropped and text is stripped
+    assert [s["text"] for s in first] == ["Welcome to the course.", "Today: gradients.", "Now the chain rule.", "Wrapping up."]
+
+
+def test_cache_is_shared_across_url_forms():
+    provider = StubProvider()
+    service = IngestionService(transcript_provider=provider, requests_per_second=1000)
+
+    service.extract_youtube_transcript("https://www.youtube.com/watch?v=abcdefghijk")
+    service.extract_youtube_transcript("https://youtu.be/abcdefghijk")
+
+    assert len(provider.calls) == 1
+
+
+def test_timestamps_are_kept_per_block():
+    service = IngestionService(transcript_provider=StubProvider(), requests_per_second=1000)
+
+    text = service.extract_youtube_transcript("abcdefghijk", with_timestamps=True)
+
+    assert text.splitlines() == [
+        "[00:00] Welcome to the course. Today: gradients.",
+        "[00:45] Now the chain rule.",
+        "[1:02:05] Wrapping up.",
+    ]
+
+
+def test_batch_context_links_every_block_to_its_offset():
+    service = IngestionService(transcript_provider=StubProvider(fail={"zzzzzzzzzzz"}), requests_per_second=1000)
+
+    sources = service.ingest_youtube_batch(["https://youtu.be/abcdefghijk", "not a url", "zzzzzzzzzzz"])
+    context = service.build_multi_source_context(sources)
+
+    assert [s["video_id"] for s in sources] == ["abcdefghijk", None, "zzzzzzzzzzz"]
+    assert sources[1]["error"] == "Invalid YouTube URL"
+    assert "Transcripts are disabled" in sources[2]["error"]
+    assert context.splitlines() == [
+        f"### Source 1: {video_link('abcdefghijk')}",
+        f"[{video_link('abcdefghijk', 0)}] Welcome to the course. Today: gradients.",
+        f"[{video_link('abcdefghijk', 45)}] Now the chain rule.",
+        f"[{video_link('abcdefghijk', 3725)}] Wrapping up.",
+    ]
+
+
+def test_batch_is_paced_by_the_rate_limiter():
+    provider = StubProvider()
+    # Burst equals the concurrency (2), then one fetch per 1/20 s
+    service = IngestionService(transcript_provider=provider, max_concurrency=2, requests_per_second=20)
+    urls = [f"video{i:06d}" for i in range(6)]
+
+    results = service.ingest_youtube_batch(urls)
+
+    assert [r["video_id"] for r in results] == urls
+    assert all(r["error"] is None for r in results)
+    starts = sorted(at for _, at in provider.calls)
+    # Two fetches ride the burst, the other four wait about 50 ms each
+    assert starts[-1] - starts[0] >= 4 / 20 * 0.9
+
+
+def test_duplicate_videos_in_a_batch_hit_the_cache():
+    provider = StubProvider()
+    service = IngestionService(transcript_provider=provider, max_concurrency=1, requests_per_second=1000)
+
+    service.ingest_youtube_batch(["abcdefghijk", "https://youtu.be/abcdefghijk", "abcdefghijk"])
+
+    assert len(provider.calls) == 1
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core import llm
+from app.core.config import settings
+from app.core.metrics import llm_hedges, llm_hedges_skipped
+
+
+@pytest.fixture
+def slow_llm(router, monkeypatch):
+    """Every fake call takes 100 ms and the primary's p95 is already known to be 100 ms."""
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MS", 100)
+    monkeypatch.setattr(settings, "LLM_ROUTES", {"default": ["model-a", "model-b"]})
+    monkeypatch.setattr(settings, "LLM_PRIORITY_CAPACITY", {"normal": 1.0})
+    for _ in range(settings.LLM_HEDGE_MIN_SAMPLES):
+        router.record("model-a", "success", 0.1)
+    yield
+    llm.configure_rate_limit(settings.LLM_REQUESTS_PER_SECOND, settings.LLM_REQUESTS_BURST)
+
+
+def _hedges(agent: str) -> float:
+    return sum(v for labels, v in llm_hedges.values.items() if labels[0] == agent)
+
+
+def _burst(agent: str, calls: int):
+    with ThreadPoolExecutor(max_workers=calls) as callers:
+        list(callers.map(lambda _: llm.invoke_with_retry("hi", agent=agent), range(calls)))
+
+
+def test_pool_takes_every_admitted_call():
+    assert llm._HEDGE_POOL_SIZE > settings.LLM_MAX_IN_FLIGHT
+
+
+def test_burst_is_hedged_within_budget(slow_llm):
+    _burst("hedge-burst", 60)
+
+    assert _hedges("hedge-burst") <= settings.LLM_HEDGE_BURST + 60 * settings.LLM_HEDGE_BUDGET
+    assert llm_hedges_skipped.values.get(("hedge-burst", "saturated"), 0) == 0
+
+
+def test_deadline_starts_when_the_request_is_sent(slow_llm, monkeypatch):
+    # The limiter holds the last calls back ~0.4 s, far past the 0.1 s deadline
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MS", 20)
+    monkeypatch.setattr(settings, "LLM_HEDGE_BUDGET", 1.0)
+    llm.configure_rate_limit(10, burst=1)
+
+    _burst("hedge-queued", 5)
+
+    assert _hedges("hedge-queued") == 0
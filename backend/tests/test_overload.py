@@ -0,0 +1,127 @@
+import pytest
+
+from app.core import llm
+from app.core.config import settings
+from app.core.metrics import llm_failovers, llm_shed
+from app.core.overload import CLOSED, HALF_OPEN, OPEN, Admission, LLMUnavailableError
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ROUTES", {"default": ["model-a", "model-b"], "podcast": ["model-a", "model-b"]})
+    monkeypatch.setattr(settings, "LLM_HEDGING_ENABLED", False)
+
+
+def _trip(router, model: str):
+    for _ in range(settings.LLM_BREAKER_MIN_CALLS):
+        assert router.begin(model)
+        router.record(model, "error", 0.1)
+
+
+def _breaker(router, model: str):
+    return router._model(model).breaker
+
+
+def test_breaker_opens_probes_and_closes(clock, router):
+    for _ in range(settings.LLM_BREAKER_MIN_CALLS - 1):
+        router.record("model-a", "error", 0.1)
+    assert _breaker(router, "model-a").state == CLOSED
+
+    router.record("model-a", "error", 0.1)
+    assert _breaker(router, "model-a").state == OPEN
+    assert router.available(["model-a", "model-b"]) == ["model-b"]
+    assert router.seconds_until_available(["model-a"]) == settings.LLM_BREAKER_OPEN_SECONDS
+
+    clock.advance(settings.LLM_BREAKER_OPEN_SECONDS)
+    assert router.available(["model-a"]) == ["model-a"]
+    assert router.begin("model-a")
+    assert _breaker(router, "model-a").state == HALF_OPEN
+    # Only one probe at a time
+    assert not router.begin("model-a")
+    assert router.available(["model-a"]) == []
+
+    router.record("model-a", "success", 0.1)
+    assert _breaker(router, "model-a").state == CLOSED
+    assert router.begin("model-a") and router.begin("model-a")
+
+
+def test_failed_probe_reopens(clock, router):
+    _trip(router, "model-a")
+    clock.advance(settings.LLM_BREAKER_OPEN_SECONDS)
+    assert router.begin("model-a")
+
+    router.record("model-a", "error", 0.1)
+
+    assert _breaker(router, "model-a").state == OPEN
+    assert router.seconds_until_available(["model-a"]) == settings.LLM_BREAKER_OPEN_SECONDS
+
+
+def test_stale_probe_is_reclaimed(clock, router):
+    _trip(router, "model-a")
+    clock.advance(settings.LLM_BREAKER_OPEN_SECONDS)
+    assert router.begin("model-a")  # a probe that never reports back
+
+    clock.advance(settings.LLM_BREAKER_OPEN_SECONDS - 1)
+    assert router.available(["model-a"]) == []
+
+    clock.advance(1)
+    assert router.available(["model-a"]) == ["model-a"]
+    assert router.degraded(["model-a"]) is None
+    assert router.begin("model-a")
+
+
+def test_closed_stream_releases_probe(clock, router, routes):
+    _trip(router, "model-a")
+    clock.advance(settings.LLM_BREAKER_OPEN_SECONDS)
+
+    stream = llm.stream_with_retry("hi")
+    assert next(stream)
+    assert _breaker(router, "model-a").probe_started is not None
+    stream.close()
+
+    assert _breaker(router, "model-a").state == HALF_OPEN
+    assert router.available(["model-a"]) == ["model-a"]
+
+
+def test_rate_limited_primary_fails_over(clock, router, routes, monkeypatch):
+    monkeypatch.setattr(settings, "FAKE_LLM_RATE_LIMIT_RATE_BY_MODEL", {"model-a": 1.0})
+    before = llm_failovers.values.get(("default", "model-b"), 0)
+
+    assert llm.invoke_with_retry("hi")
+
+    assert llm_failovers.values.get(("default", "model-b"), 0) == before + 1
+    # model-a cools down for the delay the 429 asked for, and is skipped meanwhile
+    assert router.available(["model-a", "model-b"]) == ["model-b"]
+    clock.advance(3)
+    assert router.available(["model-a", "model-b"]) == ["model-a", "model-b"]
+
+
+def test_low_priority_is_shed_while_primary_is_out(clock, router, routes):
+    _trip(router, "model-a")
+    before = llm_shed.values.get(("podcast", "degraded"), 0)
+
+    with pytest.raises(LLMUnavailableError) as refused:
+        llm.invoke_with_retry("hi", agent="podcast")
+
+    assert refused.value.retry_after == settings.LLM_BREAKER_OPEN_SECONDS
+    assert llm_shed.values.get(("podcast", "degraded"), 0) == before + 1
+    # Higher priorities keep going on the fallback
+    assert llm.invoke_with_retry("hi", agent="default")
+
+
+def test_capacity_is_shared_by_priority():
+    admission = Admission()
+    admission.in_flight = int(settings.LLM_MAX_IN_FLIGHT * settings.LLM_PRIORITY_CAPACITY["low"])
+
+    with pytest.raises(LLMUnavailableError):
+        with admission.admit("podcast"):
+            pass
+    with admission.admit("topic"), admission.admit("tutor"):
+        assert admission.in_flight == settings.LLM_MAX_IN_FLIGHT * settings.LLM_PRIORITY_CAPACITY["low"] + 2
+
+    admission.in_flight = settings.LLM_MAX_IN_FLIGHT - 1
+    with pytest.raises(LLMUnavailableError):
+        with admission.admit("topic"):
+            pass
+    with admission.admit("tutor"):
+        pass
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.models.models import Flashcard, ReviewCard
+from app.services.review_service import backfill_cards, due_cards, sm2, submit_reviews
+
+NOW = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def _card(**state) -> ReviewCard:
+    return ReviewCard(**{"ease": 2.5, "interval_days": 0, "repetitions": 0, "lapses": 0, **state})
+
+
+def test_sm2_intervals_grow_one_six_then_by_ease():
+    card = _card()
+    steps = []
+    for day in range(3):
+        sm2(card, 5, NOW + timedelta(days=day))
+        steps.append((card.interval_days, round(card.ease, 2), card.repetitions))
+
+    assert steps == [(1, 2.6, 1), (6, 2.7, 2), (16, 2.8, 3)]  # 16 = round(6 * 2.7)
+    assert card.due_at == NOW + timedelta(days=2 + 16)
+    assert card.last_reviewed_at == NOW + timedelta(days=2)
+
+
+@pytest.mark.parametrize("grade, ease", [(5, 2.6), (4, 2.5), (3, 2.36), (2, 2.18), (0, 1.7)])
+def test_sm2_ease_by_grade(grade, ease):
+    card = _card()
+    sm2(card, grade, NOW)
+    assert card.ease == pytest.approx(ease)
+
+
+def test_sm2_ease_never_drops_below_floor():
+    card = _card(ease=1.4)
+    sm2(card, 3, NOW)
+    assert card.ease == settings.REVIEW_MIN_EASE
+    sm2(card, 0, NOW)
+    assert card.ease == settings.REVIEW_MIN_EASE
+
+
+def test_sm2_lapse_restarts_at_one_day():
+    card = _card(ease=2.8, interval_days=16, repetitions=3)
+
+    sm2(card, 2, NOW)
+
+    assert (card.interval_days, card.repetitions, card.lapses) == (1, 0, 1)
+    assert card.ease == pytest.approx(2.48)
+    assert card.due_at == NOW + timedelta(days=1)
+    sm2(card, 4, NOW + timedelta(days=1))
+    assert (card.interval_days, card.repetitions, card.lapses) == (1, 1, 1)
+
+
+def test_backfill_adds_only_missing_cards(db, make_user, make_course):
+    user = make_user()
+    course = make_course(user, modules=2, topics=1, quizzes=2, flashcards=1)
+    first_flashcard = db.query(Flashcard).filter(Flashcard.course_id == course.id).order_by(Flashcard.id).first()
+    # A card saved the normal way, so the owner already has one for the course
+    db.add(ReviewCard(user_id=user.id, course_id=course.id, flashcard_id=first_flashcard.id, due_at=NOW))
+    db.commit()
+
+    assert backfill_cards(db, course.id) == 2 + 4 - 1
+    assert backfill_cards(db) == 0
+    cards = db.query(ReviewCard).filter(ReviewCard.user_id == user.id, ReviewCard.course_id == course.id)
+    assert cards.count() == 6
+    assert {c.repetitions for c in cards} == {0}
+
+
+def test_backfill_retries_when_another_process_got_there_first(db, make_user, make_course, monkeypatch):
+    user = make_user()
+    course = make_course(user, modules=1, topics=1, flashcards=2)
+    commit, conflicts = db.commit, []
+
+    def racing_commit():
+        if not conflicts:
+            conflicts.append(True)
+            raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+        commit()
+    monkeypatch.setattr(db, "commit", racing_commit)
+
+    assert backfill_cards(db, course.id) == 2
+    assert conflicts == [True]
+
+
+def _due_in(db, user, course, offsets):
+    """Cards of the course due at NOW + offset hours, in card order; returns their ids."""
+    backfill_cards(db, course.id)
+    cards = db.query(ReviewCard).filter(ReviewCard.user_id == user.id, ReviewCard.course_id == course.id).order_by(ReviewCard.id).all()
+    for card, offset in zip(cards, offsets):
+        card.due_at = NOW + timedelta(hours=offset)
+    db.commit()
+    return [c.id for c in cards]
+
+
+def test_due_cards_are_most_overdue_first_across_courses(db, make_user, make_course):
+    user = make_user()
+    a = _due_in(db, user, make_course(user, modules=1, topics=1, flashcards=3), [-1, -5, 2])
+    b = _due_in(db, user, make_course(user, modules=1, topics=1, quizzes=3), [-3, -5, -2])
+
+    due = due_cards(db, user.id, limit=4, now=NOW)
+
+    # Ties on due_at go by card id
+    assert [c["card_id"] for c in due] == [a[1], b[1], b[0], b[2]]
+    assert [c["kind"] for c in due] == ["flashcard", "quiz", "quiz", "quiz"]
+    assert due_cards(db, user.id, limit=10, now=NOW)[-1]["card_id"] == a[0]
+    assert len(due_cards(db, user.id, limit=10, now=NOW)) == 5  # a[2] is not due yet
+    assert [c["card_id"] for c in due_cards(db, user.id, limit=10, course_id=due[0]["course_id"], now=NOW)] == [a[1], a[0]]
+    assert all(c["due_at"] <= NOW for c in due)
+
+
+def test_submit_reviews_applies_in_time_order_and_reports_unknown(db, make_user, make_course):
+    user, stranger = make_user(), make_user()
+    card_id, = _due_in(db, user, make_course(user, modules=1, topics=1, flashcards=1), [0])
+    strangers_card, = _due_in(db, stranger, make_course(stranger, modules=1, topics=1, flashcards=1), [0])
+    earlier, later = NOW - timedelta(hours=2), NOW - timedelta(hours=1)
+
+    result = submit_reviews(db, user.id, [
+        {"card_id": card_id, "grade": 5, "reviewed_at": later},
+        {"card_id": 10 ** 9, "grade": 5, "reviewed_at": None},
+        {"card_id": card_id, "grade": 5, "reviewed_at": earlier},
+        {"card_id": strangers_card, "grade": 1, "reviewed_at": None},
+    ])
+
+    assert result["unknown"] == sorted([strangers_card, 10 ** 9])
+    updated, = result["updated"]
+    assert (updated["card_id"], updated["repetitions"], updated["interval_days"]) == (card_id, 2, 6)
+    assert updated["due_at"] == later + timedelta(days=6)
+    untouched = db.get(ReviewCard, strangers_card)
+    assert (untouched.repetitions, untouched.lapses) == (0, 0)
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.models import CourseProgress, Topic
+from app.services.schedule_service import get_plan, pack
+
+TODAY = date(2026, 3, 2)
+REVIEW = 5
+
+
+@pytest.fixture(autouse=True)
+def schedule_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULE_REVIEW_INTERVALS", [1, 3, 7])
+    monkeypatch.setattr(settings, "SCHEDULE_REVIEW_MINUTES", REVIEW)
+    monkeypatch.setattr(settings, "SCHEDULE_DEFAULT_TOPIC_MINUTES", 20)
+
+
+def _topics(*minutes):
+    return [{"id": i + 1, "title": f"T{i + 1}", "minutes": m} for i, m in enumerate(minutes)]
+
+
+def _day(days, offset):
+    wanted = (TODAY + timedelta(days=offset)).isoformat()
+    return next((d for d in days if d["date"] == wanted), None)
+
+
+def _items(day):
+    return [(it["kind"], it["topic_id"]) for it in day["items"]]
+
+
+def test_topic_longer_than_a_day_gets_a_day_to_itself():
+    days = pack(_topics(90, 30), {}, TODAY, 60)
+
+    assert _items(days[0]) == [("study", 1)]
+    assert days[0]["minutes"] == 90
+    assert _items(_day(days, 1)) == [("review", 1), ("study", 2)]
+
+
+def test_long_topic_waits_for_a_day_without_reviews():
+    days = pack(_topics(30, 90), {}, TODAY, 60)
+
+    # Day 1 has topic 1's review, so the 90-minute topic moves to day 2
+    assert _items(_day(days, 1)) == [("review", 1)]
+    assert _items(_day(days, 2)) == [("study", 2)]
+
+
+def test_reviews_that_do_not_fit_are_carried_over():
+    yesterday = TODAY - timedelta(days=1)
+    studied = {1: yesterday, 2: yesterday, 3: yesterday}
+
+    days = pack(_topics(20, 20, 20), studied, TODAY, 2 * REVIEW)
+
+    assert _items(days[0]) == [("review", 1), ("review", 2)]
+    assert _items(_day(days, 1)) == [("review", 3)]
+    assert all(d["minutes"] <= 2 * REVIEW for d in days)
+
+
+def test_day_already_overspent_gets_nothing_more():
+    days = pack(_topics(30, 90, 20), {1: TODAY}, TODAY, 60, spent_today=90)
+
+    assert _day(days, 0) is None
+    assert _items(_day(days, 1)) == [("review", 1)]
+    assert _items(_day(days, 2)) == [("study", 2)]
+
+
+def test_unknown_study_dates_get_no_reviews():
+    days = pack(_topics(20, 20), {1: None}, TODAY, 60)
+
+    assert [_items(d) for d in days] == [[("study", 2)], [("review", 2)], [("review", 2)], [("review", 2)]]
+
+
+def test_completion_repacks_only_from_today(db, make_user, make_course):
+    user = make_user()
+    course = make_course(user, modules=1, topics=4)
+    first = get_plan(db, user.id, course.id, minutes_per_day=60, today=TODAY)
+    # Three 20-minute topics on day 1, the fourth with their reviews on day 2
+    assert [len(d["items"]) for d in first[:2]] == [3, 4]
+
+    topic_ids = [t.id for t in db.query(Topic.id).filter(Topic.module_id == course.modules[0].id).order_by(Topic.order)]
+    db.add(CourseProgress(user_id=user.id, course_id=course.id, completed_topic_ids=topic_ids[:1]))
+    db.commit()
+    tomorrow = TODAY + timedelta(days=1)
+    second = get_plan(db, user.id, course.id, today=tomorrow)
+
+    assert second[0] == first[0]
+    assert second[1]["date"] == tomorrow.isoformat()
+    assert second[1]["day"] == 2
+    # Topic 1 was planned for day 1 but completed on day 2; the rest are re-packed from there
+    studied = [it["topic_id"] for d in second[1:] for it in d["items"] if it["kind"] == "study"]
+    assert studied == topic_ids[1:]
+    assert get_plan(db, user.id, course.id, today=tomorrow) == second
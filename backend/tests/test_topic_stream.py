@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from app.api.endpoints import courses
+from app.core.config import settings
+from app.models.models import Module, Topic, TopicSection
+from app.services.topic_service import section_statuses
+
+
+@pytest.fixture
+def streamed_topic(db, make_user, make_course, monkeypatch):
+    """A fresh topic, with stream_topic returning its raw generator and stubbed agents."""
+    user = make_user()
+    course = make_course(user, modules=1, topics=1)
+    topic = db.query(Topic).join(Module).filter(Module.course_id == course.id).one()
+    monkeypatch.setattr(courses, "StreamingResponse", lambda content, **kwargs: content)
+    monkeypatch.setattr(courses, "stream_topic_level", lambda *args: iter(["First paragraph.\n\n", "Second."]))
+    return user, topic
+
+
+def _statuses(db, topic_id):
+    db.expire_all()
+    return section_statuses(db.get(Topic, topic_id))
+
+
+def _fake_sections(slow: set, started: threading.Event = None):
+    payloads = {
+        "extras": {"examples": ["e"], "analogies": ["a"]},
+        "quizzes": {"quizzes": []},
+        "flashcards": {"flashcards": []},
+    }
+
+    def generate(section, *args):
+        if section in slow:
+            if started:
+                started.set()
+            time.sleep(0.3)
+        return payloads[section]
+    return generate
+
+
+def test_full_stream_saves_every_section(db, streamed_topic, monkeypatch):
+    user, topic = streamed_topic
+    monkeypatch.setattr(courses, "generate_topic_section", _fake_sections(slow=set()))
+
+    events = list(courses.stream_topic(topic.id, "beginner", db, user))
+
+    assert events[-1].startswith("event: done")
+    assert _statuses(db, topic.id) == {
+        "beginner": "ready", "intermediate": "missing", "expert": "missing",
+        "extras": "ready", "quizzes": "ready", "flashcards": "ready",
+    }
+
+
+def test_disconnect_releases_claims_and_keeps_paid_work(db, streamed_topic, monkeypatch):
+    user, topic = streamed_topic
+    started = threading.Event()
+    # One worker: extras is running when the client leaves, quizzes and flashcards are queued
+    monkeypatch.setattr(settings, "TOPIC_SECTION_CONCURRENCY", 1)
+    monkeypatch.setattr(courses, "generate_topic_section", _fake_sections(slow={"extras"}, started=started))
+
+    stream = courses.stream_topic(topic.id, "beginner", db, user)
+    assert next(stream).startswith("event: delta")
+    assert started.wait(1)
+    stream.close()  # what the server does when the client disconnects
+
+    statuses = _statuses(db, topic.id)
+    assert statuses["beginner"] == "failed"
+    assert statuses["quizzes"] == statuses["flashcards"] == "failed"
+    assert statuses["extras"] == "generating"
+
+    # The running section is saved when it finishes, not left to go stale
+    deadline = time.monotonic() + 2
+    while _statuses(db, topic.id)["extras"] != "ready" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _statuses(db, topic.id)["extras"] == "ready"
+    errors = {r.section: r.error for r in db.query(TopicSection).filter(TopicSection.topic_id == topic.id)}
+    assert "disconnected" in errors["beginner"]
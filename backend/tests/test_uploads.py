@@ -0,0 +1,43 @@
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.api.endpoints import uploads
+from app.core.config import settings
+from app.services.media_service import MediaProcessingError
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _audio() -> UploadFile:
+    return UploadFile(io.BytesIO(b"ID3 fake audio"), filename="lecture.mp3", headers=Headers({"content-type": "audio/mpeg"}))
+
+
+def test_media_upload_is_deleted_after_extraction(upload_dir, monkeypatch):
+    seen = []
+
+    def extract(kind, path):
+        seen.append((kind, os.path.exists(path)))
+        return "transcript"
+    monkeypatch.setattr(uploads, "extract_media_text", extract)
+
+    assert uploads._file_text(_audio()) == ("transcript", "audio")
+    assert seen == [("audio", True)]
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_media_upload_is_deleted_when_extraction_fails(upload_dir, monkeypatch):
+    def extract(kind, path):
+        raise MediaProcessingError("no speech found")
+    monkeypatch.setattr(uploads, "extract_media_text", extract)
+
+    with pytest.raises(MediaProcessingError):
+        uploads._file_text(_audio())
+    assert list(upload_dir.iterdir()) == []
@@ -0,0 +1,31 @@
+from app.core.config import settings
+from app.models.models import ContentChunk, Topic
+from app.services import vector_index
+
+
+def test_topics_are_indexed_once_even_without_text(db, make_user, make_course, monkeypatch):
+    course = make_course(make_user(), modules=1, topics=3)
+    indexed = []
+    real_index_topic = vector_index.index_topic
+    monkeypatch.setattr(vector_index, "index_topic", lambda *a: indexed.append(a[1].id) or real_index_topic(*a))
+
+    vector_index.ensure_course_indexed(db, course.id)
+    vector_index.ensure_course_indexed(db, course.id)
+
+    # The topics have no text, so no chunks, but they are not re-indexed on every call
+    assert len(indexed) == 3
+    assert db.query(ContentChunk).filter(ContentChunk.course_id == course.id).count() == 0
+    assert all(t.indexed_version for t in db.query(Topic).filter(Topic.id.in_(indexed)))
+
+
+def test_course_index_cache_is_bounded(db, make_user, make_course, monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_INDEX_CACHE_COURSES", 2)
+    vector_index._course_indexes.clear()
+    owner = make_user()
+    first, second, third = (make_course(owner, modules=1, topics=1) for _ in range(3))
+
+    for course in (first, second, first, third):
+        vector_index.retrieve(db, course.id, "gradients")
+
+    # second was the least recently used when third came in
+    assert list(vector_index._course_indexes) == [first.id, third.id]
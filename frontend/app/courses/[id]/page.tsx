@@ -4,7 +4,7 @@ import { useState, useEffect } from 'react'
 import { useParams, useRouter } from 'next/navigation'
 import Link from 'next/link'
 import { ArrowLeft, BookOpen, CheckCircle, Circle, MessageSquare, Download } from 'lucide-react'
-import { getCourse, FullCourse, updateLessonProgress } from '@/lib/api'
+import { getCourse, FullCourse, updateTopicProgress } from '@/lib/api'
 import TutorChat from '@/components/TutorChat'
 import QuizComponent from '@/components/QuizComponent'
 import ExportMenu from '@/components/ExportMenu'
@@ -32,8 +32,8 @@ export default function CoursePage() {
       setCourse(data)
       if (data.modules.length > 0) {
         setSelectedModule(data.modules[0].id)
-        if (data.modules[0].lessons.length > 0) {
-          setSelectedLesson(data.modules[0].lessons[0].id)
+        if (data.modules[0].topics.length > 0) {
+          setSelectedLesson(data.modules[0].topics[0].id)
         }
       }
     } catch (error) {
@@ -45,7 +45,7 @@ export default function CoursePage() {
 
   const handleLessonComplete = async (lessonId: number) => {
     try {
-      await updateLessonProgress(courseId, lessonId, true)
+      await updateTopicProgress(courseId, lessonId, true)
       setCompletedLessons(new Set([...completedLessons, lessonId]))
     } catch (error) {
       console.error('Failed to update progress:', error)
@@ -77,7 +77,7 @@ export default function CoursePage() {
   }
 
   const currentModule = course.modules.find(m => m.id === selectedModule)
-  const currentLesson = currentModule?.lessons.find(l => l.id === selectedLesson)
+  const currentLesson = currentModule?.topics.find(l => l.id === selectedLesson)
 
   return (
     <main className="min-h-screen bg-gray-50">
@@ -108,8 +108,8 @@ export default function CoursePage() {
                     <button
                       onClick={() => {
                         setSelectedModule(module.id)
-                        if (module.lessons.length > 0) {
-                          setSelectedLesson(module.lessons[0].id)
+                        if (module.topics.length > 0) {
+                          setSelectedLesson(module.topics[0].id)
                         }
                       }}
                       className={`w-full text-left p-2 rounded ${
@@ -125,7 +125,7 @@ export default function CoursePage() {
                     </button>
                     {selectedModule === module.id && (
                       <div className="ml-4 mt-2 space-y-1">
-                        {module.lessons.map((lesson) => (
+                        {module.topics.map((lesson) => (
                           <button
                             key={lesson.id}
                             onClick={() => setSelectedLesson(lesson.id)}
@@ -222,10 +222,11 @@ export default function CoursePage() {
                 {currentLesson.quizzes && currentLesson.quizzes.length > 0 && (
                   <div className="mb-8">
                     <h3 className="text-xl font-semibold mb-4">Practice Questions</h3>
-                    {currentLesson.quizzes.map((quiz) => (
+                    {currentLesson.quizzes.map((quiz, idx) => (
                       <QuizComponent
-                        key={quiz.id}
+                        key={`${currentLesson.id}-${idx}`}
                         quiz={quiz}
+                        topicId={currentLesson.id}
                         courseId={courseId}
                       />
                     ))}
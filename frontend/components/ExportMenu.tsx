@@ -2,6 +2,7 @@
 
 import { useState } from 'react'
 import { Download, FileText, BookOpen, FileJson } from 'lucide-react'
+import { API_URL, authHeaders, redirectToLogin } from '@/lib/api'
 
 interface ExportMenuProps {
   courseId: number
@@ -17,9 +18,8 @@ export default function ExportMenu({ courseId }: ExportMenuProps) {
         ? `/api/v1/courses/${courseId}/export/${type}?format=${format}`
         : `/api/v1/courses/${courseId}/export/${type}`
       
-      const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}${url}`
-      )
+      const response = await fetch(`${API_URL}${url}`, { headers: authHeaders() })
+      if (response.status === 401) return redirectToLogin()
       
       if (!response.ok) throw new Error('Export failed')
       
@@ -7,9 +7,10 @@ import { Quiz, updateQuizScore } from '@/lib/api'
 interface QuizComponentProps {
   quiz: Quiz
   courseId: number
+  topicId: number
 }
 
-export default function QuizComponent({ quiz, courseId }: QuizComponentProps) {
+export default function QuizComponent({ quiz, courseId, topicId }: QuizComponentProps) {
   const [selectedAnswer, setSelectedAnswer] = useState<number | null>(null)
   const [showResult, setShowResult] = useState(false)
   const [score, setScore] = useState<number | null>(null)
@@ -18,13 +19,13 @@ export default function QuizComponent({ quiz, courseId }: QuizComponentProps) {
     if (selectedAnswer === null) return
 
     const isCorrect = selectedAnswer === quiz.correct_answer
-    const calculatedScore = isCorrect ? 1.0 : 0.0
+    const calculatedScore = isCorrect ? 100 : 0
     setScore(calculatedScore)
     setShowResult(true)
 
     // Update score in backend
     try {
-      await updateQuizScore(courseId, quiz.id, calculatedScore)
+      await updateQuizScore(courseId, topicId, calculatedScore)
     } catch (error) {
       console.error('Failed to update quiz score:', error)
     }
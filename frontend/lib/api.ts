@@ -1,9 +1,15 @@
 /**
  * API client for CourseForge backend
+ *
+ * NEXT_PUBLIC_API_URL is the server origin (e.g. http://localhost:8000);
+ * courses live under /api/courses, upload/tutor/progress/export under
+ * /api/v1. Every route needs the bearer token returned by login(); a 401
+ * sends the browser to /login, which comes back to the page afterwards.
  */
 import axios from 'axios'
 
-const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1'
+export const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+const TOKEN_KEY = 'token'
 
 const api = axios.create({
   baseURL: API_URL,
@@ -12,6 +18,37 @@ const api = axios.create({
   },
 })
 
+export const getToken = (): string | null =>
+  typeof window === 'undefined' ? null : window.localStorage.getItem(TOKEN_KEY)
+
+export const authHeaders = (): Record<string, string> => {
+  const token = getToken()
+  return token ? { Authorization: `Bearer ${token}` } : {}
+}
+
+api.interceptors.request.use((config) => {
+  Object.assign(config.headers, authHeaders())
+  return config
+})
+
+// Missing or expired token: sign in again, then return to this page
+export const redirectToLogin = () => {
+  if (typeof window === 'undefined' || window.location.pathname === '/login') return
+  window.localStorage.removeItem(TOKEN_KEY)
+  const next = encodeURIComponent(window.location.pathname + window.location.search)
+  window.location.assign(`/login?next=${next}`)
+}
+
+api.interceptors.response.use(
+  (response) => response,
+  (error) => {
+    if (error.response?.status === 401 && !error.config?.url?.startsWith('/api/auth/')) {
+      redirectToLogin()
+    }
+    return Promise.reject(error)
+  }
+)
+
 export interface Course {
   id: number
   title: string
@@ -19,9 +56,10 @@ export interface Course {
   source_type?: string
   created_at?: string
   module_count?: number
+  topic_count?: number
 }
 
-export interface Lesson {
+export interface Topic {
   id: number
   title: string
   order: number
@@ -30,10 +68,10 @@ export interface Lesson {
   expert_content?: string
   examples?: string[]
   analogies?: string[]
-  diagrams?: any[]
   summary?: string
-  coding_tasks?: string[]
+  source_ref?: string
   quizzes?: Quiz[]
+  flashcards?: Flashcard[]
 }
 
 export interface Module {
@@ -41,19 +79,20 @@ export interface Module {
   title: string
   description?: string
   order: number
-  lessons: Lesson[]
+  topics: Topic[]
 }
 
 export interface Quiz {
-  id: number
   question: string
   options: string[]
   correct_answer: number
   explanation?: string
+  difficulty?: string
 }
 
 export interface Flashcard {
   id: number
+  topic_id?: number
   front: string
   back: string
 }
@@ -62,121 +101,124 @@ export interface FullCourse {
   id: number
   title: string
   description?: string
+  difficulty?: string
   source_type?: string
-  table_of_contents?: any[]
+  status?: string
   modules: Module[]
-  flashcards: Flashcard[]
   created_at?: string
 }
 
-// Upload API
-export const uploadFile = async (file: File): Promise<{ course_id: number; title: string }> => {
-  const formData = new FormData()
-  formData.append('file', file)
-  const response = await api.post('/upload', formData, {
-    headers: { 'Content-Type': 'multipart/form-data' },
-  })
-  return response.data
+export interface Progress {
+  course_id: number
+  completed_topic_ids: number[]
+  quiz_scores: Record<string, number>
+  overall_percentage: number // 0-100
 }
 
-export const uploadText = async (text: string): Promise<{ course_id: number; title: string }> => {
-  const formData = new FormData()
-  formData.append('text', text)
-  const response = await api.post('/upload', formData, {
-    headers: { 'Content-Type': 'multipart/form-data' },
+// Auth API
+export const login = async (email: string, password: string): Promise<void> => {
+  const form = new URLSearchParams({ username: email, password })
+  const response = await api.post('/api/auth/login', form, {
+    headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
   })
-  return response.data
+  window.localStorage.setItem(TOKEN_KEY, response.data.access_token)
 }
 
-export const uploadLink = async (url: string): Promise<{ course_id: number; title: string }> => {
+export const register = async (email: string, password: string, name?: string): Promise<void> => {
+  await api.post('/api/auth/register', { email, password, name })
+  await login(email, password)
+}
+
+export const logout = () => window.localStorage.removeItem(TOKEN_KEY)
+
+// Upload API
+const upload = async (field: string, value: string | File): Promise<{ course_id: number; title: string }> => {
   const formData = new FormData()
-  formData.append('link', url)
-  const response = await api.post('/upload', formData, {
+  formData.append(field, value)
+  const response = await api.post('/api/v1/upload', formData, {
     headers: { 'Content-Type': 'multipart/form-data' },
   })
   return response.data
 }
 
+export const uploadFile = (file: File) => upload('file', file)
+
+export const uploadText = (text: string) => upload('text', text)
+
+export const uploadLink = (url: string) => upload('link', url)
+
 // Courses API
 export const getCourses = async (): Promise<Course[]> => {
-  const response = await api.get('/courses')
-  return response.data.courses
+  const response = await api.get('/api/courses/my-courses')
+  return response.data
 }
 
 export const getCourse = async (courseId: number): Promise<FullCourse> => {
-  const response = await api.get(`/courses/${courseId}`)
+  const response = await api.get(`/api/courses/${courseId}`)
   return response.data
 }
 
 export const getFlashcards = async (courseId: number): Promise<Flashcard[]> => {
-  const response = await api.get(`/courses/${courseId}/flashcards`)
-  return response.data.flashcards
+  // Paged by id; follow next_after_id until the last page
+  const flashcards: Flashcard[] = []
+  let afterId: number | null = null
+  do {
+    const response: { data: { flashcards: Flashcard[]; next_after_id: number | null } } = await api.get(
+      `/api/courses/${courseId}/flashcards`,
+      { params: afterId ? { after_id: afterId } : {} }
+    )
+    flashcards.push(...response.data.flashcards)
+    afterId = response.data.next_after_id
+  } while (afterId)
+  return flashcards
 }
 
 // Tutor API
 export const chatWithTutor = async (
   courseId: number,
   message: string,
-  userId: string = 'default'
+  topicId?: number
 ): Promise<{ response: string; conversation_id: number }> => {
-  const response = await api.post(`/tutor/${courseId}/chat`, {
+  const response = await api.post(`/api/v1/tutor/${courseId}/chat`, {
     message,
-    user_id: userId,
+    topic_id: topicId ?? null,
   })
   return response.data
 }
 
 export const getConversation = async (
-  courseId: number,
-  userId: string = 'default'
+  courseId: number
 ): Promise<{ messages: any[] }> => {
-  const response = await api.get(`/tutor/${courseId}/conversation`, {
-    params: { user_id: userId },
-  })
+  const response = await api.get(`/api/v1/tutor/${courseId}/conversation`)
   return response.data
 }
 
 // Progress API
-export const getProgress = async (
-  courseId: number,
-  userId: string = 'default'
-): Promise<any> => {
-  const response = await api.get(`/progress/${courseId}`, {
-    params: { user_id: userId },
-  })
+export const getProgress = async (courseId: number): Promise<Progress> => {
+  const response = await api.get(`/api/v1/progress/${courseId}`)
   return response.data
 }
 
-export const updateLessonProgress = async (
+export const updateTopicProgress = async (
   courseId: number,
-  lessonId: number,
-  completed: boolean,
-  userId: string = 'default'
-): Promise<any> => {
-  const response = await api.post(`/progress/${courseId}/lesson`, {
-    lesson_id: lessonId,
+  topicId: number,
+  completed: boolean
+): Promise<Progress> => {
+  const response = await api.post(`/api/v1/progress/${courseId}/topic`, {
+    topic_id: topicId,
     completed,
-    user_id: userId,
   })
   return response.data
 }
 
 export const updateQuizScore = async (
   courseId: number,
-  quizId: number,
-  score: number,
-  userId: string = 'default'
-): Promise<any> => {
-  const response = await api.post(`/progress/${courseId}/quiz`, {
-    quiz_id: quizId,
+  topicId: number,
+  score: number
+): Promise<Progress> => {
+  const response = await api.post(`/api/v1/progress/${courseId}/quiz`, {
+    topic_id: topicId,
     score,
-    user_id: userId,
   })
   return response.data
 }
-
-
-
-
-
-